@@ -5,15 +5,18 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
 from django.db import transaction
+from django.utils.decorators import method_decorator
 from rest_framework.permissions import AllowAny
 
 from app.models import Profile, Education, Experience, Skill
+from app.utils.cache import conditional_on_tags
 from app.api.serializers.about_serializer import (
     AboutPageSerializer, ProfileUpdateSerializer, EducationSerializer,
     ExperienceSerializer, SkillSerializer, BulkSkillsSerializer
 )
 
 
+@method_decorator(conditional_on_tags('about'), name='dispatch')
 class AboutPageAPIView(APIView):
     """API view for the About page data"""
     permission_classes = [AllowAny]
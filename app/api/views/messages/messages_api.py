@@ -7,11 +7,15 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django_ratelimit.decorators import ratelimit
 from django_ratelimit.exceptions import Ratelimited
 
 from app.models import Message
 from app.api.serializers.messages_serializer import MessageSerializer
+from portfolio.utils.keyset_pagination import (
+    CURSOR_PARAM, InvalidCursor, KeysetPaginator, estimate_count,
+    wants_cursor, wants_estimate,
+)
+from portfolio.utils.rate_limiting import ratelimit
 
 
 class StaffRequiredMixin:
@@ -64,6 +68,9 @@ class MessageListAPIView(StaffRequiredMixin, APIView):
                     Q(message__icontains=search_query)
                 )
 
+            if wants_cursor(request.GET):
+                return self.list_by_cursor(request, queryset, page_size)
+
             # Pagination
             total_count = queryset.count()
             start = (page - 1) * page_size
@@ -97,6 +104,29 @@ class MessageListAPIView(StaffRequiredMixin, APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    def list_by_cursor(self, request, queryset, page_size):
+        """Keyset pagination on (created_at, id), without a COUNT(*)"""
+        try:
+            page = KeysetPaginator(queryset, ('-created_at', '-id'), page_size)\
+                .page(request.GET[CURSOR_PARAM])
+        except InvalidCursor as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        pagination = {
+            'page_size': page_size,
+            'has_next': page.has_next,
+            'has_previous': False,
+            'next_cursor': page.next_cursor,
+        }
+        if wants_estimate(request.GET):
+            pagination['estimated_count'] = estimate_count(queryset)
+
+        return Response({
+            'success': True,
+            'messages': MessageSerializer(page.items, many=True).data,
+            'pagination': pagination,
+        })
+
 
 @method_decorator(ratelimit(key='user', rate='60/m', method='GET', block=True), name='dispatch')
 class MessageDetailAPIView(StaffRequiredMixin, APIView):
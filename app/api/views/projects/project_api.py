@@ -3,8 +3,10 @@ from rest_framework import generics, status, viewsets
 from rest_framework.decorators import api_view
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from django.db.models import Q
 from django.core.paginator import Paginator
+from django.utils.decorators import method_decorator
 
 
 from app.api.serializers.project_serializer import (
@@ -14,8 +16,14 @@ from app.models import Projects
 from app.forms.projects import ProjectsForm
 
 from app.permissions import IsStaffOrReadOnly, IsAuthenticatedStaff
+from app.utils.cache import conditional_on_tags
+from portfolio.utils.keyset_pagination import (
+    CURSOR_PARAM, InvalidCursor, KeysetPaginator, estimate_count,
+    wants_cursor, wants_estimate,
+)
 
 
+@method_decorator(conditional_on_tags('projects'), name='dispatch')
 class ProjectListAPIView(generics.ListAPIView):
     """
     API endpoint for listing projects with filtering and pagination
@@ -55,16 +63,28 @@ class ProjectListAPIView(generics.ListAPIView):
             '-created_at', 'created_at', 'title', 'category', 'client',
             '-category', '-client', 'project_type', '-project_type', '-title'
         ]
-        if sort_by in allowed_sort_fields:
-            queryset = queryset.order_by(sort_by)
+        if sort_by not in allowed_sort_fields:
+            sort_by = '-created_at'
+        # The id breaks ties, so cursor pages on any sort are stable
+        self.keyset_ordering = (sort_by, '-id' if sort_by.startswith('-') else 'id')
+
+        return queryset.order_by(sort_by)
 
-        return queryset
+    def get_filters(self) -> dict:
+        return {
+            'categories': list(Projects.objects.values_list('category', flat=True).distinct()),
+            'project_types': [choice[0] for choice in Projects.PROJECT_TYPES],
+            'clients': list(Projects.objects.values_list('client', flat=True).distinct()),
+        }
 
     def list(self, request, *args, **kwargs) -> Response:
         queryset = self.get_queryset()
+        page_size = int(request.query_params.get('page_size', 12))
+
+        if wants_cursor(request.query_params):
+            return self.list_by_cursor(request, queryset, page_size)
 
         # Pagination
-        page_size = int(request.query_params.get('page_size', 12))
         paginator = Paginator(queryset, page_size)
         page_number = request.query_params.get('page', 1)
         page_obj = paginator.get_page(page_number)
@@ -84,11 +104,33 @@ class ProjectListAPIView(generics.ListAPIView):
                 'next_page_number': page_obj.next_page_number() if page_obj.has_next() else None,
                 'previous_page_number': page_obj.previous_page_number() if page_obj.has_previous() else None,
             },
-            'filters': {
-                'categories': list(Projects.objects.values_list('category', flat=True).distinct()),
-                'project_types': [choice[0] for choice in Projects.PROJECT_TYPES],
-                'clients': list(Projects.objects.values_list('client', flat=True).distinct()),
-            }
+            'filters': self.get_filters(),
+        })
+
+    def list_by_cursor(self, request, queryset, page_size) -> Response:
+        """Keyset pagination: constant cost per page and no COUNT(*)"""
+        try:
+            page = KeysetPaginator(queryset, self.keyset_ordering, page_size)\
+                .page(request.query_params[CURSOR_PARAM])
+        except InvalidCursor as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = self.get_serializer(page.items, many=True)
+
+        pagination = {
+            'has_next': page.has_next,
+            'next_cursor': page.next_cursor,
+        }
+        if wants_estimate(request.query_params):
+            pagination['estimated_count'] = estimate_count(queryset)
+
+        return Response({
+            'results': serializer.data,
+            'next': replace_query_param(
+                request.build_absolute_uri(), CURSOR_PARAM, page.next_cursor
+            ) if page.has_next else None,
+            'previous': None,
+            'pagination': pagination,
+            'filters': self.get_filters(),
         })
 
 
@@ -1,18 +1,40 @@
 import re
 import hashlib
 import html
-from django.db.models import Q, Count
+from django.db.models import Q
 from django.core.cache import cache
 from django.utils.decorators import method_decorator
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework import status
-from django_ratelimit.decorators import ratelimit
 from django_ratelimit.exceptions import Ratelimited
 
 from app.models import Projects
 from blog.models import BlogPostPage as BlogPost
+from blog.tag_counts import matching_tags
+from portfolio.utils.keyset_pagination import (
+    CURSOR_PARAM, InvalidCursor, KeysetPaginator, estimate_count,
+    wants_cursor, wants_estimate,
+)
+from portfolio.utils.rate_limiting import ratelimit
+
+# Keyset orderings of cursor-paginated search, per sort option; relevance
+# has no stored score, so it pages newest rows first
+POST_KEYSET_ORDERING = {
+    'relevance': ('-id',),
+    'date_desc': ('-first_published_at', '-id'),
+    'date_asc': ('first_published_at', 'id'),
+    'title_asc': ('title', 'id'),
+    'title_desc': ('-title', '-id'),
+}
+PROJECT_KEYSET_ORDERING = {
+    'relevance': ('-id',),
+    'date_desc': ('-created_at', '-id'),
+    'date_asc': ('created_at', 'id'),
+    'title_asc': ('title', 'id'),
+    'title_desc': ('-title', '-id'),
+}
 
 
 class BaseSearchAPIView(APIView):
@@ -73,20 +95,23 @@ class BaseSearchAPIView(APIView):
 
         return True, None
 
-    def get_cache_key(self, query, category, sort, page, page_size, user_id=None):
+    def get_cache_key(self, query, category, sort, page, page_size, user_id=None,
+                      cursor=None):
         """
         Generate cache key for search results
         """
         key_data = f"{query}:{category}:{sort}:{page}:{page_size}"
         if user_id:
             key_data += f":{user_id}"
+        if cursor is not None:
+            key_data += f":cursor:{cursor}"
 
         # Create hash for consistent key length
         key_hash = hashlib.md5(key_data.encode()).hexdigest()
         return f"search:{key_hash}"
 
-    def search_blog_posts(self, query, sort, page, page_size):
-        """Search and return blog posts with optimized queries"""
+    def blog_post_queryset(self, query, sort):
+        """Blog posts matching the query, in the requested order"""
         # Use select_related and prefetch_related for better performance
         post_queryset = BlogPost.objects.filter(
             Q(title__icontains=query) | Q(content__icontains=query) |
@@ -103,35 +128,39 @@ class BaseSearchAPIView(APIView):
         elif sort == 'title_desc':
             post_queryset = post_queryset.order_by('-title')
 
+        return post_queryset
+
+    def search_blog_posts(self, query, sort, page, page_size):
+        """Search and return blog posts with optimized queries"""
         # Paginate and serialize
         start = (page - 1) * page_size
         end = start + page_size
-        posts_page = post_queryset[start:end]
-
-        return [
-            {
-                'id': post.id,
-                'title': post.title,
-                'slug': post.slug,
-                'content': post.content[:200] + '...' if len(post.content) > 200 else post.content,
-                'first_published_at': post.first_published_at.isoformat() if post.first_published_at else None,
-                'url': f'/blog/article/{post.slug}',
-                'author': {
-                    'username': post.author.username if post.author else 'anonymous',
-                    'full_name': f"{post.author.first_name} {post.author.last_name}".strip() if post.author else 'Anonymous'
-                } if post.author else {'username': 'anonymous', 'full_name': 'Anonymous'},
-                'first_image': {
-                    'optimized_image_url': post.cover_image_url
-                } if post.cover_image_url else None,
-                'type': 'blog_post',
-                'tags': [tag.name for tag in post.tags.all()],
-                'view_count': getattr(post, 'view_count', 0)
-            }
-            for post in posts_page
-        ]
+        posts_page = self.blog_post_queryset(query, sort)[start:end]
 
-    def search_projects(self, query, sort, page, page_size):
-        """Search and return projects with optimized queries"""
+        return [self.serialize_blog_post(post) for post in posts_page]
+
+    def serialize_blog_post(self, post):
+        return {
+            'id': post.id,
+            'title': post.title,
+            'slug': post.slug,
+            'content': post.content[:200] + '...' if len(post.content) > 200 else post.content,
+            'first_published_at': post.first_published_at.isoformat() if post.first_published_at else None,
+            'url': f'/blog/article/{post.slug}',
+            'author': {
+                'username': post.author.username if post.author else 'anonymous',
+                'full_name': f"{post.author.first_name} {post.author.last_name}".strip() if post.author else 'Anonymous'
+            } if post.author else {'username': 'anonymous', 'full_name': 'Anonymous'},
+            'first_image': {
+                'optimized_image_url': post.cover_image_url
+            } if post.cover_image_url else None,
+            'type': 'blog_post',
+            'tags': [tag.name for tag in post.tags.all()],
+            'view_count': getattr(post, 'view_count', 0)
+        }
+
+    def project_queryset(self, query, sort):
+        """Live projects matching the query, in the requested order"""
         project_queryset = Projects.objects.filter(
             Q(title__icontains=query) | Q(description__icontains=query) |
             Q(project_url__icontains=query) | Q(category__icontains=query) |
@@ -148,27 +177,31 @@ class BaseSearchAPIView(APIView):
         elif sort == 'title_desc':
             project_queryset = project_queryset.order_by('-title')
 
+        return project_queryset
+
+    def search_projects(self, query, sort, page, page_size):
+        """Search and return projects with optimized queries"""
         # Paginate and serialize
         start = (page - 1) * page_size
         end = start + page_size
-        projects_page = project_queryset[start:end]
-
-        return [
-            {
-                'id': project.id,
-                'title': project.title,
-                'slug': project.slug,
-                'description': project.description[:200] + '...' if len(project.description) > 200 else project.description,
-                'created_at': project.created_at.isoformat(),
-                'url': f'/projects/{project.slug}',
-                'type': 'project',
-                'category': project.category,
-                'project_type': project.project_type,
-                'client': project.client,
-                'project_url': project.project_url
-            }
-            for project in projects_page
-        ]
+        projects_page = self.project_queryset(query, sort)[start:end]
+
+        return [self.serialize_project(project) for project in projects_page]
+
+    def serialize_project(self, project):
+        return {
+            'id': project.id,
+            'title': project.title,
+            'slug': project.slug,
+            'description': project.description[:200] + '...' if len(project.description) > 200 else project.description,
+            'created_at': project.created_at.isoformat(),
+            'url': f'/projects/{project.slug}',
+            'type': 'project',
+            'category': project.category,
+            'project_type': project.project_type,
+            'client': project.client,
+            'project_url': project.project_url
+        }
 
     def search_actions(self, query, user):
         """Search and return user actions"""
@@ -320,6 +353,40 @@ class SearchAPIView(BaseSearchAPIView):
             'has_previous': page > 1
         }
 
+    def _search_by_cursor(self, query, category, sort, page_size, cursor, params):
+        """
+        Keyset-paginated search of a single category; raises InvalidCursor
+        """
+        if category == 'posts':
+            queryset = self.blog_post_queryset(query, sort)
+            keys, serialize = POST_KEYSET_ORDERING[sort], self.serialize_blog_post
+        else:
+            queryset = self.project_queryset(query, sort)
+            keys, serialize = PROJECT_KEYSET_ORDERING[sort], self.serialize_project
+
+        page = KeysetPaginator(queryset, keys, page_size).page(cursor)
+        results = [serialize(item) for item in page.items]
+
+        response_data = {
+            'success': True,
+            'query': query,
+            'category': category,
+            'sort': sort,
+            'page_size': page_size,
+            'results': {
+                'posts': results if category == 'posts' else [],
+                'projects': results if category == 'projects' else [],
+                'actions': []
+            },
+            'total_results': len(results),
+            'has_next': page.has_next,
+            'has_previous': False,
+            'next_cursor': page.next_cursor,
+        }
+        if wants_estimate(params):
+            response_data['estimated_total'] = estimate_count(queryset)
+        return response_data
+
     def _error_response(self, message, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR):
         """Build error response"""
         return Response({
@@ -337,20 +404,36 @@ class SearchAPIView(BaseSearchAPIView):
             if not is_valid:
                 return self._error_response(error_message, status.HTTP_400_BAD_REQUEST)
 
+            cursor = request.GET[CURSOR_PARAM] if wants_cursor(request.GET) else None
+            if cursor is not None and category not in ('posts', 'projects'):
+                return self._error_response(
+                    "Cursor pagination needs category 'posts' or 'projects'",
+                    status.HTTP_400_BAD_REQUEST
+                )
+
             user_id = request.user.id if request.user.is_authenticated else None
-            cache_key = self.get_cache_key(query, category, sort, page, page_size, user_id)
+            cache_key = self.get_cache_key(query, category, sort, page, page_size, user_id,
+                                           cursor=cursor)
             cached_result = cache.get(cache_key)
             if cached_result:
                 return Response(cached_result)
 
-            post_results, project_results, action_results = self._perform_search(
-                query, category, sort, page, page_size, request.user
-            )
-
-            response_data = self._build_response(
-                query, category, sort, page, page_size,
-                post_results, project_results, action_results
-            )
+            if cursor is not None:
+                try:
+                    response_data = self._search_by_cursor(
+                        query, category, sort, page_size, cursor, request.GET
+                    )
+                except InvalidCursor as e:
+                    return self._error_response(str(e), status.HTTP_400_BAD_REQUEST)
+            else:
+                post_results, project_results, action_results = self._perform_search(
+                    query, category, sort, page, page_size, request.user
+                )
+
+                response_data = self._build_response(
+                    query, category, sort, page, page_size,
+                    post_results, project_results, action_results
+                )
 
             cache.set(cache_key, response_data, 120)
             return Response(response_data)
@@ -400,15 +483,8 @@ class SearchSuggestionsAPIView(BaseSearchAPIView):
                 title__icontains=query
             ).filter(live=True).values_list('title', flat=True)[:5]
 
-            # Get tags with optimized query
-            from taggit.models import Tag
-            tags = (
-                Tag.objects
-                .filter(taggit_taggeditem_items__content_type__model='blogpostpage')
-                .annotate(article_count=Count('taggit_taggeditem_items', distinct=True))
-                .order_by('name')
-                .values_list('name', flat=True)
-            )
+            # Get tags from the materialized tag counts
+            tags = matching_tags(query, limit=5)
 
             # Combine and format suggestions
             for title in blog_posts:
@@ -4,10 +4,14 @@ import requests
 from cloudinary.models import CloudinaryField
 from django.conf import settings
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.urls import reverse_lazy
 from django.utils.text import slugify
 from wagtail.fields import RichTextField
 
+from portfolio.utils.cache_tags import invalidate_tags_on_commit, project_tag
+
 
 class Projects(models.Model):
     PROJECT_TYPES = settings.PROJECT_TYPES
@@ -279,3 +283,24 @@ class Skill(models.Model):
 
     def __str__(self):
         return str(self.name)
+
+
+# Signal handlers for tag-based cache invalidation
+@receiver(post_save, sender=Projects)
+@receiver(post_delete, sender=Projects)
+def invalidate_project_cache(sender, instance, **kwargs):
+    """Purge cached pages and API responses built from a project."""
+    invalidate_tags_on_commit(project_tag(instance), 'projects')
+
+
+@receiver(post_save, sender=Education)
+@receiver(post_delete, sender=Education)
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=Experience)
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_about_cache(sender, instance, **kwargs):
+    """Purge the cached about page whenever any of its sections change."""
+    invalidate_tags_on_commit('about')
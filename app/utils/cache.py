@@ -1,18 +1,40 @@
 """Cache utilities for the portfolio application."""
+import hashlib
+from datetime import datetime, timezone
 from functools import wraps
 from django.conf import settings
 from django.core.cache import cache
 from django.utils.cache import patch_response_headers
 from django.views.decorators.cache import cache_page as django_cache_page
-
-
-def cache_page_with_prefix(prefix, timeout=None):
+from django.views.decorators.http import condition
+
+from portfolio.middlewares.page_cache import (
+    cache_page,
+    get_page_cache,
+    get_page_cache_alias,
+    get_stale_window,
+)
+from portfolio.utils.cache_keys import canonicalize_request
+from portfolio.utils.cache_tags import (
+    content_versions,
+    invalidate_tags,
+    register_response_tags,
+)
+
+
+def cache_page_with_prefix(prefix, timeout=None, tags=()):
     """
     Cache decorator that includes a prefix in the cache key.
     Uses Django's built-in cache_page decorator internally to ensure
     proper handling of response rendering.
+
+    The cached response is tagged with the prefix, the given tags and any
+    tags the view records on the request, so it can be purged precisely.
+    Expired pages are regenerated by a single request while concurrent
+    requests are served the stale copy.
     """
-    cache_decorator = django_cache_page(timeout or settings.CACHE_MIDDLEWARE_SECONDS)
+    timeout = timeout or settings.CACHE_MIDDLEWARE_SECONDS
+    cache_decorator = cache_page(timeout, cache=get_page_cache_alias())
 
     def decorator(view_func):
         @wraps(view_func)
@@ -23,13 +45,79 @@ def cache_page_with_prefix(prefix, timeout=None):
             # Add prefix to the request for key generation
             request._cache_prefix = prefix
 
+            # Equivalent listing URLs share one entry; unknown or invalid
+            # query parameters bypass the cache
+            if canonicalize_request(request) is False:
+                return view_func(request, *args, **kwargs)
+
             # Use Django's cache_page decorator
             cached_view = cache_decorator(view_func)
-            return cached_view(request, *args, **kwargs)
+            response = cached_view(request, *args, **kwargs)
+
+            # Only freshly built responses need registering
+            if getattr(request, '_cache_update_cache', False):
+                register_response_tags(
+                    request, response, key_prefix='', timeout=timeout,
+                    tags=(prefix, *tags), grace=get_stale_window(),
+                    cache_backend=get_page_cache()
+                )
+            return response
         return _wrapped_view
     return decorator
 
 
+def has_pending_messages(request):
+    """True if django.contrib.messages has messages waiting for this request"""
+    storage = getattr(getattr(request, '_request', request), '_messages', None)
+    # len() counts stored and queued messages without marking them seen
+    return storage is not None and len(storage) > 0
+
+
+def conditional_on_tags(*tags):
+    """
+    Conditional GET decorator: ETag and Last-Modified come from the content
+    versions of the given tags (bumped whenever they are purged), so repeat
+    requests are answered with 304 before any query, serializer or template
+    work runs. Apply it outside the cache decorator.
+
+    Requests with pending flash messages get no validators, so a page that
+    is about to show a message is never answered with 304.
+    """
+    def get_versions(request):
+        request = getattr(request, '_request', request)
+        versions = getattr(request, '_content_versions', None)
+        if versions is None:
+            versions = content_versions(*tags)
+            request._content_versions = versions
+        return versions
+
+    def etag_func(request, *args, **kwargs):
+        if has_pending_messages(request):
+            return None
+        versions = get_versions(request)
+        user = getattr(request, 'user', None)
+        user_id = user.pk if user is not None and user.is_authenticated else ''
+        seed = '|'.join([
+            str(getattr(settings, 'CONTENT_SCHEMA_VERSION', 1)),
+            request.get_full_path(),
+            str(user_id),
+            *(f'{tag}={versions[tag]!r}' for tag in sorted(versions)),
+        ])
+        digest = hashlib.md5(seed.encode(), usedforsecurity=False).hexdigest()
+        # Weak: the same version may be sent gzip- or brotli-encoded
+        return f'W/"{digest}"'
+
+    def last_modified_func(request, *args, **kwargs):
+        if has_pending_messages(request):
+            return None
+        versions = get_versions(request)
+        if not versions:
+            return None
+        return datetime.fromtimestamp(max(versions.values()), tz=timezone.utc)
+
+    return condition(etag_func=etag_func, last_modified_func=last_modified_func)
+
+
 def cache_page_for_user(timeout=None):
     """
     Cache decorator that includes the user's ID in the cache key.
@@ -100,6 +188,9 @@ def invalidate_cache_prefix(prefix):
     version = cache.get(cache_key, 1)
     cache.set(cache_key, version + 1)  # Increment version to invalidate cache
 
+    # Purge the pages cached under this prefix
+    invalidate_tags(prefix)
+
 
 def invalidate_template_cache(fragment_name, *args, **kwargs):
     """
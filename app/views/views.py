@@ -10,7 +10,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from wagtail.models import Page
 
-from app.utils.cache import cache_page_with_prefix
+from app.utils.cache import cache_page_with_prefix, conditional_on_tags
 from app.models import Projects
 from blog.models import BlogPostPage as BlogPost
 
@@ -23,7 +23,12 @@ def get_view_cache_key(request, prefix, key_prefix=None):
     return f"{prefix}:{user_prefix}:{key_prefix}:{request.build_absolute_uri()}"
 
 
-@method_decorator(cache_page_with_prefix('home', 300), name='dispatch')
+@method_decorator(conditional_on_tags('blog', 'projects'), name='dispatch')
+@method_decorator(
+    cache_page_with_prefix('home', 60 * 60 * 6,
+                           tags=('blog', 'projects')),
+    name='dispatch'
+)
 class HomeView(TemplateView):
     """Class-based view to render the home page"""
     template_name = "app/home.html"
@@ -42,7 +47,8 @@ class HomeView(TemplateView):
         return context
 
 
-@method_decorator(cache_page_with_prefix('about', 3600), name='dispatch')
+@method_decorator(conditional_on_tags('about'), name='dispatch')
+@method_decorator(cache_page_with_prefix('about', 60 * 60 * 24), name='dispatch')
 class AboutView(TemplateView):
     """Class-based view to render the about page"""
     template_name = "app/about.html"
@@ -102,7 +108,12 @@ class ResumePDFView(View):
         )
 
 
-@method_decorator(cache_page_with_prefix('sitemap', 3600), name='dispatch')
+@method_decorator(conditional_on_tags('blog', 'projects'), name='dispatch')
+@method_decorator(
+    cache_page_with_prefix('sitemap', 60 * 60 * 24,
+                           tags=('blog', 'projects')),
+    name='dispatch'
+)
 class SitemapView(TemplateView):
     """Class-based view to render the sitemap"""
     template_name = "app/sitemaps/sitemap.html"
@@ -119,7 +130,12 @@ class SitemapView(TemplateView):
         return context
 
 
-@method_decorator(cache_page_with_prefix('sitemap-api', 3600), name='get')
+@method_decorator(conditional_on_tags('blog', 'projects'), name='dispatch')
+@method_decorator(
+    cache_page_with_prefix('sitemap-api', 60 * 60 * 24,
+                           tags=('blog', 'projects')),
+    name='get'
+)
 class SitemapAPIView(APIView):
     """API view to provide sitemap data for React frontend"""
 
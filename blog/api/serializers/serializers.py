@@ -47,19 +47,36 @@ class BlogPostCommentSerializer(serializers.ModelSerializer):
         return obj.created_at.strftime('%B %d, %Y at %I:%M %p')
 
 
-class BlogPostPageSerializer(serializers.ModelSerializer):
+class PostSummaryFieldsMixin:
+    """Computed fields shared by the detail and list serializers of posts"""
+
+    def get_author(self, obj):
+        """Get the full name if available, otherwise username"""
+        if obj.author:
+            full_name = f"{obj.author.first_name} {obj.author.last_name}".strip()
+            if full_name:
+                return full_name
+            return obj.author.username
+        return "Anonymous"
+
+    def get_reading_time(self, obj):
+        return f"{obj.reading_time} min read"
+
+    def get_tags_list(self, obj):
+        return [tag.name for tag in obj.tags.all()]
+
+
+class BlogPostPageSerializer(PostSummaryFieldsMixin, serializers.ModelSerializer):
     """Serializer for blog posts"""
     images = BlogPostImageSerializer(many=True, read_only=True)
     comments = BlogPostCommentSerializer(many=True, read_only=True)
     comments_count = serializers.SerializerMethodField()
     reading_time = serializers.SerializerMethodField()
-    excerpt = serializers.SerializerMethodField()
-    featured_image_url = serializers.SerializerMethodField()
+    featured_image_url = serializers.URLField(source='cover_image_url', read_only=True)
     tags_list = serializers.SerializerMethodField()
     author = serializers.SerializerMethodField()
     first_published_at = serializers.DateTimeField()
     content = serializers.CharField()
-    intro = serializers.SerializerMethodField()
     published = serializers.BooleanField()
 
     class Meta:
@@ -72,46 +89,30 @@ class BlogPostPageSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'slug', 'view_count', 'first_published_at', 'last_published_at']
 
-    def get_author(self, obj):
-        """Get the full name if available, otherwise username"""
-        if obj.author:
-            full_name = f"{obj.author.first_name} {obj.author.last_name}".strip()
-            if full_name:
-                return full_name
-            return obj.author.username
-        return "Anonymous"
-
     def get_comments_count(self, obj):
         return obj.comments.count()
 
-    def get_reading_time(self, obj):
-        # Calculate reading time (approximately 200 words per minute)
-        content = obj.content or ''
-        word_count = len(content.split()) if content else 0
-        reading_time = max(1, round(word_count / 200))
-        return f"{reading_time} min read"
-
-    def get_excerpt(self, obj):
-        content = obj.content or ''
-        if len(content) > 200:
-            return f"{content[:200]}..."
-        return content
-
-    def get_intro(self, obj):
-        # Return first paragraph as intro
-        content = obj.content or ''
-        if content:
-            paragraphs = content.split('\n')
-            return paragraphs[0] if paragraphs else ''
-        return ''
-
-    def get_featured_image_url(self, obj):
-        if obj.images.first():
-            return obj.images.first().optimized_image_url
-        return None
 
-    def get_tags_list(self, obj):
-        return [tag.name for tag in obj.tags.all()]
+class BlogPostListSerializer(PostSummaryFieldsMixin, serializers.ModelSerializer):
+    """
+    List projection of blog posts: no content, images or comments. Expects
+    the queryset to annotate ``comments_count`` and prefetch ``tags`` (see
+    BlogPostListAPIView.get_queryset)
+    """
+    comments_count = serializers.IntegerField(read_only=True)
+    reading_time = serializers.SerializerMethodField()
+    featured_image_url = serializers.URLField(source='cover_image_url', read_only=True)
+    tags_list = serializers.SerializerMethodField()
+    author = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BlogPostPage
+        fields = [
+            'id', 'title', 'slug', 'intro', 'featured_image_url', 'tags_list',
+            'excerpt', 'reading_time', 'view_count', 'comments_count',
+            'first_published_at', 'last_published_at', 'author', 'published'
+        ]
+        read_only_fields = fields
 
 
 class BlogPostCreateSerializer(serializers.ModelSerializer):
@@ -1,37 +1,46 @@
 from rest_framework import generics, status, permissions, filters
 from rest_framework.parsers import MultiPartParser, FormParser
-from django.db.models import QuerySet
+from django.db.models import Count, QuerySet
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from captcha.models import CaptchaStore
 from captcha.helpers import captcha_image_url
 import logging
 
 from blog.models import BlogPostPage, BlogPostComment
+from blog.stats import get_blog_stats
 from blog.api.serializers.serializers import (
-    BlogPostPageSerializer, BlogPostCreateSerializer, BlogPostDeleteSerializer,
-    BlogPostCommentSerializer, BlogCommentCreateSerializer
+    BlogPostPageSerializer, BlogPostListSerializer, BlogPostCreateSerializer,
+    BlogPostDeleteSerializer, BlogPostCommentSerializer, BlogCommentCreateSerializer
 )
 from rest_framework.permissions import IsAuthenticated
 from app.permissions import IsAuthenticatedStaff, IsStaffOrReadOnly
+from app.utils.cache import cache_page_with_prefix, conditional_on_tags
+from portfolio.utils.cache_tags import add_cache_tags, post_tag, topic_tag
+from portfolio.utils.keyset_pagination import KeysetOptInPagination
+from portfolio.utils.user_agent_classifier import classify_request
 from app.utils.error_responses import error_response, cloudinary_error_response, validation_error_response
 
 logger = logging.getLogger(__name__)
 
 
-class BlogPostPagination(PageNumberPagination):
+class BlogPostPagination(KeysetOptInPagination):
     page_size = 6
     page_size_query_param = 'page_size'
     max_page_size = 20
+    keyset_ordering = ('-first_published_at', '-id')
 
 
+class BlogCommentPagination(BlogPostPagination):
+    keyset_ordering = ('-created_at', '-id')
+
+
+@method_decorator(conditional_on_tags('blog', 'comments'), name='dispatch')
 class BlogPostListAPIView(generics.ListAPIView):
     """API view for listing blog posts with search and filtering"""
-    serializer_class = BlogPostPageSerializer
+    serializer_class = BlogPostListSerializer
     pagination_class = BlogPostPagination
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title', 'content', 'tags__name']
@@ -47,6 +56,7 @@ class BlogPostListAPIView(generics.ListAPIView):
         tag = self.request.query_params.get('tag', None)
         if tag:
             queryset = queryset.filter(tags__name__icontains=tag)
+            add_cache_tags(self.request, topic_tag(tag))
 
         # Filter by year/month
         year = self.request.query_params.get('year', None)
@@ -56,9 +66,22 @@ class BlogPostListAPIView(generics.ListAPIView):
         if month:
             queryset = queryset.filter(first_published_at__month=month)
 
-        return queryset.select_related('author').prefetch_related('images', 'comments', 'tags')
-
-    @method_decorator(cache_page(60 * 15))  # Cache for 15 minutes
+        # Comment counts are annotated and excerpts and covers are stored
+        # columns, so a page costs the same number of queries whatever its
+        # size and never loads the full content
+        return queryset.select_related('author').defer('content').annotate(
+            comments_count=Count('comments', distinct=True)
+        ).prefetch_related('tags')
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        # Comment counts: purge this page when any listed post changes
+        if page is not None:
+            add_cache_tags(self.request, *(post_tag(post) for post in page))
+        return page
+
+    # Purged by tag whenever a post changes, so it can live for hours
+    @method_decorator(cache_page_with_prefix('blog-posts', 60 * 60 * 6))
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
@@ -78,8 +101,7 @@ class BlogPostDetailAPIView(generics.RetrieveAPIView):
 
         # Increment view count (with basic security)
         try:
-            user_agent = request.META.get('HTTP_USER_AGENT', '')
-            if not any(bot in user_agent.lower() for bot in ['bot', 'crawler', 'spider']):
+            if not classify_request(request).is_automated:
                 instance.increment_view_count(request)
         except Exception as e:
             # Log error but don't fail the request
@@ -308,7 +330,7 @@ class BlogPostDeleteAPIView(generics.DestroyAPIView):
 class BlogCommentListCreateAPIView(generics.ListCreateAPIView):
     """API view for listing and creating blog comments"""
     permission_classes = [permissions.AllowAny]
-    pagination_class = BlogPostPagination
+    pagination_class = BlogCommentPagination
 
     def get_queryset(self) -> QuerySet:
         blog_slug = self.kwargs.get('blog_slug')
@@ -354,33 +376,8 @@ class BlogCommentListCreateAPIView(generics.ListCreateAPIView):
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def blog_stats_api(request):
-    """API endpoint for blog statistics"""
-    from django.db.models import Count
-    from collections import Counter
-
-    posts = BlogPostPage.objects.live().public()
-    total_posts = posts.count()
-    total_views = sum(posts.values_list('view_count', flat=True))
-    total_comments = BlogPostComment.objects.count()
-
-    # Get popular tags
-    all_tags = []
-    for post in posts:
-        all_tags.extend([tag.name for tag in post.tags.all()])
-
-    popular_tags = [{'name': tag, 'count': count} for tag, count in Counter(all_tags).most_common(10)]
-
-    # Recent posts
-    recent_posts = posts.order_by('-first_published_at')[:5]
-    recent_posts_data = BlogPostPageSerializer(recent_posts, many=True).data
-
-    return Response({
-        'total_posts': total_posts,
-        'total_views': total_views,
-        'total_comments': total_comments,
-        'popular_tags': popular_tags,
-        'recent_posts': recent_posts_data
-    })
+    """API endpoint for blog statistics, served from a cached snapshot"""
+    return Response(get_blog_stats())
 
 
 @api_view(['GET'])
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import DERIVED_FIELDS, BlogPostPage
+
+
+class Command(BaseCommand):
+    help = 'Populate the stored excerpt, intro, summary, reading time and cover of blog posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Posts updated per query',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        batch, updated = [], 0
+
+        for post in BlogPostPage.objects.order_by('pk').iterator(chunk_size=batch_size):
+            post.refresh_derived_fields()
+            batch.append(post)
+            if len(batch) >= batch_size:
+                updated += BlogPostPage.objects.bulk_update(batch, DERIVED_FIELDS)
+                batch = []
+        if batch:
+            updated += BlogPostPage.objects.bulk_update(batch, DERIVED_FIELDS)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Backfilled derived fields of {updated} posts")
+        )
@@ -1,29 +1,33 @@
 from datetime import timedelta
 
 from django.core.management.base import BaseCommand
-from django.db import models
-from django.db.models import Count
+from django.db.models import Sum
 from django.utils import timezone
 
-from blog.models import ViewCountAttempt
+from blog.models import ViewCountRollup
+from blog.view_rollups import rollup_view_attempts
 
 
 class Command(BaseCommand):
     help = 'Detect and report view count abuse patterns'
 
     def handle(self, *args, **options):
+        # Bring the hourly rollups up to date (incremental)
+        rollup_view_attempts()
+
         # Find IPs with high failure rates
-        yesterday = timezone.now() - timedelta(days=1)
+        yesterday = (timezone.now() - timedelta(days=1)).replace(
+            minute=0, second=0, microsecond=0)
 
-        suspicious_ips = ViewCountAttempt.objects.filter(
-            timestamp__gte=yesterday
+        suspicious_ips = ViewCountRollup.objects.filter(
+            hour__gte=yesterday
         ).values('ip_address').annotate(
-            total_attempts=Count('id'),
-            failed_attempts=Count('id', filter=models.Q(success=False))
+            total_attempts=Sum('attempts'),
+            failed_attempts=Sum('failures')
         ).filter(
             total_attempts__gt=50,  # More than 50 attempts
             failed_attempts__gt=40   # More than 40 failures
-        )
+        ).order_by()
 
         for ip_data in suspicious_ips:
             self.stdout.write(
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from blog.view_counts import view_count_buffer
+
+
+class Command(BaseCommand):
+    help = 'Write buffered blog post views to the database'
+
+    def handle(self, *args, **options):
+        counts = view_count_buffer.flush()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Flushed {sum(counts.values())} views "
+                f"across {len(counts)} posts"
+            )
+        )
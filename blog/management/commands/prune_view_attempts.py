@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.view_rollups import prune_view_attempts
+
+
+class Command(BaseCommand):
+    help = 'Delete raw view count attempts older than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.VIEW_ATTEMPT_RETENTION_DAYS,
+            help='Keep raw attempts for this many days'
+        )
+
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Rows deleted per statement'
+        )
+
+        parser.add_argument(
+            '--include-visitors',
+            action='store_true',
+            help='Also delete the unique-visitor rows used by view counting'
+        )
+
+    def handle(self, *args, **options):
+        deleted = prune_view_attempts(
+            days=options['days'],
+            chunk_size=options['chunk_size'],
+            include_visitors=options['include_visitors'],
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {deleted} view count attempts older than "
+                f"{options['days']} days"
+            )
+        )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from blog.stats import refresh_blog_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the cached blog statistics snapshot'
+
+    def handle(self, *args, **options):
+        stats = refresh_blog_stats()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Blog statistics refreshed: {stats['total_posts']} posts, "
+                f"{stats['total_views']} views"
+            )
+        )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from blog.view_rollups import DEFAULT_BATCH_SIZE, rollup_view_attempts
+
+
+class Command(BaseCommand):
+    help = 'Fold new view count attempts into the hourly rollups'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Raw rows aggregated per transaction'
+        )
+
+    def handle(self, *args, **options):
+        folded = rollup_view_attempts(batch_size=options['batch_size'])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rolled up {folded} view count attempts")
+        )
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0025_alter_blogpostimage_post'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'rollup_checkpoints',
+            },
+        ),
+        migrations.CreateModel(
+            name='ViewCountRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('ip_address', models.GenericIPAddressField()),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('failures', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'view_count_rollups',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='viewcountattempt',
+            index=models.Index(fields=['timestamp'], name='view_count__timesta_0129e9_idx'),
+        ),
+        migrations.AddField(
+            model_name='viewcountrollup',
+            name='article',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_count_rollups', to='blog.blogpostpage'),
+        ),
+        migrations.AddIndex(
+            model_name='viewcountrollup',
+            index=models.Index(fields=['hour', 'ip_address'], name='view_count__hour_e68563_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='viewcountrollup',
+            unique_together={('hour', 'ip_address', 'article')},
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def build_tag_counts(apps, schema_editor):
+    """Fill the index from the existing posts and tags."""
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    BlogPostPage = apps.get_model('blog', 'BlogPostPage')
+    BlogTagCount = apps.get_model('blog', 'BlogTagCount')
+    TaggedItem = apps.get_model('taggit', 'TaggedItem')
+
+    content_type = ContentType.objects.filter(
+        app_label='blog', model='blogpostpage').first()
+    if content_type is None:
+        return
+
+    live = BlogPostPage.objects.filter(live=True)
+    counts = TaggedItem.objects.filter(
+        content_type=content_type, object_id__in=live.values('pk')
+    ).values('tag_id', 'tag__name').annotate(
+        posts=Count('object_id', distinct=True)
+    ).order_by()
+
+    BlogTagCount.objects.bulk_create([
+        BlogTagCount(tag_id=row['tag_id'], name=row['tag__name'],
+                     article_count=row['posts'])
+        for row in counts
+    ])
+    BlogTagCount.objects.create(name='all', article_count=live.count())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0026_view_count_rollups'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogTagCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('article_count', models.PositiveIntegerField(default=0)),
+                ('tag', models.OneToOneField(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='blog_post_count', to='taggit.tag')),
+            ],
+            options={
+                'db_table': 'blog_tag_counts',
+                'indexes': [models.Index(fields=['name'], name='blog_tag_co_name_b9d188_idx')],
+            },
+        ),
+        migrations.RunPython(build_tag_counts, migrations.RunPython.noop),
+    ]
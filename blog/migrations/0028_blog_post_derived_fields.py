@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0027_blog_tag_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpostpage',
+            name='cover_image_url',
+            field=models.URLField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='blogpostpage',
+            name='excerpt',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpostpage',
+            name='intro',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpostpage',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Estimated minutes to read'),
+        ),
+        migrations.AddField(
+            model_name='blogpostpage',
+            name='summary',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Plain-text excerpt for listings', max_length=255),
+        ),
+    ]
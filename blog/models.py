@@ -1,15 +1,16 @@
 """
 this is the model for the blog post using wagtail cms
 """
-import hashlib
 import logging
 from django.contrib.auth.models import User
 from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.db import models
-from django.db.models import Count
-from django.db.models.signals import pre_delete
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete
+)
 from django.dispatch import receiver
 from django.utils import timezone
+from django.utils.html import strip_tags
 from django.utils.text import slugify
 from modelcluster.fields import ParentalKey
 from taggit.managers import TaggableManager
@@ -17,11 +18,16 @@ from wagtail.admin.panels import FieldPanel, MultiFieldPanel
 from wagtail.contrib.routable_page.models import RoutablePageMixin
 from wagtail.fields import RichTextField
 from wagtail.models import Orderable, Page
+from wagtail.signals import page_published, page_unpublished
 
 from blog.wagtail_models import CloudinaryWagtailImage
+from portfolio.utils.cache_tags import invalidate_tags_on_commit, post_tag, topic_tag
 
 logger = logging.getLogger(__name__)
 
+# Columns of BlogPostPage recomputed whenever its content is saved
+DERIVED_FIELDS = ('excerpt', 'intro', 'summary', 'reading_time', 'cover_image_url')
+
 
 class BlogIndexPage(RoutablePageMixin, Page):
     subpage_types = ["blog.BlogPostPage"]
@@ -35,7 +41,8 @@ class BlogIndexPage(RoutablePageMixin, Page):
         context = super().get_context(request)
 
         # Paginate blog posts
-        posts = BlogPostPage.objects.live().order_by("-first_published_at")
+        posts = BlogPostPage.objects.live().defer("content")\
+            .order_by("-first_published_at")
         paginator = Paginator(posts, 6)  # 6 posts per page
         page_number = request.GET.get('page')
 
@@ -80,6 +87,17 @@ class BlogPostPage(Page):
         help_text="Timestamp of the last view count increment"
     )
 
+    # Derived from content and images on save, so lists never load content
+    excerpt = models.TextField(blank=True, default='', editable=False)
+    intro = models.TextField(blank=True, default='', editable=False)
+    summary = models.CharField(max_length=255, blank=True, default='',
+                               editable=False,
+                               help_text="Plain-text excerpt for listings")
+    reading_time = models.PositiveIntegerField(
+        default=1, editable=False, help_text="Estimated minutes to read"
+    )
+    cover_image_url = models.URLField(blank=True, null=True, editable=False)
+
     content_panels = Page.content_panels + [
         FieldPanel("author"),
         FieldPanel("content", heading="Current Content (RichText)"),
@@ -104,8 +122,32 @@ class BlogPostPage(Page):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            self.refresh_derived_fields()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *DERIVED_FIELDS}
         super().save(*args, **kwargs)
 
+    def refresh_derived_fields(self):
+        """Recompute the excerpt, intro, summary, reading time and cover"""
+        content = self.content or ''
+        self.excerpt = f"{content[:200]}..." if len(content) > 200 else content
+        # First paragraph
+        self.intro = content.split('\n', 1)[0]
+        text = strip_tags(content)
+        self.summary = f"{text[:150]}..." if len(text) > 150 else text
+        # Approximately 200 words per minute
+        self.reading_time = max(1, round(len(content.split()) / 200))
+        self.cover_image_url = self.compute_cover_image_url()
+
+    def refresh_cover_image_url(self):
+        """Store the cover after its images changed, without a full save"""
+        self.cover_image_url = self.compute_cover_image_url()
+        BlogPostPage.objects.filter(pk=self.pk).update(
+            cover_image_url=self.cover_image_url
+        )
+
     @property
     def first_image(self):
         """Get the first image from the gallery or legacy image"""
@@ -115,11 +157,12 @@ class BlogPostPage(Page):
         # Fallback to legacy image system
         return self.images.first() if hasattr(self, 'images') else None
 
-    @property
-    def cover_image_url(self):
+    def compute_cover_image_url(self):
         """
         Get the cover image URL (first image or legacy optimized_image_url)
         """
+        if self.pk is None:
+            return self.optimized_image_url or None
         first_img = self.first_image
         if first_img and hasattr(first_img, 'optimized_image_url'):
             return first_img.optimized_image_url
@@ -136,59 +179,23 @@ class BlogPostPage(Page):
         )
 
     def increment_view_count(self, request):
-        """Increment the view count for this post"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0].strip()
-        else:
-            ip = request.META.get('REMOTE_ADDR', '')
-        user_agent = request.META.get('HTTP_USER_AGENT', '')
-        visitor_hash = hashlib.sha256(
-            f"{ip}_{user_agent}".encode()).hexdigest()
-
-        _, created = ViewCountAttempt.objects.get_or_create(
-            article=self,
-            visitor_hash=visitor_hash,
-            defaults={
-                'ip_address': ip,
-                'user_agent': user_agent,
-                'user': request.user if request.user.is_authenticated else None
-            }
-        )
-        if created:
-            BlogPostPage.objects.filter(pk=self.pk).update(
-                view_count=models.F('view_count') + 1,
-                last_view_increment=timezone.now()
-            )
-            self.refresh_from_db(fields=['view_count', 'last_view_increment'])
+        """
+        Count a view of this post; the write is buffered and applied in
+        bulk later (see blog.view_counts)
+        """
+        from blog.view_counts import view_count_buffer
+
+        if view_count_buffer.record(self, request):
+            self.view_count += 1
             return True
         return False
 
-    def get_tag_counts(self):
-        articles = BlogPostPage.objects.all()
-        if not articles.exists():
-            return []
-
-        # Get all tags used by the articles in the queryset
-        # Use distinct to avoid duplicates and annotate with count
-        from taggit.models import Tag
-
-        # Get tag IDs that are used by our filtered articles
-        article_ids = list(articles.values_list('id', flat=True))
+    @classmethod
+    def get_tag_counts(cls):
+        """Live posts per tag, from the materialized tag counts"""
+        from blog.tag_counts import get_tag_counts
 
-        # Query tags that are associated with these articles
-        tags_with_counts = (
-            Tag.objects
-            .filter(
-                taggit_taggeditem_items__object_id__in=article_ids,
-                taggit_taggeditem_items__content_type__model='blogpostpage'
-            ).annotate(article_count=Count('taggit_taggeditem_items',
-                                           distinct=True)).order_by('name'))
-
-        tag_count = [(tag.name, tag.article_count) for tag in tags_with_counts]
-
-        all_count = articles.count()
-        return [("all", all_count)] + tag_count
+        return get_tag_counts()
 
     def get_view_count_display(self):
         """Return view count as a formatted string"""
@@ -257,9 +264,54 @@ class ViewCountAttempt(models.Model):
         indexes = [
             models.Index(fields=['ip_address', 'timestamp']),
             models.Index(fields=['article', 'visitor_hash']),
+            models.Index(fields=['timestamp']),
         ]
 
 
+class ViewCountRollup(models.Model):
+    """Hourly view count attempts and failures per IP and article"""
+    hour = models.DateTimeField()
+    ip_address = models.GenericIPAddressField()
+    article = models.ForeignKey(BlogPostPage, on_delete=models.CASCADE,
+                                related_name='view_count_rollups')
+    attempts = models.PositiveIntegerField(default=0)
+    failures = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'view_count_rollups'
+        unique_together = ['hour', 'ip_address', 'article']
+        indexes = [
+            models.Index(fields=['hour', 'ip_address']),
+        ]
+
+
+class BlogTagCount(models.Model):
+    """
+    Live blog posts per tag, kept up to date by signals (see
+    blog.tag_counts); the row without a tag counts all live posts
+    """
+    tag = models.OneToOneField('taggit.Tag', on_delete=models.CASCADE,
+                               null=True, related_name='blog_post_count')
+    name = models.CharField(max_length=100)
+    article_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'blog_tag_counts'
+        indexes = [
+            models.Index(fields=['name']),
+        ]
+
+
+class RollupCheckpoint(models.Model):
+    """Last raw row folded into a rollup table"""
+    name = models.CharField(max_length=100, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'rollup_checkpoints'
+
+
 class BlogPostImage(models.Model):
     post = models.ForeignKey(
         BlogPostPage,
@@ -358,3 +410,93 @@ def delete_blogpost_image_from_cloudinary(sender, instance, **kwargs):
                 f"Signal handler failed to delete image {instance.cloudinary_image_id} "
                 f"from Cloudinary: {str(e)}"
             )
+
+
+# Signal handlers for tag-based cache invalidation
+@receiver(post_save, sender=BlogPostPage)
+@receiver(post_delete, sender=BlogPostPage)
+def invalidate_blog_post_cache(sender, instance, **kwargs):
+    """Purge cached pages and API responses built from a blog post."""
+    tags = [post_tag(instance), 'blog']
+    if instance.pk:
+        try:
+            tags.extend(topic_tag(name) for name in instance.tags.names())
+        except Exception:
+            # Tags are already gone on delete; 'blog' covers the tag lists
+            pass
+    invalidate_tags_on_commit(*tags)
+
+
+@receiver(post_save, sender=BlogPostComment)
+@receiver(post_delete, sender=BlogPostComment)
+def invalidate_blog_comment_cache(sender, instance, **kwargs):
+    """
+    Comments are embedded in post responses; purge their post. The
+    'comments' tag versions the ETags of lists that embed comments.
+    """
+    invalidate_tags_on_commit(post_tag(instance.post_id), 'comments')
+
+
+# Signal handlers keeping the materialized tag counts current
+@receiver(m2m_changed, sender=BlogPostPage.tags.through)
+def refresh_tag_counts_on_tagging(sender, instance, action, pk_set, **kwargs):
+    """Recount the tags added to or removed from a post."""
+    from blog.tag_counts import post_tag_ids, refresh_tag_counts
+
+    if not isinstance(instance, BlogPostPage):
+        return
+    if action == 'pre_clear':
+        instance._cleared_tag_ids = post_tag_ids(instance)
+    elif action == 'post_clear':
+        refresh_tag_counts(getattr(instance, '_cleared_tag_ids', None))
+    elif action in ('post_add', 'post_remove') and pk_set:
+        refresh_tag_counts(pk_set)
+
+
+@receiver(pre_delete, sender=BlogPostPage)
+def remember_deleted_post_tags(sender, instance, **kwargs):
+    from blog.tag_counts import post_tag_ids
+
+    instance._deleted_tag_ids = post_tag_ids(instance)
+
+
+@receiver(post_save, sender=BlogPostPage)
+@receiver(post_delete, sender=BlogPostPage)
+@receiver(page_published, sender=BlogPostPage)
+@receiver(page_unpublished, sender=BlogPostPage)
+def refresh_tag_counts_on_publish(sender, instance, **kwargs):
+    """A post going live or away changes the counts of all its tags."""
+    from blog.tag_counts import post_tag_ids, refresh_tag_counts
+
+    tag_ids = getattr(instance, '_deleted_tag_ids', None)
+    refresh_tag_counts(post_tag_ids(instance) if tag_ids is None else tag_ids)
+
+
+# Signal handlers dropping the cached blog statistics
+@receiver(post_save, sender=BlogPostPage)
+@receiver(post_delete, sender=BlogPostPage)
+@receiver(page_published, sender=BlogPostPage)
+@receiver(page_unpublished, sender=BlogPostPage)
+@receiver(post_save, sender=BlogPostComment)
+@receiver(post_delete, sender=BlogPostComment)
+@receiver(post_save, sender=BlogPostImage)
+@receiver(post_delete, sender=BlogPostImage)
+@receiver(m2m_changed, sender=BlogPostPage.tags.through)
+def invalidate_blog_stats_on_change(sender, **kwargs):
+    """Posts, comments, images and tags all feed the statistics snapshot."""
+    from blog.stats import invalidate_blog_stats
+
+    invalidate_blog_stats()
+
+
+# Signal handlers keeping the stored cover image URL current
+@receiver(post_save, sender=BlogPostImage)
+@receiver(post_delete, sender=BlogPostImage)
+@receiver(post_save, sender=BlogPostPageGalleryImage)
+@receiver(post_delete, sender=BlogPostPageGalleryImage)
+def refresh_cover_image_on_image_change(sender, instance, **kwargs):
+    """The first image of a post is its cover."""
+    post_id = getattr(instance, 'post_id', None) or getattr(instance, 'page_id', None)
+    post = BlogPostPage.objects.filter(pk=post_id).first()
+    if post is not None:
+        post.refresh_cover_image_url()
@@ -0,0 +1,84 @@
+"""
+Blog Statistics Snapshot
+========================
+
+The statistics sidebar (post, view and comment totals, popular tags and
+recent posts) is computed from database aggregates in a fixed number of
+queries: one ``Count``/``Sum`` over live posts, one comment count, the top
+of the materialized tag counts (see blog.tag_counts) and one query for the
+recent posts with their stored cover image URL.
+
+The snapshot is cached. Signal handlers in ``blog.models`` drop it when a
+post, comment, image or tag changes, and it expires after
+``BLOG_STATS_TIMEOUT`` seconds so buffered view counts (written with
+queryset updates, which send no signals) show up on a schedule.
+``manage.py refresh_blog_stats`` recomputes it ahead of requests.
+"""
+
+from typing import Any, Dict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Sum
+
+from blog.models import BlogPostComment, BlogPostPage, BlogTagCount
+
+# Cache key of the current snapshot
+STATS_CACHE_KEY = 'blog_stats_snapshot'
+
+# Default seconds a snapshot is served before it is recomputed
+DEFAULT_TIMEOUT = 300
+
+POPULAR_TAGS = 10
+RECENT_POSTS = 5
+
+
+def compute_blog_stats() -> Dict[str, Any]:
+    """Build the statistics from aggregates over live, public posts"""
+    posts = BlogPostPage.objects.live().public()
+    totals = posts.aggregate(total_posts=Count('pk'), total_views=Sum('view_count'))
+
+    popular_tags = [
+        {'name': name, 'count': count}
+        for name, count in BlogTagCount.objects.filter(
+            tag__isnull=False, article_count__gt=0
+        ).order_by('-article_count', 'name').values_list(
+            'name', 'article_count'
+        )[:POPULAR_TAGS]
+    ]
+
+    recent_posts = list(
+        posts.order_by('-first_published_at').values(
+            'id', 'title', 'slug', 'first_published_at',
+            featured_image_url=F('cover_image_url'),
+        )[:RECENT_POSTS]
+    )
+
+    return {
+        'total_posts': totals['total_posts'],
+        'total_views': totals['total_views'] or 0,
+        'total_comments': BlogPostComment.objects.count(),
+        'popular_tags': popular_tags,
+        'recent_posts': recent_posts,
+    }
+
+
+def refresh_blog_stats() -> Dict[str, Any]:
+    """Recompute the snapshot and cache it"""
+    stats = compute_blog_stats()
+    cache.set(STATS_CACHE_KEY, stats,
+              getattr(settings, 'BLOG_STATS_TIMEOUT', DEFAULT_TIMEOUT))
+    return stats
+
+
+def get_blog_stats() -> Dict[str, Any]:
+    """The cached snapshot, recomputed if it was dropped or expired"""
+    stats = cache.get(STATS_CACHE_KEY)
+    if stats is None:
+        stats = refresh_blog_stats()
+    return stats
+
+
+def invalidate_blog_stats() -> None:
+    """Drop the snapshot; the next request recomputes it"""
+    cache.delete(STATS_CACHE_KEY)
@@ -0,0 +1,89 @@
+"""
+Materialized Tag Counts for Blog Sidebars and Suggestions
+=========================================================
+
+``BlogTagCount`` holds the number of live posts per tag, plus one row for
+all live posts. Signal handlers in ``blog.models`` recount only the tags a
+change touches: tags added to or removed from a post (taggit sends
+``m2m_changed``), and a post's tags when it is saved, published,
+unpublished or deleted. Sidebars read the whole index with one query, so
+their cost no longer grows with the number of posts.
+"""
+
+from typing import Iterable, List, Optional, Tuple
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import BooleanField, Count, ExpressionWrapper, Q
+from taggit.models import Tag, TaggedItem
+
+from blog.models import BlogPostPage, BlogTagCount
+
+# Name of the row counting all live posts
+ALL_POSTS = 'all'
+
+
+def post_tag_ids(post) -> List[int]:
+    """Ids of the tags on a post"""
+    return list(TaggedItem.objects.filter(
+        content_type=ContentType.objects.get_for_model(BlogPostPage),
+        object_id=post.pk,
+    ).values_list('tag_id', flat=True))
+
+
+def refresh_tag_counts(tag_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Recount live posts for the given tags (every tag if None) and the
+    row for all posts
+    """
+    items = TaggedItem.objects.filter(
+        content_type=ContentType.objects.get_for_model(BlogPostPage),
+        object_id__in=BlogPostPage.objects.live().values('pk'),
+    )
+    if tag_ids is not None:
+        tag_ids = set(tag_ids)
+        items = items.filter(tag_id__in=tag_ids)
+
+    counts = dict(items.values('tag_id').annotate(
+        posts=Count('object_id', distinct=True)
+    ).values_list('tag_id', 'posts').order_by())
+    names = dict(Tag.objects.filter(pk__in=counts).values_list('pk', 'name'))
+
+    with transaction.atomic():
+        stale = BlogTagCount.objects.filter(tag__isnull=False)
+        if tag_ids is not None:
+            stale = stale.filter(tag_id__in=tag_ids)
+        stale.exclude(tag_id__in=counts).delete()
+
+        BlogTagCount.objects.bulk_create(
+            [BlogTagCount(tag_id=pk, name=names[pk], article_count=posts)
+             for pk, posts in counts.items()],
+            update_conflicts=True,
+            unique_fields=['tag'],
+            update_fields=['name', 'article_count'],
+        )
+        BlogTagCount.objects.update_or_create(
+            tag=None,
+            defaults={'name': ALL_POSTS,
+                      'article_count': BlogPostPage.objects.live().count()},
+        )
+
+
+def get_tag_counts() -> List[Tuple[str, int]]:
+    """``[('all', posts), (tag, posts), ...]`` for live posts, by tag name"""
+    return list(
+        BlogTagCount.objects.filter(article_count__gt=0)
+        .alias(is_all=ExpressionWrapper(Q(tag__isnull=True),
+                                        output_field=BooleanField()))
+        .order_by('-is_all', 'name')
+        .values_list('name', 'article_count')
+    )
+
+
+def matching_tags(query: str, limit: int) -> List[str]:
+    """Names of tags on live posts containing ``query``"""
+    return list(
+        BlogTagCount.objects.filter(
+            tag__isnull=False, article_count__gt=0, name__icontains=query
+        ).order_by('name').values_list('name', flat=True)[:limit]
+    )
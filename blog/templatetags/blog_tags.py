@@ -25,6 +25,10 @@ def get_excerpt(post):
     """
     Get excerpt from post using the content fallback hierarchy
     """
+    # Stored summary of blog posts, refreshed on save
+    if getattr(post, 'summary', None):
+        return post.summary
+
     # Try stream_content first
     if hasattr(post, 'stream_content') and post.stream_content:
         excerpt = get_first_rich_text(post.stream_content)
@@ -0,0 +1,178 @@
+"""
+Batched Logging of View Count Attempts
+======================================
+
+The view count endpoint records an audit row for every attempt, accepted or
+not. Rows are queued in memory and written with ``bulk_create`` when
+``BATCH_SIZE`` rows are waiting or ``FLUSH_INTERVAL`` seconds have passed,
+by a background thread (or inline when ``ASYNC`` is off), so rejected
+beacons cost no database write in the request. A batch the database
+rejects is retried row by row, so one bad row does not lose the others.
+Rows still queued when the process exits are written by an exit hook.
+
+The queue is bounded by ``MAX_QUEUE``: under overload new rows are dropped
+rather than growing memory or the write load, and drops are counted in the
+shared cache metrics (group ``view_attempts``, see ``cache_management
+stats``) along with the rows written.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from portfolio.utils.cache_metrics import cache_metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BATCH_SIZE': 100,  # rows per bulk_create
+    'FLUSH_INTERVAL': 5,  # seconds a row may wait in the queue
+    'MAX_QUEUE': 10000,  # rows kept before new ones are dropped
+    'ASYNC': True,  # write from a background thread
+}
+
+
+class ViewAttemptLog:
+    """Bounded in-memory queue of ViewCountAttempt rows, written in batches."""
+
+    def __init__(self, **options):
+        self.options = options
+        self._queue: Deque = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._last_flush = time.monotonic()
+        self.dropped = 0
+        self.written = 0
+
+    def option(self, name: str):
+        if name in self.options:
+            return self.options[name]
+        return getattr(settings, 'VIEW_ATTEMPT_LOG', {}).get(name, DEFAULTS[name])
+
+    def log(self, attempt) -> bool:
+        """
+        Queue an unsaved ViewCountAttempt
+
+        Returns:
+            False if the queue was full and the row was dropped
+        """
+        with self._lock:
+            if len(self._queue) >= self.option('MAX_QUEUE'):
+                self.dropped += 1
+                dropped = True
+            else:
+                self._queue.append(attempt)
+                dropped = False
+            due = (len(self._queue) >= self.option('BATCH_SIZE') or
+                   time.monotonic() - self._last_flush >= self.option('FLUSH_INTERVAL'))
+
+        if dropped:
+            cache_metrics.incr('view_attempts', 'dropped')
+            return False
+        if due:
+            if self.option('ASYNC'):
+                self._ensure_worker()
+                self._wakeup.set()
+            else:
+                self.flush()
+        return True
+
+    def flush(self) -> int:
+        """Write every queued row; returns the number written"""
+        from blog.models import ViewCountAttempt
+
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._queue.popleft() for _ in
+                             range(min(len(self._queue), self.option('BATCH_SIZE')))]
+                    self._last_flush = time.monotonic()
+                if not batch:
+                    break
+                try:
+                    with transaction.atomic():
+                        ViewCountAttempt.objects.bulk_create(batch)
+                    written += len(batch)
+                except Exception as e:
+                    logger.warning(f"Retrying {len(batch)} view attempts one by one: {e}")
+                    written += self._write_each(batch)
+
+        if written:
+            self.written += written
+            cache_metrics.incr('view_attempts', 'written', written)
+        return written
+
+    def flush_at_exit(self) -> None:
+        """Write the rows still queued before the process exits."""
+        with self._lock:
+            if not self._queue:
+                return
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush view attempts at exit: {e}")
+
+        # Whatever could not be written is lost with the process
+        with self._lock:
+            lost = len(self._queue)
+            self._queue.clear()
+            self.dropped += lost
+        if lost:
+            cache_metrics.incr('view_attempts', 'dropped', lost)
+
+    def _write_each(self, batch: List) -> int:
+        """Write rows separately so one bad row only loses itself."""
+        from blog.models import ViewCountAttempt
+
+        written = 0
+        for attempt in batch:
+            try:
+                with transaction.atomic():
+                    ViewCountAttempt.objects.bulk_create([attempt])
+                written += 1
+            except Exception as e:
+                logger.error(f"Failed to write view attempt: {e}")
+                cache_metrics.incr('view_attempts', 'failed')
+        return written
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'queued': len(self._queue), 'written': self.written,
+                    'dropped': self.dropped}
+
+    # Background writer
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name='view-attempt-log', daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.option('FLUSH_INTERVAL'))
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"View attempt writer failed: {e}")
+            finally:
+                # The writer thread must not leak its database connections
+                connections.close_all()
+
+
+view_attempt_log = ViewAttemptLog()
+atexit.register(view_attempt_log.flush_at_exit)
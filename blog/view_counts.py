@@ -0,0 +1,380 @@
+"""
+Write-Behind View Counting for Blog Posts
+=========================================
+
+Detail pages record a view without writing or locking any database row
+during the request. When the default cache is django-redis, each view is
+pushed straight onto a shared Redis list, so no view lives only in a
+worker's memory; other backends append it to a per-process buffer, which
+is also flushed when the process exits.
+
+A flush drains the buffers into the database in bulk: one ``bulk_create``
+of new ``ViewCountAttempt`` rows and a single ``UPDATE`` of ``view_count``
+for every post viewed since the last flush. Requests never flush: each
+worker drains the buffers from a background thread every
+``VIEW_COUNT_BUFFER['FLUSH_INTERVAL']`` seconds (unless ``BACKGROUND`` is
+off), and ``manage.py flush_view_counts`` drains the shared list whatever
+the traffic (run it from cron, and before a deploy).
+
+Visitors are still counted once per post: a cache marker filters repeat
+views cheaply, and the flush checks the unique (article, visitor_hash)
+attempts before counting.
+
+With ``VIEW_COUNT_BUFFER['UNIQUE_VISITORS'] = 'hll'`` visitors are counted
+by a HyperLogLog per post instead (see portfolio.utils.hyperloglog): no
+attempt rows are stored, memory per post is fixed, and each flush adds
+the growth of a post's estimate since the last flush to ``view_count``.
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.http import HttpRequest
+from django.utils import timezone
+
+from portfolio.utils.hyperloglog import UniqueCounter
+from portfolio.utils.rate_limiting import get_client_ip
+from portfolio.utils.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Shared Redis list of views waiting to be written
+BUFFER_KEY = 'blog_view_buffer'
+
+# Unique-visitor counters: HyperLogLog per post, and the estimate last
+# added to view_count
+UNIQUE_VISITORS_KEY = 'blog_view_visitors:{}'
+MATERIALISED_KEY = 'blog_view_visitors_counted:{}'
+
+# Shared Redis set of posts whose unique-visitor counter grew
+GROWN_KEY = 'blog_view_visitors_grown'
+
+# Held by the worker materialising unique-visitor counts
+MATERIALISE_LOCK_KEY = 'blog_view_visitors_lock'
+
+# Default seconds between flushes of a worker's buffer
+DEFAULT_FLUSH_INTERVAL = 30
+
+# Default seconds a visitor is remembered as having viewed a post
+DEFAULT_SEEN_TIMEOUT = 60 * 60 * 24
+
+
+@dataclass(frozen=True)
+class BufferedView:
+    """One view of a post, waiting to be written."""
+
+    article_id: int
+    visitor_hash: str
+    ip_address: str
+    user_agent: str
+    user_id: Optional[int] = None
+
+
+def visitor_hash(ip_address: str, user_agent: str) -> str:
+    return hashlib.sha256(f"{ip_address}_{user_agent}".encode()).hexdigest()
+
+
+def apply_views(views: Iterable[BufferedView]) -> Dict[int, int]:
+    """
+    Write buffered views to the database in bulk
+
+    Only the first view of a post by a visitor counts; views of visitors
+    already recorded, and of deleted posts, are dropped.
+
+    Returns:
+        Views added per post id
+    """
+    from blog.models import BlogPostPage, ViewCountAttempt
+
+    unique: Dict[tuple, BufferedView] = {}
+    for view in views:
+        unique.setdefault((view.article_id, view.visitor_hash), view)
+    if not unique:
+        return {}
+
+    article_ids = {article_id for article_id, _ in unique}
+    with transaction.atomic():
+        seen = set(ViewCountAttempt.objects.filter(
+            article_id__in=article_ids,
+            visitor_hash__in={visitor for _, visitor in unique},
+        ).values_list('article_id', 'visitor_hash'))
+        existing = set(BlogPostPage.objects.filter(
+            pk__in=article_ids
+        ).values_list('pk', flat=True))
+
+        new_views = [view for key, view in unique.items()
+                     if key not in seen and view.article_id in existing]
+        if not new_views:
+            return {}
+
+        ViewCountAttempt.objects.bulk_create([
+            ViewCountAttempt(
+                article_id=view.article_id,
+                visitor_hash=view.visitor_hash,
+                ip_address=view.ip_address,
+                user_agent=view.user_agent,
+                user_id=view.user_id,
+                success=True,
+                reason='View counted',
+            ) for view in new_views
+        ], ignore_conflicts=True)
+
+        counts = Counter(view.article_id for view in new_views)
+        _add_view_counts(counts)
+    return dict(counts)
+
+
+def _add_view_counts(counts: Dict[int, int]) -> None:
+    from blog.models import BlogPostPage
+
+    BlogPostPage.objects.filter(pk__in=counts).update(
+        view_count=F('view_count') + Case(
+            *[When(pk=pk, then=Value(count)) for pk, count in counts.items()],
+            output_field=IntegerField(),
+        ),
+        last_view_increment=timezone.now(),
+    )
+
+
+class ViewCountBuffer:
+    """Per-process view buffer, flushed through a shared list to the database."""
+
+    def __init__(self, cache_backend=None, flush_interval: Optional[float] = None,
+                 counter: Optional[UniqueCounter] = None,
+                 background: Optional[bool] = None):
+        self._cache = cache_backend
+        self.flush_interval = flush_interval
+        self.background_flush = background
+        self.counter = counter or UniqueCounter(cache_backend)
+        self._pending: List[BufferedView] = []
+        # Posts whose unique-visitor counter grew since the last flush
+        self._grown: Set[int] = set()
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+
+    @property
+    def cache(self):
+        return self._cache if self._cache is not None else cache
+
+    @property
+    def config(self) -> Dict:
+        return getattr(settings, 'VIEW_COUNT_BUFFER', {})
+
+    @property
+    def interval(self) -> Optional[float]:
+        if self.flush_interval is not None:
+            return self.flush_interval
+        return self.config.get('FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+
+    @property
+    def background(self) -> bool:
+        """Whether this process drains the buffers from a background thread"""
+        if self.background_flush is not None:
+            return self.background_flush
+        return self.config.get('BACKGROUND', True)
+
+    @property
+    def unique_visitors(self) -> str:
+        """How visitors are deduplicated: 'rows' or 'hll'"""
+        return self.config.get('UNIQUE_VISITORS', 'rows')
+
+    def _redis_client(self):
+        return get_redis_client(self.cache, 'View buffer')
+
+    # Recording
+
+    def record(self, article, request: HttpRequest) -> bool:
+        """
+        Buffer a view of a post unless the visitor was seen before
+
+        Returns:
+            True if the view was buffered
+        """
+        ip_address = get_client_ip(request)
+        user_agent = request.META.get('HTTP_USER_AGENT', '')
+        visitor = visitor_hash(ip_address, user_agent)
+
+        if self.unique_visitors == 'hll':
+            if not self.counter.add(UNIQUE_VISITORS_KEY.format(article.pk), visitor):
+                return False
+            if not self._push_shared(GROWN_KEY, article.pk):
+                with self._lock:
+                    self._grown.add(article.pk)
+            self._ensure_flusher()
+            return True
+
+        seen_timeout = self.config.get('SEEN_TIMEOUT', DEFAULT_SEEN_TIMEOUT)
+        if not self.cache.add(f'blog_view_seen:{article.pk}:{visitor}', 1,
+                              seen_timeout):
+            return False
+
+        user = getattr(request, 'user', None)
+        view = BufferedView(
+            article_id=article.pk,
+            visitor_hash=visitor,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            user_id=user.pk if user is not None and user.is_authenticated else None,
+        )
+        if not self._push_shared(BUFFER_KEY, json.dumps(asdict(view))):
+            with self._lock:
+                self._pending.append(view)
+        self._ensure_flusher()
+        return True
+
+    def _push_shared(self, key: str, value) -> bool:
+        """Add a view (or a grown post) to the shared buffer, if there is one."""
+        redis = self._redis_client()
+        if redis is None:
+            return False
+        try:
+            if key == GROWN_KEY:
+                redis.sadd(self.cache.make_key(key), value)
+            else:
+                redis.rpush(self.cache.make_key(key), value)
+        except Exception as e:
+            logger.warning(f"View buffer falling back from Redis: {e}")
+            return False
+        return True
+
+    def pending(self) -> Dict[int, int]:
+        """Views buffered in this process's memory, per post id"""
+        with self._lock:
+            return dict(Counter(view.article_id for view in self._pending))
+
+    # Flushing
+
+    def _ensure_flusher(self) -> None:
+        if not self.background or self.interval is None:
+            return
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(
+                    target=self._run, name='view-count-flusher', daemon=True
+                )
+                self._flusher.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"View count flusher failed: {e}")
+            finally:
+                # The flusher thread must not leak its database connections
+                connections.close_all()
+
+    def flush_at_exit(self) -> None:
+        """Write the views held in this process's memory before it exits."""
+        with self._lock:
+            if not self._pending and not self._grown:
+                return
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush buffered views at exit: {e}")
+
+    def _take_pending(self) -> Tuple[List[BufferedView], Set[int]]:
+        with self._lock:
+            views, self._pending = self._pending, []
+            grown, self._grown = self._grown, set()
+        return views, grown
+
+    def _drain_shared(self, redis, views: List[BufferedView],
+                      grown: Set[int]) -> Tuple[List[BufferedView], Set[int]]:
+        """Push this process's views and take the whole shared buffer."""
+        key = self.cache.make_key(BUFFER_KEY)
+        grown_key = self.cache.make_key(GROWN_KEY)
+        with redis.pipeline(transaction=True) as pipe:
+            if views:
+                pipe.rpush(key, *[json.dumps(asdict(view)) for view in views])
+            if grown:
+                pipe.sadd(grown_key, *grown)
+            pipe.lrange(key, 0, -1)
+            pipe.smembers(grown_key)
+            pipe.delete(key, grown_key)
+            shared, shared_grown = pipe.execute()[-3:-1]
+        return ([BufferedView(**json.loads(item)) for item in shared],
+                {int(pk) for pk in shared_grown})
+
+    def materialise(self, article_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        Add the growth of each post's unique-visitor estimate since it was
+        last materialised to its ``view_count``
+
+        Returns:
+            Views added per post id
+        """
+        keys = {pk: UNIQUE_VISITORS_KEY.format(pk) for pk in article_ids}
+        if not keys:
+            return {}
+
+        estimates = self.counter.count(keys.values())
+        counted = self.cache.get_many([MATERIALISED_KEY.format(pk) for pk in keys])
+        counts = {}
+        for pk, key in keys.items():
+            added = estimates[key] - counted.get(MATERIALISED_KEY.format(pk), 0)
+            if added > 0:
+                counts[pk] = added
+        if not counts:
+            return {}
+
+        _add_view_counts(counts)
+        self.cache.set_many({
+            MATERIALISED_KEY.format(pk): estimates[keys[pk]] for pk in counts
+        }, None)
+        return counts
+
+    def flush(self) -> Dict[int, int]:
+        """
+        Write every buffered view (this process's and the shared buffer)
+
+        Returns:
+            Views added per post id
+        """
+        views, grown = self._take_pending()
+        redis = self._redis_client()
+        if redis is not None:
+            try:
+                views, grown = self._drain_shared(redis, views, grown)
+            except Exception as e:
+                logger.warning(f"View buffer falling back from Redis: {e}")
+
+        # Materialising twice at once would count the same growth twice
+        if grown and not self.cache.add(MATERIALISE_LOCK_KEY, 1, 60):
+            with self._lock:
+                self._grown |= grown
+            grown = set()
+
+        try:
+            counts = Counter(apply_views(views))
+            if grown:
+                try:
+                    counts.update(self.materialise(grown))
+                finally:
+                    self.cache.delete(MATERIALISE_LOCK_KEY)
+            return dict(counts)
+        except Exception as e:
+            logger.error(f"Failed to write {len(views)} buffered views: {e}")
+            with self._lock:
+                self._pending[:0] = views
+                self._grown |= grown
+            return {}
+
+
+view_count_buffer = ViewCountBuffer()
+atexit.register(view_count_buffer.flush_at_exit)
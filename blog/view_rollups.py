@@ -0,0 +1,139 @@
+"""
+Hourly Rollups and Retention for View Count Attempts
+====================================================
+
+Raw ``ViewCountAttempt`` rows are folded into ``ViewCountRollup`` (attempts
+and failures per hour, IP and article) incrementally: a checkpoint records
+the last row id folded in, so each run only aggregates rows added since the
+previous one. Ids are handed out before their transaction commits, so a
+run stops short of the first row younger than ``SAFETY_LAG`` seconds: a
+row with a lower id may still be in flight, and would fall behind the
+checkpoint for good. Abuse reports read the rollups, whose size depends on the
+number of active IPs per hour rather than on traffic.
+
+Raw rows older than the retention period are deleted in chunks once they
+have been rolled up. Rows carrying a ``visitor_hash`` are the unique-visitor
+ledger of view counting (see blog.view_counts) and are kept unless asked.
+"""
+
+from datetime import timedelta
+from typing import Dict, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from blog.models import RollupCheckpoint, ViewCountAttempt, ViewCountRollup
+
+# Checkpoint of the view count attempt rollups
+CHECKPOINT_NAME = 'view_count_rollups'
+
+DEFAULT_BATCH_SIZE = 10000
+
+# Seconds a raw row must have existed before it is folded in
+SAFETY_LAG = 60
+
+
+def rollup_view_attempts(batch_size: int = DEFAULT_BATCH_SIZE,
+                         lag: int = SAFETY_LAG) -> int:
+    """
+    Fold raw attempts added since the last run, and older than ``lag``
+    seconds, into the hourly rollups
+
+    Returns:
+        Number of raw rows folded in
+    """
+    cutoff = timezone.now() - timedelta(seconds=lag)
+    folded = 0
+    while True:
+        with transaction.atomic():
+            checkpoint, _ = RollupCheckpoint.objects.select_for_update() \
+                .get_or_create(name=CHECKPOINT_NAME)
+            pending = ViewCountAttempt.objects.filter(id__gt=checkpoint.last_id)
+
+            # Nothing past a recent row: lower ids may not have committed yet
+            first_recent = pending.filter(timestamp__gte=cutoff) \
+                .aggregate(Min('id'))['id__min']
+            if first_recent is not None:
+                pending = pending.filter(id__lt=first_recent)
+
+            upper = list(pending.order_by('id').values_list('id', flat=True)
+                         [batch_size - 1:batch_size])
+            upper = upper[0] if upper else pending.aggregate(Max('id'))['id__max']
+            if upper is None:
+                return folded
+
+            groups = pending.filter(id__lte=upper).annotate(
+                hour=TruncHour('timestamp')
+            ).values('hour', 'ip_address', 'article_id').annotate(
+                attempts=Count('id'),
+                failures=Count('id', filter=Q(success=False)),
+            ).order_by()
+            folded += _merge(groups)
+
+            checkpoint.last_id = upper
+            checkpoint.save()
+
+
+def _merge(groups) -> int:
+    """Add aggregated groups to existing rollups or create new ones."""
+    totals: Dict[Tuple, Tuple[int, int]] = {
+        (group['hour'], group['ip_address'], group['article_id']):
+            (group['attempts'], group['failures'])
+        for group in groups
+    }
+    if not totals:
+        return 0
+
+    existing = {
+        (rollup.hour, rollup.ip_address, rollup.article_id): rollup
+        for rollup in ViewCountRollup.objects.filter(
+            hour__in={hour for hour, _, _ in totals},
+            ip_address__in={ip for _, ip, _ in totals},
+            article_id__in={article for _, _, article in totals},
+        )
+    }
+
+    updated, created = [], []
+    for key, (attempts, failures) in totals.items():
+        rollup = existing.get(key)
+        if rollup is None:
+            hour, ip_address, article_id = key
+            created.append(ViewCountRollup(
+                hour=hour, ip_address=ip_address, article_id=article_id,
+                attempts=attempts, failures=failures,
+            ))
+        else:
+            rollup.attempts += attempts
+            rollup.failures += failures
+            updated.append(rollup)
+
+    ViewCountRollup.objects.bulk_update(updated, ['attempts', 'failures'])
+    ViewCountRollup.objects.bulk_create(created)
+    return sum(attempts for attempts, _ in totals.values())
+
+
+def prune_view_attempts(days: int, chunk_size: int = 5000,
+                        include_visitors: bool = False) -> int:
+    """
+    Delete raw attempts older than ``days`` that were already rolled up
+
+    Returns:
+        Number of rows deleted
+    """
+    last_id = RollupCheckpoint.objects.filter(name=CHECKPOINT_NAME) \
+        .values_list('last_id', flat=True).first() or 0
+    expired = ViewCountAttempt.objects.filter(
+        timestamp__lt=timezone.now() - timedelta(days=days),
+        id__lte=last_id,
+    )
+    if not include_visitors:
+        expired = expired.filter(Q(visitor_hash__isnull=True) | Q(visitor_hash=''))
+
+    deleted = 0
+    while True:
+        ids = list(expired.values_list('id', flat=True)[:chunk_size])
+        if not ids:
+            return deleted
+        deleted += ViewCountAttempt.objects.filter(id__in=ids).delete()[0]
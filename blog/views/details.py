@@ -4,6 +4,7 @@ from django.views.generic import DetailView
 
 from ..forms import BlogPostForm
 from ..models import BlogPostPage
+from portfolio.utils.cache_tags import add_cache_tags, post_tag
 from portfolio.utils.rate_limiting import can_increment_view_count
 
 
@@ -29,6 +30,7 @@ class PostDetailView(DetailView):
     def get_object(self, queryset=None):
         """Override to increment view count when object is accessed"""
         obj = super().get_object(queryset)
+        add_cache_tags(self.request, post_tag(obj))
 
         # Use unified rate limiting system for view count increments
         if can_increment_view_count(self.request, obj.slug):
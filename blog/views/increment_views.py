@@ -10,6 +10,7 @@ from django.views.generic import DetailView
 
 from app.views.helpers.helpers import is_ajax
 from ..models import BlogPostPage, ViewCountAttempt
+from ..view_attempts import view_attempt_log
 
 
 @method_decorator(require_http_methods(["POST"]), name='dispatch')
@@ -30,8 +31,8 @@ class IncrementViewCountView(DetailView):
         if not article:
             return JsonResponse(
                 {'success': False, 'error': 'Article not found'}, status=404)
-        # Log the view count attempt
-        attempt = ViewCountAttempt.objects.create(
+        # Log the view count attempt (queued, written in batches)
+        attempt = ViewCountAttempt(
             article=article,
             ip_address=client_ip,
             user_agent=user_agent,
@@ -42,7 +43,7 @@ class IncrementViewCountView(DetailView):
         try:
             if not self.validate_csrf(request):
                 attempt.reason = 'Invalid CSRF token'
-                attempt.save()
+                view_attempt_log.log(attempt)
                 return JsonResponse(
                     {'success': False, 'error': 'Invalid CSRF token'},
                     status=403)
@@ -50,43 +51,43 @@ class IncrementViewCountView(DetailView):
             # Validate the request
             if not is_ajax(request):
                 attempt.reason = 'Invalid request type'
-                attempt.save()
+                view_attempt_log.log(attempt)
                 return JsonResponse(
                     {'success': False, 'error': 'Invalid request'}, status=405)
 
             if not self.validate_payload(request):
                 attempt.reason = 'Invalid payload'
-                attempt.save()
+                view_attempt_log.log(attempt)
                 return JsonResponse(
                     {'success': False, 'error': 'Invalid payload'}, status=400)
 
             if not self.check_rate_limit(request, article):
                 attempt.reason = 'Rate limit exceeded'
-                attempt.save()
+                view_attempt_log.log(attempt)
                 return JsonResponse({'success': False,
                                      'error': 'Rate limit exceeded'},
                                     status=429)
 
             if not self.validate_referer(request, article):
                 attempt.reason = 'Invalid referer'
-                attempt.save()
+                view_attempt_log.log(attempt)
                 return JsonResponse(
                     {'success': False, 'error': 'Invalid referer'}, status=403)
 
             if self.page_already_viewed(request, article):
                 attempt.reason = 'Page already viewed'
                 attempt.success = False
-                attempt.save()
+                view_attempt_log.log(attempt)
                 return JsonResponse({
                     'success': False, 'message': 'Page already viewed',
                     'view_count': article.view_count
                 }, status=200)
 
             # Increment the view count
-            article.increment_view_count()
+            article.increment_view_count(request)
             attempt.success = True
             attempt.reason = 'View count incremented successfully'
-            attempt.save()
+            view_attempt_log.log(attempt)
             self.mark_page_as_viewed(request, article)
             return JsonResponse({
                 'success': True,
@@ -97,7 +98,7 @@ class IncrementViewCountView(DetailView):
             # Log the error and return a server error response
             attempt.reason = f'Server error: {str(e)}'
             attempt.success = False
-            attempt.save()
+            view_attempt_log.log(attempt)
             return JsonResponse({
                 'success': False,
                 'error': f'Server Error: {str(e)}'}, status=404)
@@ -1,12 +1,11 @@
 from datetime import datetime
 
 from django.contrib.auth.models import User
-from django.db.models import Count
 from django.shortcuts import get_object_or_404, redirect
 from django.views.generic import ListView
-from taggit.models import Tag
 
 from ..models import BlogPostPage
+from ..tag_counts import get_tag_counts
 
 
 class BasePostListView(ListView):
@@ -16,35 +15,16 @@ class BasePostListView(ListView):
     paginate_by = 6
 
     def get_queryset(self):
-        return BlogPostPage.objects.live()
+        # Listings show the stored summary, never the full content
+        return BlogPostPage.objects.live().defer("content")
 
     def get_tag_counts(self):
         """
-        Returns a list of tuples for all tags in the queryset
+        Returns a list of tuples for all tags on live articles
         + total number of articles for each tag
-        + Get all tags used by the articles in the queryset
-        + Use distinct to avoid duplicates and annotate with count
-        + Get tag IDs that are used by our filtered articles
+        + Read from the materialized tag counts (see blog.tag_counts)
         """
-        articles = self.get_queryset()
-        if not articles.exists():
-            return []
-
-        article_ids = list(articles.values_list('id', flat=True))
-
-        # Query tags that are associated with these articles
-        tags_with_counts = (
-            Tag.objects
-            .filter(
-                taggit_taggeditem_items__object_id__in=article_ids,
-                taggit_taggeditem_items__content_type__model='blogpostpage'
-            ).annotate(article_count=Count('taggit_taggeditem_items',
-                                           distinct=True)).order_by('name'))
-
-        tag_count = [(tag.name, tag.article_count) for tag in tags_with_counts]
-
-        all_count = articles.count()
-        return [("all", all_count)] + tag_count
+        return get_tag_counts()
 
     def get_sorting_options(self):
         return {
@@ -96,13 +76,15 @@ class BasePostListView(ListView):
         """
         Returns the 5 most recent blog posts.
         """
-        return BlogPostPage.objects.live().order_by("-first_published_at")[:5]
+        return BlogPostPage.objects.live().defer("content")\
+            .order_by("-first_published_at")[:5]
 
     def get_most_viewed_posts(self):
         """
         Returns the 5 most viewed blog posts from the queryset.
         """
-        return BlogPostPage.objects.live().order_by("-view_count")[:5]
+        return BlogPostPage.objects.live().defer("content")\
+            .order_by("-view_count")[:5]
 
 
 class PostListView(BasePostListView):
@@ -259,8 +241,8 @@ class PostsByTagView(BasePostListView):
         else:
             articles = super().get_queryset()
             articles = articles.filter(tags__name__iexact=tag) """
-        articles = BlogPostPage.objects.live() if tag == 'all' else\
-            BlogPostPage.objects.live().filter(tags__name__iexact=tag)
+        articles = super().get_queryset() if tag == 'all' else\
+            super().get_queryset().filter(tags__name__iexact=tag)
 
         if search_query:
             articles = articles.filter(title__icontains=search_query) |\
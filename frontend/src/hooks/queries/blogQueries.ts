@@ -36,7 +36,9 @@ export interface BlogStats {
   total_views: number;
   total_comments: number;
   popular_tags: Array<{ name: string; count: number }>;
-  recent_posts: BlogPost[];
+  recent_posts: Array<
+    Pick<BlogPost, 'id' | 'title' | 'slug' | 'featured_image_url' | 'first_published_at'>
+  >;
 }
 
 export interface BlogFilters {
@@ -11,6 +11,9 @@ from django.conf import settings
 from django.test import RequestFactory
 from django.urls import reverse
 from portfolio.utils.cache_config import cache_manager, set_cache_strategy
+from portfolio.utils.cache_metrics import cache_metrics, histogram_summary
+from portfolio.utils.cache_policy import get_cache_policy
+from portfolio.utils.cache_warmer import discover_warm_targets
 from portfolio.middlewares.intelligent_cache import IntelligentCacheMiddleware
 import time
 import json
@@ -39,18 +42,49 @@ class Command(BaseCommand):
             help='Specific URLs to warm or invalidate'
         )
 
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Concurrent renders when warming'
+        )
+
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Maximum number of discovered URLs to warm'
+        )
+
+        parser.add_argument(
+            '--base-url',
+            type=str,
+            help='Scheme and host visitors use (defaults to WAGTAILADMIN_BASE_URL)'
+        )
+
         parser.add_argument(
             '--pattern',
             type=str,
             help='Pattern to match for invalidation'
         )
 
+        parser.add_argument(
+            '--tags',
+            nargs='+',
+            help='Content tags to purge (e.g. blog post:12 project:my-app)'
+        )
+
         parser.add_argument(
             '--user-id',
             type=int,
             help='User ID for user-specific cache operations'
         )
 
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reset the hit/miss counters after showing stats'
+        )
+
         parser.add_argument(
             '--verbose',
             action='store_true',
@@ -88,31 +122,40 @@ class Command(BaseCommand):
 
         urls = options.get('urls')
         if not urls:
-            # Default popular pages
-            urls = [
-                '/',
-                '/blog/',
-                '/projects/',
-                '/about/',
-                '/contact/',
-            ]
+            # Popular pages from the sitemap data, hottest posts first
+            urls = discover_warm_targets(options.get('limit'))
 
         self.stdout.write(
             self.style.SUCCESS(f'Warming cache for {len(urls)} URLs...')
         )
 
-        results = cache_manager.warm_cache(urls)
+        start_time = time.time()
+        cache_manager.warm_cache(
+            urls, workers=options['workers'], base_url=options.get('base_url')
+        )
+        elapsed = time.time() - start_time
 
-        for url, success in results.items():
-            if success:
+        for result in cache_manager.last_warm_results:
+            details = f'{result.status_code}, {result.render_ms:.1f}ms'
+            if result.ok:
+                state = 'cached' if result.cached else 'not cacheable'
                 self.stdout.write(
-                    self.style.SUCCESS(f'✓ Warmed: {url}')
+                    self.style.SUCCESS(f'✓ Warmed: {result.url} ({details}, {state})')
                 )
             else:
                 self.stdout.write(
-                    self.style.ERROR(f'✗ Failed: {url}')
+                    self.style.ERROR(
+                        f'✗ Failed: {result.url} ({result.error or details})'
+                    )
                 )
 
+        warmed = sum(1 for result in cache_manager.last_warm_results if result.ok)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Warmed {warmed}/{len(urls)} URLs in {elapsed:.2f}s'
+            )
+        )
+
     def clear_cache(self, options):
         """Clear all cache entries."""
 
@@ -135,10 +178,20 @@ class Command(BaseCommand):
         """Invalidate cache entries."""
 
         pattern = options.get('pattern')
+        tags = options.get('tags')
         user_id = options.get('user_id')
         urls = options.get('urls')
 
-        if pattern:
+        if tags:
+            self.stdout.write(
+                self.style.SUCCESS(f'Invalidating cache for tags: {", ".join(tags)}')
+            )
+            count = cache_manager.invalidate_tags(*tags)
+            self.stdout.write(
+                self.style.SUCCESS(f'✓ Invalidated {count} entries')
+            )
+
+        elif pattern:
             self.stdout.write(
                 self.style.SUCCESS(f'Invalidating cache for pattern: {pattern}')
             )
@@ -172,7 +225,7 @@ class Command(BaseCommand):
                     )
         else:
             raise CommandError(
-                'Please specify --pattern, --user-id, or --urls for invalidation'
+                'Please specify --tags, --pattern, --user-id, or --urls for invalidation'
             )
 
     def test_cache(self, options):
@@ -230,6 +283,7 @@ class Command(BaseCommand):
         """Show cache statistics."""
 
         stats = cache_manager.get_cache_stats()
+        metrics = stats.pop('metrics', {})
 
         self.stdout.write(
             self.style.SUCCESS('Cache Statistics:')
@@ -244,13 +298,19 @@ class Command(BaseCommand):
             else:
                 self.stdout.write(f'{key}: {value}')
 
+        self.show_metrics(metrics)
+        if options.get('reset'):
+            cache_metrics.reset()
+            self.stdout.write(self.style.SUCCESS('✓ Cache metrics reset'))
+
         # Show cache configuration
         self.stdout.write('\nCache Configuration:')
         self.stdout.write('=' * 50)
 
-        cache_config = cache_manager.cache_config
-        self.stdout.write(f'Strategy: {cache_config.strategy}')
-        self.stdout.write(f'Config: {cache_config.config}')
+        policy = get_cache_policy()
+        self.stdout.write(f'Strategy: {policy.strategy}')
+        self.stdout.write(f'Config: {policy.config}')
+        self.show_route_ttls(policy)
 
         # Show intelligent cache settings
         if hasattr(settings, 'INTELLIGENT_CACHE'):
@@ -260,6 +320,31 @@ class Command(BaseCommand):
             for key, value in settings.INTELLIGENT_CACHE.items():
                 self.stdout.write(f'{key}: {value}')
 
+    def show_metrics(self, metrics):
+        """Show hit/miss counters and latency histograms per route group."""
+
+        self.stdout.write('\nCache Metrics (all workers):')
+        self.stdout.write('=' * 50)
+
+        if not metrics:
+            self.stdout.write('No cache activity recorded yet')
+            return
+
+        for group, counters in metrics.items():
+            hits = counters.get('hits', 0) + counters.get('stale', 0)
+            lookups = hits + counters.get('misses', 0)
+            ratio = f' ({hits / lookups:.1%} hit ratio)' if lookups else ''
+            self.stdout.write(f'{group}{ratio}:')
+
+            for name, value in counters.items():
+                if '_ms:' not in name:
+                    self.stdout.write(f'  {name}: {value:g}')
+
+            for histogram in ('get', 'set', 'render_saved'):
+                summary = histogram_summary(counters, histogram)
+                if summary:
+                    self.stdout.write(f'  {summary}')
+
     def set_strategy(self, options):
         """Set cache strategy."""
 
@@ -279,3 +364,11 @@ class Command(BaseCommand):
         cache_config = cache_manager.cache_config
         self.stdout.write(f'New strategy: {cache_config.strategy}')
         self.stdout.write(f'Configuration: {cache_config.config}')
+        self.show_route_ttls(cache_config.policy)
+
+    def show_route_ttls(self, policy):
+        """Show the page TTL each route group gets under a policy."""
+
+        self.stdout.write('Page TTLs:')
+        for group, ttl in policy.route_ttls().items():
+            self.stdout.write(f'  {group}: {ttl}s')
@@ -15,11 +15,30 @@ from typing import Set, List, Optional, Dict, Any
 from django.conf import settings
 from django.http import HttpRequest, HttpResponse
 from django.middleware.cache import UpdateCacheMiddleware, FetchFromCacheMiddleware
-from django.utils.cache import get_cache_key, learn_cache_key
+from django.utils.cache import (
+    get_cache_key,
+    get_max_age,
+    learn_cache_key,
+)
 from django.utils.deprecation import MiddlewareMixin
 from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
 
+from portfolio.middlewares.page_cache import (
+    StaleWhileRevalidateFetchMixin,
+    StaleWhileRevalidateUpdateMixin,
+)
+from portfolio.utils.cache_cookies import (
+    cookies_are_neutral,
+    response_depends_on_cookies,
+)
+from portfolio.utils.cache_keys import canonicalize_request
+from portfolio.utils.cache_metrics import record_cache_event
+from portfolio.utils.cache_policy import get_cache_policy
+from portfolio.utils.cache_tags import register_response_tags
+from portfolio.utils.content_scanner import ContentScanner
+from portfolio.utils.route_classifier import get_route_classifier
+
 
 class IntelligentCacheMiddleware:
     """
@@ -38,85 +57,10 @@ class IntelligentCacheMiddleware:
     def _setup_exclusion_patterns(self):
         """Setup comprehensive exclusion patterns and indicators."""
 
-        # URL patterns that should NEVER be cached
-        self._excluded_patterns = [
-            # Authentication endpoints
-            r'^/login/?$',
-            r'^/signup/?$',
-            r'^/register/?$',
-            r'^/logout/?$',
-            r'^/password-reset/?$',
-            r'^/password-reset/confirm/?$',
-            r'^/auth/',
-
-            # Form endpoints
-            r'^/contact/?$',
-            r'^/contact/submit/?$',
-            r'^/message/?$',
-            r'^/inbox/?$',
-            r'^/inbox/.+/?$',
-
-            # Captcha endpoints
-            r'^/captcha/',
-            r'^/refresh-captcha/?$',
-            r'^/api/captcha/',
-
-            # Admin and management
-            r'^/admin/',
-            r'^/wagtail/',
-            r'^/api/admin/',
-
-            # Dynamic content creation/editing
-            r'^/blog/article/new/?$',
-            r'^/blog/article/.+/edit/?$',
-            r'^/blog/article/.+/update/?$',
-            r'^/blog/article/.+/delete/?$',
-            r'^/projects/new/?$',
-            r'^/projects/.+/edit/?$',
-            r'^/projects/.+/update/?$',
-            r'^/projects/.+/delete/?$',
-            r'^/about/edit/?$',
-            r'^/profile/edit/?$',
-
-            # API endpoints with forms or dynamic content
-            r'^/api/v1/auth/',
-            r'^/api/v1/login/',
-            r'^/api/v1/register/',
-            r'^/api/v1/contact/',
-            r'^/api/v1/messages/',
-            r'^/api/v1/captcha/',
-            r'^/api/v1/blog/article/(create|new)/?$',
-            r'^/api/v1/blog/article/.+/(update|delete)/?$',
-            r'^/api/v1/projects/(create|new)/?$',
-            r'^/api/v1/projects/.+/(update|delete)/?$',
-
-            # Session management
-            r'^/session/?$',
-            r'^/api/session/',
-
-            # Search with dynamic results
-            r'^/search/?$',
-            r'^/api/search/',
-
-            # Comments and interactions
-            r'^/comments/',
-            r'^/api/comments/',
-            r'^/blog/.+/comment/?$',
-
-            # User-specific content
-            r'^/dashboard/?$',
-            r'^/profile/?$',
-            r'^/account/?$',
-
-            # File uploads
-            r'^/upload/',
-            r'^/api/upload/',
-            r'^/media/upload/',
-
-            # CSRF and security
-            r'^/csrf/',
-            r'^/api/csrf/',
-        ]
+        # URL patterns that should NEVER be cached, matched through the
+        # process-wide compiled classifier shared by every cache middleware
+        self._route_classifier = get_route_classifier()
+        self._excluded_patterns = list(self._route_classifier.patterns)
 
         # HTTP headers that indicate dynamic content
         self._excluded_headers = {
@@ -185,6 +129,16 @@ class IntelligentCacheMiddleware:
             'validation_error',
         }
 
+        # Form elements are always treated as dynamic content
+        self._form_elements = {
+            '<form', '<input', '<textarea', '<select', '<button'
+        }
+
+        # Single-pass scanner over every content indicator
+        self._content_scanner = ContentScanner(
+            self._dynamic_indicators | self._form_elements
+        )
+
     def should_exclude_from_cache(self, request: HttpRequest, response: Optional[HttpResponse] = None) -> bool:
         """
         Comprehensive method to determine if request/response should be excluded from cache.
@@ -196,46 +150,48 @@ class IntelligentCacheMiddleware:
         Returns:
             True if should be excluded from cache, False otherwise
         """
+        return self.exclusion_reason(request, response) is not None
+
+    def exclusion_reason(self, request: HttpRequest, response: Optional[HttpResponse] = None) -> Optional[str]:
+        """
+        Return why a request/response is excluded from cache (``'url'``,
+        ``'method'``, ``'auth'``, ``'headers'``, ``'query'``, ``'content'``
+        or ``'cookies'``), or None if it may be cached.
+        """
 
         # 1. Check URL patterns
         if self._check_url_patterns(request):
-            return True
+            return 'url'
 
         # 2. Check HTTP method (POST, PUT, DELETE should never be cached)
         if request.method in ['POST', 'PUT', 'DELETE', 'PATCH']:
-            return True
+            return 'method'
 
         # 3. Check authentication status
         if self._check_authentication(request):
-            return True
+            return 'auth'
 
         # 4. Check headers
         if self._check_headers(request, response):
-            return True
+            return 'headers'
 
         # 5. Check query parameters
         if self._check_query_parameters(request):
-            return True
+            return 'query'
 
         # 6. Check response content (if available)
         if response and self._check_response_content(response):
-            return True
+            return 'content'
 
         # 7. Check for form-related cookies
-        if self._check_form_cookies(request):
-            return True
+        if self._check_form_cookies(request, response):
+            return 'cookies'
 
-        return False
+        return None
 
     def _check_url_patterns(self, request: HttpRequest) -> bool:
         """Check if URL matches exclusion patterns."""
-        path = request.path_info
-
-        for pattern in self._excluded_patterns:
-            if re.match(pattern, path, re.IGNORECASE):
-                return True
-
-        return False
+        return self._route_classifier.is_excluded(request.path_info)
 
     def _check_authentication(self, request: HttpRequest) -> bool:
         """Check if user is authenticated (exclude from cache)."""
@@ -256,6 +212,9 @@ class IntelligentCacheMiddleware:
 
         # Check request headers
         for header_name in self._excluded_headers:
+            # Anonymous framework cookies are left out of the cache key
+            if header_name == 'Cookie' and cookies_are_neutral(request):
+                continue
             if request.META.get(f'HTTP_{header_name.upper().replace("-", "_")}'):
                 return True
 
@@ -277,6 +236,13 @@ class IntelligentCacheMiddleware:
 
     def _check_query_parameters(self, request: HttpRequest) -> bool:
         """Check query parameters for dynamic content indicators."""
+
+        # Listing routes whitelist their parameters and are rewritten to a
+        # canonical query string, so their variants can share cache entries
+        verdict = canonicalize_request(request)
+        if verdict is not None:
+            return not verdict
+
         query_params = request.GET
 
         # Parameters that indicate dynamic content
@@ -294,26 +260,15 @@ class IntelligentCacheMiddleware:
 
     def _check_response_content(self, response: HttpResponse) -> bool:
         """Check response content for dynamic indicators."""
-        if not hasattr(response, 'content'):
-            return False
-
-        content = response.content.decode('utf-8', errors='ignore').lower()
+        return self._content_scanner.scan_response(response)
 
-        # Check for dynamic content indicators
-        for indicator in self._dynamic_indicators:
-            if indicator.lower() in content:
-                return True
-
-        # Check for form elements
-        form_elements = ['<form', '<input', '<textarea', '<select', '<button']
-        for element in form_elements:
-            if element in content:
-                return True
+    def _check_form_cookies(self, request: HttpRequest, response: Optional[HttpResponse] = None) -> bool:
+        """Check for form-related cookies."""
 
-        return False
+        # Anonymous session/CSRF cookies only matter if the page used them
+        if cookies_are_neutral(request):
+            return response is not None and response_depends_on_cookies(request, response)
 
-    def _check_form_cookies(self, request: HttpRequest) -> bool:
-        """Check for form-related cookies."""
         form_cookies = {
             'csrftoken', 'csrfmiddlewaretoken', 'sessionid',
             'captcha', 'form_token', 'validation_token'
@@ -338,10 +293,11 @@ class IntelligentCacheMiddleware:
 
         # Double-check response for exclusion
         if hasattr(request, '_skip_cache') and request._skip_cache:
-            # Add headers to prevent caching
-            response['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-            response['Pragma'] = 'no-cache'
-            response['Expires'] = '0'
+            # Add headers to prevent caching, unless the view chose its own
+            if 'Cache-Control' not in response:
+                response['Cache-Control'] = 'no-cache, no-store, must-revalidate'
+                response['Pragma'] = 'no-cache'
+                response['Expires'] = '0'
             response['X-Cache-Status'] = 'SKIPPED'
         else:
             response['X-Cache-Status'] = 'ELIGIBLE'
@@ -349,7 +305,8 @@ class IntelligentCacheMiddleware:
         return response
 
 
-class IntelligentUpdateCacheMiddleware(UpdateCacheMiddleware):
+class IntelligentUpdateCacheMiddleware(StaleWhileRevalidateUpdateMixin,
+                                       UpdateCacheMiddleware):
     """Enhanced update cache middleware with intelligent exclusions."""
 
     def __init__(self, get_response):
@@ -359,20 +316,63 @@ class IntelligentUpdateCacheMiddleware(UpdateCacheMiddleware):
     def process_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
         """Process response with intelligent cache exclusion."""
 
+        # Served from the cache: it was vetted when it was stored
+        if getattr(request, '_cache_served', False):
+            self.release_regeneration_lock(request, response)
+            return response
+
         # Use intelligent cache logic
-        if self.intelligent_cache.should_exclude_from_cache(request, response):
-            # Add no-cache headers
-            response['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-            response['Pragma'] = 'no-cache'
-            response['Expires'] = '0'
+        reason = self.intelligent_cache.exclusion_reason(request, response)
+        if reason:
+            # Requests excluded up front were counted by the fetch side
+            if not getattr(request, '_skip_cache', False):
+                record_cache_event(request.path_info, f'excluded:{reason}')
+            # Add no-cache headers, unless the view (or a cache_page inside
+            # it) already told clients how long to keep the response
+            if 'Cache-Control' not in response:
+                response['Cache-Control'] = 'no-cache, no-store, must-revalidate'
+                response['Pragma'] = 'no-cache'
+                response['Expires'] = '0'
             response['X-Cache-Status'] = 'EXCLUDED'
+            self.release_regeneration_lock(request, response)
             return response
 
-        # Proceed with normal caching
-        return super().process_response(request, response)
+        # Proceed with normal caching, for as long as the policy allows
+        ttl = self.apply_ttl_policy(request, response)
+        response = super().process_response(request, response)
+
+        # Record the content tags of the stored page for precise purging
+        if getattr(request, '_cache_update_cache', False):
+            register_response_tags(
+                request, response, key_prefix=self.key_prefix,
+                timeout=self.cache_timeout if ttl is None else ttl,
+                grace=self.stale_window, cache_backend=self.cache
+            )
+
+        return response
+
+    def apply_ttl_policy(self, request: HttpRequest, response: HttpResponse) -> Optional[int]:
+        """
+        Store the response for the lifetime the active cache policy assigns
+        to its route group and content type, unless the view chose its own
+        ``max-age``. The lifetime stays server-side: clients are told to
+        revalidate (see ``portfolio.middlewares.page_cache``).
+
+        Returns:
+            The policy's TTL, or None if the view's own lifetime applies
+        """
+        if response.status_code != 200 or get_max_age(response) is not None:
+            return None
+
+        ttl = get_cache_policy().ttl(
+            request.path_info, response.get('Content-Type', '')
+        )
+        response._cache_timeout = ttl
+        return ttl
 
 
-class IntelligentFetchFromCacheMiddleware(FetchFromCacheMiddleware):
+class IntelligentFetchFromCacheMiddleware(StaleWhileRevalidateFetchMixin,
+                                          FetchFromCacheMiddleware):
     """Enhanced fetch from cache middleware with intelligent exclusions."""
 
     def __init__(self, get_response):
@@ -383,7 +383,9 @@ class IntelligentFetchFromCacheMiddleware(FetchFromCacheMiddleware):
         """Process request with intelligent cache exclusion."""
 
         # Use intelligent cache logic
-        if self.intelligent_cache.should_exclude_from_cache(request):
+        reason = self.intelligent_cache.exclusion_reason(request)
+        if reason:
+            record_cache_event(request.path_info, f'excluded:{reason}')
             # Mark to skip caching
             setattr(request, '_cache_update_cache', False)
             setattr(request, '_skip_cache', True)
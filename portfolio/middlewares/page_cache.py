@@ -0,0 +1,305 @@
+"""
+Page Cache Middleware - Single-Flight Regeneration and Stale-While-Revalidate
+============================================================================
+
+Mixins for Django's page cache middleware (and ``cache_page``) that stop a
+hot entry from stampeding the database when it expires:
+
+1. Entries are stored for their TTL plus a stale window, stamped with the
+   moment they stop being fresh.
+2. When an entry goes stale, the first request takes a short cache lock and
+   regenerates it; concurrent requests are served the previous body with
+   ``X-Cache-Status: STALE`` instead of rendering it again.
+3. When an entry is missing entirely, requests that lose the lock wait
+   briefly for the winner's response rather than all rendering at once.
+
+Entries are stored compressed and decoded per client on a hit (see
+``portfolio.utils.cache_compression``). Hits, misses, stores and their
+latencies are counted per route group (see ``portfolio.utils.cache_metrics``).
+Anonymous visitors carrying only framework cookies share entries (see
+``portfolio.utils.cache_cookies``).
+
+The page cache's TTL (or a ``_cache_timeout`` set on the response, see
+``portfolio.utils.cache_policy``) is a server-side lifetime: tag purges can
+reach the stored entry but not a browser's copy, so responses whose view
+set no ``max-age`` of its own reach clients as ``max-age=0,
+must-revalidate`` and are revalidated against their ETag on every use.
+"""
+
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.http import HttpRequest, HttpResponse
+from django.http.response import HttpResponseBase
+from django.middleware.cache import CacheMiddleware
+from django.utils.cache import get_cache_key, get_max_age, patch_cache_control
+from django.utils.decorators import decorator_from_middleware_with_args
+from django.utils.http import http_date
+
+from portfolio.utils.cache_compression import (
+    compress_for_cache,
+    decode_cached_response,
+)
+from portfolio.utils.cache_cookies import (
+    cookieless_key,
+    cookies_are_neutral,
+    detached_cookies,
+    response_depends_on_cookies,
+    strip_cookies,
+)
+from portfolio.utils.cache_metrics import (
+    observe_cache_latency,
+    record_cache_event,
+    route_group,
+)
+
+
+# Seconds a stale entry may still be served while it is being regenerated
+DEFAULT_STALE_WINDOW = 60 * 60
+
+# Seconds a regeneration lock is held before another worker may take over
+DEFAULT_LOCK_TIMEOUT = 30
+
+# Seconds a request waits for another worker to fill a missing entry
+DEFAULT_LOCK_WAIT = 2.0
+LOCK_POLL_INTERVAL = 0.05
+
+
+def get_stale_window() -> int:
+    return getattr(settings, 'CACHE_STALE_WHILE_REVALIDATE', DEFAULT_STALE_WINDOW)
+
+
+def get_page_cache_alias() -> str:
+    return getattr(settings, 'CACHE_MIDDLEWARE_ALIAS', DEFAULT_CACHE_ALIAS)
+
+
+def get_page_cache():
+    """The cache pages are stored in (the tiered L1/L2 cache when configured)."""
+    return caches[get_page_cache_alias()]
+
+
+def regeneration_lock_key(cache_key: str) -> str:
+    # Kept outside the page-key namespace so locks never enter an L1 tier
+    return f'regenerating.{cache_key}'
+
+
+def revalidate_on_client(response: HttpResponse) -> None:
+    """Let clients keep the response only if they revalidate it first."""
+    patch_cache_control(response, max_age=0, must_revalidate=True)
+    response['Expires'] = http_date()
+
+
+class StaleWhileRevalidateCache:
+    """
+    Cache proxy used by the update middleware when storing pages.
+
+    Every entry outlives its TTL by the stale window, and cached responses
+    are stamped with ``_cache_fresh_until`` (pickled along with the
+    response) so the fetch side can tell fresh entries from stale ones.
+    """
+
+    def __init__(self, backend, stale_window: int):
+        self._backend = backend
+        self.stale_window = stale_window
+
+    def set(self, key, value, timeout=None, version=None):
+        is_response = isinstance(value, HttpResponseBase)
+        if timeout:
+            if is_response:
+                value._cache_fresh_until = time.time() + timeout
+            timeout += self.stale_window
+        if not is_response:
+            return self._backend.set(key, value, timeout, version=version)
+
+        # Hits must not hand clients the server-side lifetime either
+        if getattr(value, '_cache_revalidate', False):
+            revalidate_on_client(value)
+        group = getattr(value, '_cache_route_group', 'other')
+        if getattr(value, '_cache_cookieless', False):
+            value = strip_cookies(value)
+        value = compress_for_cache(value)
+        start = time.perf_counter()
+        result = self._backend.set(key, value, timeout, version=version)
+        observe_cache_latency(group, 'set', (time.perf_counter() - start) * 1000)
+        record_cache_event(group, 'stores')
+        identity_length = getattr(value, '_cache_identity_length', None)
+        if identity_length:
+            record_cache_event(
+                group, 'bytes_saved', identity_length - len(value.content)
+            )
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self._backend, name)
+
+
+def is_stale(response: HttpResponse) -> bool:
+    """Return True if a cached response has passed its freshness deadline."""
+    fresh_until = getattr(response, '_cache_fresh_until', None)
+    return fresh_until is not None and time.time() >= fresh_until
+
+
+class StaleWhileRevalidateUpdateMixin:
+    """Update-side mixin: stores entries with a stale window, releases locks."""
+
+    @property
+    def stale_window(self) -> int:
+        return get_stale_window()
+
+    @property
+    def cache(self):
+        return StaleWhileRevalidateCache(
+            caches[self.cache_alias], self.stale_window
+        )
+
+    def release_regeneration_lock(self, request: HttpRequest, response: HttpResponse) -> None:
+        """Drop the lock taken by the fetch side once the entry is stored."""
+        lock_key = getattr(request, '_cache_regeneration_lock', None)
+        if not lock_key:
+            return
+
+        request._cache_regeneration_lock = None
+        backend = caches[self.cache_alias]
+        # Lazy responses are stored on render; release only after that
+        if not getattr(response, 'is_rendered', True):
+            response.add_post_render_callback(
+                lambda r: backend.delete(lock_key)
+            )
+        else:
+            backend.delete(lock_key)
+
+    def stamp_response(self, request: HttpRequest, response: HttpResponse) -> None:
+        """Record the route group and render time stored with the entry."""
+        response._cache_route_group = route_group(request.path_info)
+        started = getattr(request, '_cache_render_started', None)
+        if started is not None:
+            response._cache_render_ms = (time.perf_counter() - started) * 1000
+
+    def process_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        self.stamp_response(request, response)
+        # A max-age chosen by the view is meant for clients; ours is not
+        response._cache_revalidate = get_max_age(response) is None
+        timeout = getattr(response, '_cache_timeout', None)
+        if response._cache_revalidate and timeout is not None:
+            # Django stores for the max-age; clients get it rewritten below
+            patch_cache_control(response, max_age=timeout)
+        if not cookies_are_neutral(request):
+            response = super().process_response(request, response)
+        elif response_depends_on_cookies(request, response):
+            # Issued a CSRF token, rendered messages, wrote the session...
+            request._cache_update_cache = False
+            response = super().process_response(request, response)
+        else:
+            response._cache_cookieless = True
+            with cookieless_key(request), detached_cookies(response):
+                response = super().process_response(request, response)
+        if response._cache_revalidate and get_max_age(response) is not None:
+            revalidate_on_client(response)
+        self.release_regeneration_lock(request, response)
+        return response
+
+
+class StaleWhileRevalidateFetchMixin:
+    """Fetch-side mixin: single-flight misses and stale-while-revalidate."""
+
+    lock_timeout = DEFAULT_LOCK_TIMEOUT
+    lock_wait = DEFAULT_LOCK_WAIT
+
+    def _acquire_regeneration_lock(self, request: HttpRequest, cache_key: str) -> bool:
+        lock_key = regeneration_lock_key(cache_key)
+        if caches[self.cache_alias].add(lock_key, 1, self.lock_timeout):
+            request._cache_regeneration_lock = lock_key
+            return True
+        return False
+
+    def _wait_for_entry(self, cache_key: str) -> Optional[HttpResponse]:
+        deadline = time.monotonic() + self.lock_wait
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            response = self.cache.get(cache_key)
+            if response is not None:
+                return response
+        return None
+
+    def process_request(self, request: HttpRequest) -> Optional[HttpResponse]:
+        with cookieless_key(request):
+            return self._fetch(request)
+
+    def _fetch(self, request: HttpRequest) -> Optional[HttpResponse]:
+        start = time.perf_counter()
+        response = super().process_request(request)
+
+        if request.method not in ('GET', 'HEAD'):
+            return response
+
+        path = request.path_info
+        observe_cache_latency(path, 'get', (time.perf_counter() - start) * 1000)
+
+        if response is None:
+            record_cache_event(path, 'misses')
+            cache_key = get_cache_key(
+                request, self.key_prefix, 'GET', cache=self.cache
+            )
+            # Unknown URL (no learned headers) or we won the rebuild
+            if cache_key is None or \
+                    self._acquire_regeneration_lock(request, cache_key):
+                return self._render(request)
+
+            # Another worker is rendering this page: wait for its entry
+            response = self._wait_for_entry(cache_key)
+            if response is None:
+                return self._render(request)
+            request._cache_update_cache = False
+            return self._serve_cached(request, response, 'HIT')
+
+        if not is_stale(response):
+            return self._serve_cached(request, response, 'HIT')
+
+        # Stale: one request regenerates, everyone else gets the old body
+        cache_key = get_cache_key(
+            request, self.key_prefix, 'GET', cache=self.cache
+        )
+        if cache_key and self._acquire_regeneration_lock(request, cache_key):
+            request._cache_update_cache = True
+            record_cache_event(path, 'regenerations')
+            return self._render(request)
+
+        return self._serve_cached(request, response, 'STALE')
+
+    def _render(self, request: HttpRequest) -> None:
+        """Let the view render, timing it for the entry about to be stored."""
+        request._cache_render_started = time.perf_counter()
+        return None
+
+    def _serve_cached(self, request: HttpRequest, response: HttpResponse, status: str) -> HttpResponse:
+        # Flag the underlying HttpRequest too when behind a DRF view
+        getattr(request, '_request', request)._cache_served = True
+        request._cache_served = True
+        response = decode_cached_response(request, response)
+        response['X-Cache-Status'] = status
+
+        path = request.path_info
+        record_cache_event(path, 'hits' if status == 'HIT' else 'stale')
+        render_ms = getattr(response, '_cache_render_ms', None)
+        if render_ms is not None:
+            observe_cache_latency(path, 'render_saved', render_ms)
+        return response
+
+
+class StaleWhileRevalidateCacheMiddleware(StaleWhileRevalidateUpdateMixin,
+                                          StaleWhileRevalidateFetchMixin,
+                                          CacheMiddleware):
+    """``CacheMiddleware`` with single-flight and stale-while-revalidate."""
+
+
+def cache_page(timeout, *, cache=None, key_prefix=None):
+    """Drop-in for Django's ``cache_page`` backed by the middleware above."""
+    return decorator_from_middleware_with_args(
+        StaleWhileRevalidateCacheMiddleware
+    )(
+        page_timeout=timeout,
+        cache_alias=cache or DEFAULT_CACHE_ALIAS,
+        key_prefix=key_prefix,
+    )
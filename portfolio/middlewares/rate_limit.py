@@ -4,7 +4,11 @@ Uses the unified rate limiting system
 """
 from django.http import JsonResponse
 
-from portfolio.utils.rate_limiting import RateLimiter, RateLimitExceeded
+from portfolio.utils.rate_limiting import (
+    RateLimiter,
+    RateLimitExceeded,
+    evaluate_request_limits,
+)
 
 
 class RateLimitMiddleware:
@@ -41,6 +45,10 @@ class RateLimitMiddleware:
             if request.path.startswith(excluded_path):
                 return self.get_response(request)
 
+        # Evaluate the global limit and the view's own limits (decorators,
+        # throttles, auth) in one round trip; those checks read the result
+        evaluate_request_limits(request, self.rate_limiter.policy)
+
         # Check rate limit
         is_limited, info = self.rate_limiter.is_rate_limited(request)
 
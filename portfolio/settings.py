@@ -75,7 +75,7 @@ INSTALLED_APPS += [
     "rest_framework.authtoken", "django.contrib.contenttypes", 'django.contrib.sites',
     "django.contrib.sessions", "django.contrib.messages",
     "django.contrib.staticfiles", "django.contrib.sitemaps",
-    "corsheaders", "app", "authentication", "blog",
+    "corsheaders", "portfolio", "app", "authentication", "blog",
     'robots', 'captcha', "django_redis", "crispy_forms",
 ]
 
@@ -102,8 +102,8 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "portfolio.utils.throttling.AnonRateThrottle",
+        "portfolio.utils.throttling.UserRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "100/hour",
@@ -112,6 +112,10 @@ REST_FRAMEWORK = {
 }
 
 MIDDLEWARE = [
+    # Answers If-None-Match / If-Modified-Since for cache hits with 304
+    "django.middleware.http.ConditionalGetMiddleware",
+    # Must precede the rest so it stores the fully processed response
+    "portfolio.middlewares.intelligent_cache.IntelligentUpdateCacheMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -223,11 +227,26 @@ else:
     PROFILE_FOLDER = "portfolio/profiles/dev"
 
 # Cache settings
-CACHE_MIDDLEWARE_ALIAS = 'default'
-CACHE_MIDDLEWARE_SECONDS = 300  # 5 minutes
+CACHE_MIDDLEWARE_ALIAS = 'pages'
+CACHE_MIDDLEWARE_SECONDS = 300  # 5 minutes (cache_page default)
 CACHE_MIDDLEWARE_KEY_PREFIX = 'portfolio'
 USE_CACHE = True
 
+# Expired pages are served stale for up to this long while one request
+# regenerates them (see portfolio.middlewares.page_cache)
+CACHE_STALE_WHILE_REVALIDATE = 60 * 60  # 1 hour
+
+# Page TTLs per route group and content type (see portfolio.utils.cache_policy);
+# `manage.py cache_management strategy --strategy ...` switches it at runtime
+CACHE_STRATEGY = os.environ.get("CACHE_STRATEGY", "BALANCED")
+
+# Part of every content ETag; bump when API payload shapes change
+CONTENT_SCHEMA_VERSION = 1
+
+# Anonymous visitors carrying only session/CSRF/analytics cookies share page
+# cache entries ('strip'), or are never cached ('exclude')
+CACHE_ANONYMOUS_COOKIES = 'strip'
+
 # Cache configuration
 CACHE_DYNAMIC_PAGES = 300  # 5 minutes
 CACHE_STATIC_PAGES = 3600  # 1 hour
@@ -243,6 +262,18 @@ CACHE_MIDDLEWARE_SKIP_STATUSES = (400, 401, 403, 404, 500)
 SESSION_CACHE_ALIAS = "default"
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
 
+# Rendered pages are served from a per-process L1 in front of the default
+# cache (see portfolio.utils.tiered_cache); sessions and counters are not
+PAGE_CACHE = {
+    "BACKEND": "portfolio.utils.tiered_cache.TieredCache",
+    "LOCATION": "default",
+    "OPTIONS": {
+        "L1_MAX_ENTRIES": 512,
+        "L1_TIMEOUT": 10,
+        "GENERATION_CHECK_INTERVAL": 1.0,
+    },
+}
+
 if ENVIRONMENT == 'production':
     try:
         CACHES = {
@@ -259,7 +290,8 @@ if ENVIRONMENT == 'production':
                         "retry_on_timeout": True
                     }
                 }
-            }
+            },
+            "pages": PAGE_CACHE,
         }
         # Use cache for sessions
         SESSION_ENGINE = "django.contrib.sessions.backends.cache"
@@ -272,7 +304,8 @@ if ENVIRONMENT == 'production':
             "default": {
                 "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
                 "LOCATION": "fallback-cache"
-            }
+            },
+            "pages": PAGE_CACHE,
         }
 else:
     # Development environment - use local memory cache and database sessions
@@ -281,7 +314,8 @@ else:
         "default": {
             "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
             "LOCATION": "unique-snowflake"
-        }
+        },
+        "pages": PAGE_CACHE,
     }
 
 # Password validation
@@ -590,6 +624,11 @@ SUSPICIOUS_BOTS = os.environ.get("SUSPICIOUS_PATTERNS",
 if RATE_LIMIT < 1000:
     RATE_LIMIT = 1000
 
+# Per-worker token buckets in front of the shared GLOBAL counter, synced in
+# batches (see portfolio.utils.rate_limiting.LocalPrefilter)
+RATE_LIMIT_LOCAL_PREFILTER = os.environ.get(
+    "RATE_LIMIT_LOCAL_PREFILTER", "False").lower() == "true"
+
 # Comprehensive Rate Limiting Settings
 RATE_LIMITING = {
     # Global rate limiting (requests per hour per IP)
@@ -597,6 +636,11 @@ RATE_LIMITING = {
         'REQUESTS': RATE_LIMIT,  # requests per hour
         'WINDOW': 3600,  # 1 hour in seconds
         'CACHE_KEY_PREFIX': 'global_rate_limit',
+        'LOCAL_PREFILTER': {
+            'BATCH': 50,  # requests admitted locally between syncs
+            'SYNC_INTERVAL': 5,  # seconds between syncs
+            'STRICT_RATIO': 0.8,  # strict remote checks past 80% of the limit
+        } if RATE_LIMIT_LOCAL_PREFILTER else None,
     },
 
     # Blog view count specific rate limiting
@@ -626,6 +670,8 @@ RATE_LIMITING = {
         'LEGITIMATE_BOTS': LEGITIMATE_BOTS,
         'SUSPICIOUS_PATTERNS': SUSPICIOUS_BOTS,
         'MIN_USER_AGENT_LENGTH': 10,
+        # Self-declared bots: allowed, but never counted as blog views
+        'BOT_MARKERS': ['bot', 'crawler', 'spider'],
     }
 }
 
@@ -634,6 +680,30 @@ VIEW_COUNT_SESSION_TIMEOUT = RATE_LIMITING['BLOG_VIEW_COUNT'][
     'SESSION_COOLDOWN'
 ]
 
+# Write-behind blog view counting (see blog.view_counts)
+VIEW_COUNT_BUFFER = {
+    'FLUSH_INTERVAL': 30,  # seconds between bulk writes by each worker
+    'BACKGROUND': True,  # each worker flushes from a background thread
+    'SEEN_TIMEOUT': 60 * 60 * 24,  # repeat views within a day are dropped early
+    # 'rows': one ViewCountAttempt per visitor; 'hll': HyperLogLog per post
+    'UNIQUE_VISITORS': os.environ.get("VIEW_COUNT_UNIQUE_VISITORS", "rows"),
+}
+
+# Batched audit rows of view count attempts (see blog.view_attempts)
+VIEW_ATTEMPT_LOG = {
+    'BATCH_SIZE': 100,  # rows per bulk_create
+    'FLUSH_INTERVAL': 5,  # seconds a row may wait in the queue
+    'MAX_QUEUE': 10000,  # rows kept in memory before new ones are dropped
+    'ASYNC': True,  # write from a background thread
+}
+
+# Days raw view count attempts are kept once rolled up (prune_view_attempts)
+VIEW_ATTEMPT_RETENTION_DAYS = 30
+
+# Seconds the blog statistics snapshot is served before it is recomputed
+# (see blog.stats); content changes drop it immediately
+BLOG_STATS_TIMEOUT = 300
+
 """ Services Offered Json format """
 OUR_SERVICES = [
     {
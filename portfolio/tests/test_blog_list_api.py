@@ -0,0 +1,68 @@
+"""
+Test Suite for the Blog List API Projection
+===========================================
+
+The list endpoint serializes a lightweight projection of each post, with
+annotated comment counts and a prefetched cover image, in a number of
+queries that does not depend on the page size.
+"""
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from wagtail.models import Page
+
+from blog.models import BlogPostComment, BlogPostImage, BlogPostPage
+
+
+class BlogListAPITest(TestCase):
+    """Tests for BlogPostListAPIView."""
+
+    def setUp(self):
+        cache.clear()
+        root = Page.get_first_root_node()
+        reader = User.objects.create(username='reader')
+        for i in range(8):
+            post = root.add_child(instance=BlogPostPage(
+                title=f'Post {i}', slug=f'post-{i}', author=reader,
+                content='word ' * 450,
+            ))
+            post.tags.add('python', f'tag{i}')
+            for n in range(2):
+                BlogPostImage.objects.create(
+                    post=post, optimized_image_url=f'https://img.test/{i}-{n}.jpg'
+                )
+            for _ in range(i % 3):
+                BlogPostComment.objects.create(post=post, author=reader, content='Hi')
+
+    def _list(self, page_size):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/v1/blog/posts/?page_size={page_size}')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results'], len(queries)
+
+    def test_constant_queries(self):
+        """A larger page costs no extra queries."""
+
+        small, small_queries = self._list(2)
+        large, large_queries = self._list(8)
+
+        self.assertEqual((len(small), len(large)), (2, 8))
+        self.assertEqual(small_queries, large_queries)
+        self.assertLessEqual(large_queries, 6)
+
+    def test_projection(self):
+        results, _ = self._list(8)
+        post = {result['slug']: result for result in results}['post-4']
+
+        self.assertNotIn('content', post)
+        self.assertNotIn('comments', post)
+        self.assertNotIn('images', post)
+        self.assertEqual(post['comments_count'], 1)
+        self.assertEqual(post['featured_image_url'], 'https://img.test/4-0.jpg')
+        self.assertEqual(sorted(post['tags_list']), ['python', 'tag4'])
+        self.assertEqual(post['reading_time'], '2 min read')
+        self.assertTrue(post['excerpt'].endswith('...'))
+        self.assertEqual(post['author'], 'reader')
@@ -0,0 +1,102 @@
+"""
+Test Suite for the Blog Statistics Snapshot
+===========================================
+
+Statistics are built from aggregates in a fixed number of queries, served
+from cache, and dropped when posts, comments or tags change.
+"""
+
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+from wagtail.models import Page
+
+from blog.api.views.views import blog_stats_api
+from blog.models import BlogPostComment, BlogPostImage, BlogPostPage
+from blog.stats import compute_blog_stats, get_blog_stats
+
+
+class BlogStatsTest(TestCase):
+    """Tests for the snapshot and its endpoint."""
+
+    def setUp(self):
+        cache.clear()
+        self.root = Page.get_first_root_node()
+        self.first = self._post('First', views=10)
+        self.second = self._post('Second', views=5)
+        self.first.tags.add('django', 'python')
+        self.second.tags.add('python')
+        BlogPostImage.objects.create(post=self.first,
+                                     optimized_image_url='https://img.test/1.jpg')
+
+    def _post(self, title, views=0):
+        return self.root.add_child(instance=BlogPostPage(
+            title=title, slug=title.lower().replace(' ', '-'), view_count=views
+        ))
+
+    def _comment(self):
+        reader, _ = User.objects.get_or_create(username='reader')
+        return BlogPostComment.objects.create(post=self.first, author=reader,
+                                              content='Nice')
+
+    def test_totals_and_tags(self):
+        self._comment()
+        stats = compute_blog_stats()
+
+        self.assertEqual((stats['total_posts'], stats['total_views'],
+                          stats['total_comments']), (2, 15, 1))
+        self.assertEqual(stats['popular_tags'], [{'name': 'python', 'count': 2},
+                                                 {'name': 'django', 'count': 1}])
+
+        recent = {post['slug']: post for post in stats['recent_posts']}
+        self.assertEqual(recent['first']['featured_image_url'],
+                         'https://img.test/1.jpg')
+        self.assertIsNone(recent['second']['featured_image_url'])
+        self.assertEqual(set(recent['first']), {'id', 'title', 'slug',
+                                                'featured_image_url',
+                                                'first_published_at'})
+
+    def test_bounded_queries(self):
+        """The query count does not grow with the number of posts."""
+
+        with self.assertNumQueries(5):
+            compute_blog_stats()
+
+        for i in range(10):
+            self._post(f'Extra {i}').tags.add(f'tag{i}')
+        with self.assertNumQueries(5):
+            compute_blog_stats()
+
+    def test_served_from_cache(self):
+        request = RequestFactory().get('/api/v1/blog/stats/')
+        blog_stats_api(request)
+
+        with self.assertNumQueries(0):
+            response = blog_stats_api(request)
+        self.assertEqual(response.data['total_posts'], 2)
+
+    def test_content_changes_drop_snapshot(self):
+        get_blog_stats()
+
+        self._comment()
+        self.assertEqual(get_blog_stats()['total_comments'], 1)
+
+        self.second.tags.add('django')
+        self.assertEqual(get_blog_stats()['popular_tags'][0],
+                         {'name': 'django', 'count': 2})
+
+        self.second.unpublish()
+        self.assertEqual(get_blog_stats()['total_posts'], 1)
+
+    def test_refresh_command(self):
+        get_blog_stats()
+        BlogPostPage.objects.filter(pk=self.second.pk).update(view_count=50)
+
+        out = StringIO()
+        call_command('refresh_blog_stats', stdout=out)
+
+        self.assertIn('2 posts, 60 views', out.getvalue())
+        self.assertEqual(get_blog_stats()['total_views'], 60)
@@ -0,0 +1,94 @@
+"""
+Test Suite for Compressed Page Cache Entries
+============================================
+
+Pages are stored compressed once and served by ``Accept-Encoding``.
+"""
+
+import gzip
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils.cache import get_cache_key
+
+from portfolio.middlewares.page_cache import cache_page
+
+
+PAGE = b'<html><body>' + b'<p>A fairly repetitive blog post.</p>' * 200 + \
+    b'</body></html>'
+
+
+@override_settings(PAGE_CACHE_COMPRESSION='gzip')
+class CacheCompressionTest(TestCase):
+    """Tests for storing and serving compressed entries."""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.body = PAGE
+
+        @cache_page(60)
+        def view(request):
+            return HttpResponse(self.body)
+
+        self.view = view
+
+    def _get(self, **headers):
+        return self.view(self.factory.get('/blog/', **headers))
+
+    def _stored_entry(self):
+        key = get_cache_key(self.factory.get('/blog/'), '', 'GET', cache=cache)
+        return cache.get(key)
+
+    def test_entry_stored_compressed(self):
+        """The cache holds the gzip body; the first client gets identity."""
+
+        response = self._get(HTTP_ACCEPT_ENCODING='gzip')
+        entry = self._stored_entry()
+
+        self.assertEqual(response.content, PAGE)
+        self.assertEqual(entry._cache_encoding, 'gzip')
+        self.assertLess(len(entry.content), len(PAGE) // 10)
+
+    def test_hit_served_compressed(self):
+        """Clients accepting gzip get the stored bytes as-is."""
+
+        self._get()
+        response = self._get(HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+
+        self.assertEqual(response['X-Cache-Status'], 'HIT')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), PAGE)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_hit_decompressed_for_identity_clients(self):
+        """Clients without gzip support get the original body."""
+
+        self._get(HTTP_ACCEPT_ENCODING='gzip')
+        response = self._get()
+
+        self.assertEqual(response['X-Cache-Status'], 'HIT')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, PAGE)
+        self.assertEqual(int(response['Content-Length']), len(PAGE))
+
+    def test_small_bodies_stored_as_is(self):
+        """Tiny bodies are not worth compressing."""
+
+        self.body = b'ok'
+        self._get()
+
+        self.assertIsNone(getattr(self._stored_entry(), '_cache_encoding', None))
+        self.assertFalse(
+            self._get(HTTP_ACCEPT_ENCODING='gzip').has_header('Content-Encoding')
+        )
+
+    @override_settings(PAGE_CACHE_COMPRESSION=None)
+    def test_compression_can_be_disabled(self):
+        """PAGE_CACHE_COMPRESSION = None stores identity bodies."""
+
+        self._get()
+
+        self.assertEqual(self._stored_entry().content, PAGE)
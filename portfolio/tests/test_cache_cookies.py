@@ -0,0 +1,103 @@
+"""
+Test Suite for Cookie-Aware Page Caching
+========================================
+
+Anonymous visitors carrying session/CSRF cookies share the cookieless
+page cache entry, without cookies leaking into stored responses.
+"""
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils.cache import get_cache_key, patch_vary_headers
+
+from portfolio.middlewares.intelligent_cache import IntelligentCacheMiddleware
+from portfolio.middlewares.page_cache import cache_page
+from portfolio.utils.cache_cookies import cookies_are_neutral
+
+
+VISITOR_COOKIES = 'sessionid=abc123; csrftoken=tok456; _ga=GA1.1.1'
+
+
+class CookieAwareCacheTest(TestCase):
+    """Tests for caching pages for anonymous visitors with cookies."""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.renders = 0
+        self.use_csrf = False
+
+        @cache_page(60)
+        def view(request):
+            self.renders += 1
+            if self.use_csrf:
+                get_token(request)
+            response = HttpResponse(f'render {self.renders}')
+            patch_vary_headers(response, ('Cookie',))
+            response.set_cookie('sessionid', 'abc123')
+            return response
+
+        self.view = view
+
+    def _request(self, cookies=None, user=None):
+        request = self.factory.get('/about/', HTTP_COOKIE=cookies or '')
+        request.user = user or AnonymousUser()
+        return request
+
+    def _stored_entry(self):
+        key = get_cache_key(self._request(), '', 'GET', cache=cache)
+        return cache.get(key) if key else None
+
+    def test_visitor_with_cookies_hits_shared_entry(self):
+        """Session and CSRF cookies no longer fragment or bypass the cache."""
+
+        self.view(self._request())
+        response = self.view(self._request(VISITOR_COOKIES))
+
+        self.assertEqual(self.renders, 1)
+        self.assertEqual(response['X-Cache-Status'], 'HIT')
+
+    def test_stored_entry_has_no_cookies(self):
+        """The live response keeps Set-Cookie; the stored copy does not."""
+
+        response = self.view(self._request(VISITOR_COOKIES))
+
+        self.assertIn('sessionid', response.cookies)
+        self.assertEqual(len(self._stored_entry().cookies), 0)
+
+    def test_csrf_pages_not_stored(self):
+        """A page that issued a CSRF token is per-visitor."""
+
+        self.use_csrf = True
+        self.view(self._request(VISITOR_COOKIES))
+
+        self.assertIsNone(self._stored_entry())
+
+    def test_unknown_cookie_not_neutral(self):
+        """Any cookie outside the framework/analytics set keeps its key."""
+
+        self.view(self._request())
+        response = self.view(self._request('sessionid=abc; cart=3'))
+
+        self.assertEqual(self.renders, 2)
+        self.assertFalse(response.has_header('X-Cache-Status'))
+
+    @override_settings(CACHE_ANONYMOUS_COOKIES='exclude')
+    def test_exclude_mode_keeps_legacy_behaviour(self):
+        """In 'exclude' mode cookie-carrying requests are never cached."""
+
+        middleware = IntelligentCacheMiddleware(lambda r: None)
+        request = self._request(VISITOR_COOKIES)
+
+        self.assertFalse(cookies_are_neutral(request))
+        self.assertEqual(middleware.exclusion_reason(request), 'headers')
+
+    def test_neutral_cookies_not_excluded(self):
+        """The intelligent middleware accepts neutral visitors."""
+
+        middleware = IntelligentCacheMiddleware(lambda r: None)
+
+        self.assertIsNone(middleware.exclusion_reason(self._request(VISITOR_COOKIES)))
@@ -0,0 +1,135 @@
+"""
+Test Suite for Canonical Cache Keys
+===================================
+
+Listing variants are normalised to one canonical query string per
+equivalent URL, and share a page cache entry.
+"""
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import Client, RequestFactory, TestCase
+from django.urls import resolve, reverse
+
+from app.api.views.projects.project_api import ProjectListAPIView
+from app.views.projects.list import ProjectListView
+from blog.api.views.views import BlogPostListAPIView
+from blog.views.list import PostListView
+from portfolio.middlewares.intelligent_cache import IntelligentCacheMiddleware
+from portfolio.utils.cache_keys import (
+    canonical_query,
+    canonicalize_request,
+    get_query_policy,
+)
+
+
+class CanonicalQueryTest(TestCase):
+    """Tests for query string normalisation."""
+
+    def _canonical(self, path, query):
+        return canonical_query(path, QueryDict(query))
+
+    def test_defaults_and_order(self):
+        """Default values are dropped and parameters sorted."""
+
+        self.assertEqual(
+            self._canonical('/api/v1/blog/posts/', 'tag=Django&page=1&page_size=06'),
+            (True, 'tag=django')
+        )
+        self.assertEqual(
+            self._canonical('/api/v1/blog/posts/', 'page=2&ordering=title'),
+            (True, 'ordering=title&page=2')
+        )
+
+    def test_aliases_and_limits(self):
+        """Aliases map onto one name; page sizes are clamped like the view."""
+
+        self.assertEqual(
+            self._canonical('/app/projects', 'sort_by=title-asc'),
+            (True, 'sort-by=title-asc')
+        )
+        self.assertEqual(
+            self._canonical('/api/v1/blog/posts/', 'page_size=500'),
+            (True, 'page_size=20')
+        )
+
+    def test_tracking_params_dropped(self):
+        """Tracking parameters never fragment the key, on any route."""
+
+        self.assertEqual(
+            self._canonical('/app/blog/blog', 'utm_source=x&fbclid=y&page=2'),
+            (True, 'page=2')
+        )
+        self.assertEqual(
+            self._canonical('/about', 'utm_campaign=x&lang=en'),
+            (None, 'lang=en')
+        )
+
+    def test_unknown_or_invalid_params_uncacheable(self):
+        """Parameters outside the whitelist, or invalid values, bypass."""
+
+        self.assertFalse(self._canonical('/app/blog/blog', 'debug=1')[0])
+        self.assertFalse(self._canonical('/app/blog/blog', 'page=two')[0])
+        self.assertFalse(self._canonical('/app/blog/blog', 'sort=random')[0])
+
+    def test_cursor_params(self):
+        """A blank cursor still selects cursor mode; long cursors are kept."""
+
+        cursor = 'x' * 300
+        self.assertEqual(
+            self._canonical('/api/v1/projects/list', 'cursor=&estimate_total=TRUE'),
+            (True, 'cursor=&estimate_total=true')
+        )
+        self.assertEqual(
+            self._canonical('/api/v1/blog/posts/', f'cursor={cursor}&page_size=6'),
+            (True, f'cursor={cursor}')
+        )
+        self.assertFalse(self._canonical('/api/v1/blog/posts/', 'estimate_total=maybe')[0])
+
+    def test_policies_cover_real_routes(self):
+        """Every listing policy matches the path its view is routed at."""
+
+        for name, view_class in (('blog:list_articles', PostListView),
+                                 ('app:projects', ProjectListView),
+                                 ('blog_api:post-list', BlogPostListAPIView),
+                                 ('project_list_api', ProjectListAPIView)):
+            path = reverse(name)
+            self.assertIs(resolve(path).func.view_class, view_class)
+            self.assertIsNotNone(get_query_policy(path), path)
+
+    def test_request_rewritten(self):
+        """The view sees the canonical query the key was built from."""
+
+        request = RequestFactory().get('/app/blog/blog', {'page': '3', 'utm_medium': 'x'})
+
+        self.assertTrue(canonicalize_request(request))
+        self.assertEqual(request.META['QUERY_STRING'], 'page=3')
+        self.assertEqual(request.GET.dict(), {'page': '3'})
+
+    def test_listing_variants_not_excluded(self):
+        """Paginated and filtered listings are now cacheable."""
+
+        middleware = IntelligentCacheMiddleware(lambda r: None)
+        request = RequestFactory().get('/app/blog/blog', {'page': '2', 'tag': 'python'})
+        request.user = AnonymousUser()
+
+        self.assertFalse(middleware._check_query_parameters(request))
+
+
+class CanonicalCacheEntryTest(TestCase):
+    """Equivalent listing URLs share one cache entry."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_equivalent_urls_share_entry(self):
+        """A differently spelled URL is a hit on the first one's entry."""
+
+        client = Client()
+        first = client.get('/api/v1/blog/posts/?page_size=6&tag=Python')
+        second = client.get('/api/v1/blog/posts/?tag=python&utm_source=feed')
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second['X-Cache-Status'], 'HIT')
+        self.assertEqual(first.content, second.content)
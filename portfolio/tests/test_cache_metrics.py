@@ -0,0 +1,132 @@
+"""
+Test Suite for Cache Metrics
+============================
+
+Checks that cache events are counted per route group, merged across
+workers, and reported by ``cache_management stats``.
+"""
+
+from io import StringIO
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+
+from portfolio.middlewares.intelligent_cache import IntelligentCacheMiddleware
+from portfolio.middlewares.page_cache import cache_page
+from portfolio.utils.cache_metrics import (
+    CacheMetrics,
+    cache_metrics,
+    histogram_summary,
+    route_group,
+)
+
+
+class RouteGroupTest(TestCase):
+    """Tests for mapping paths to route groups."""
+
+    def test_groups(self):
+        """Paths map onto a fixed set of groups."""
+
+        self.assertEqual(route_group('/'), 'home')
+        self.assertEqual(route_group('/blog/article/hello'), 'blog')
+        self.assertEqual(route_group('/api/v1/blog/posts/'), 'api:blog')
+        self.assertEqual(route_group('/api/v1/sitemap/'), 'api')
+        self.assertEqual(route_group('/about'), 'pages')
+        self.assertEqual(route_group('/wp-login.php'), 'other')
+
+
+class CacheMetricsTest(TestCase):
+    """Tests for counter buffering and aggregation."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_workers_aggregate(self):
+        """Counters flushed by several workers add up."""
+
+        worker_a = CacheMetrics(flush_interval=60)
+        worker_b = CacheMetrics(flush_interval=60)
+        worker_a.incr('blog', 'hits', 2)
+        worker_b.incr('blog', 'hits', 3)
+        worker_b.incr('blog', 'misses')
+
+        # Nothing is shared until the buffers are flushed
+        self.assertEqual(worker_a.snapshot(), {'blog': {'hits': 2}})
+
+        self.assertEqual(
+            worker_b.snapshot(), {'blog': {'hits': 5, 'misses': 1}}
+        )
+
+    def test_latency_histogram(self):
+        """Latency samples are counted per bucket, with a running mean."""
+
+        metrics = CacheMetrics(flush_interval=60)
+        for ms in (0.4, 3, 4, 4000):
+            metrics.observe('blog', 'get', ms)
+
+        counters = metrics.snapshot()['blog']
+
+        self.assertEqual(counters['get_ms:le_1'], 1)
+        self.assertEqual(counters['get_ms:le_5'], 2)
+        self.assertEqual(counters['get_ms:le_inf'], 1)
+        self.assertEqual(
+            histogram_summary(counters, 'get'),
+            'get: n=4 mean=1001.9ms [≤1:1 ≤5:2 ≤inf:1]'
+        )
+
+
+class PageCacheMetricsTest(TestCase):
+    """Tests for the events the page cache records."""
+
+    def setUp(self):
+        cache.clear()
+        cache_metrics.reset()
+        self.factory = RequestFactory()
+
+        @cache_page(60)
+        def view(request):
+            return HttpResponse('body')
+
+        self.view = view
+
+    def test_miss_store_hit(self):
+        """A miss stores the page and the next request is a timed hit."""
+
+        self.view(self.factory.get('/blog/'))
+        self.view(self.factory.get('/blog/'))
+
+        counters = cache_metrics.snapshot()['blog']
+        self.assertEqual(counters['misses'], 1)
+        self.assertEqual(counters['stores'], 1)
+        self.assertEqual(counters['hits'], 1)
+        self.assertEqual(counters['set_ms:count'], 1)
+        self.assertEqual(counters['get_ms:count'], 2)
+        self.assertEqual(counters['render_saved_ms:count'], 1)
+
+    def test_exclusion_reason(self):
+        """Excluded requests are counted with the rule that matched."""
+
+        middleware = IntelligentCacheMiddleware(lambda r: None)
+        request = self.factory.get('/blog/', {'search': 'django'})
+        request.user = AnonymousUser()
+
+        self.assertEqual(middleware.exclusion_reason(request), 'query')
+        self.assertTrue(middleware.should_exclude_from_cache(request))
+
+    def test_stats_command(self):
+        """cache_management stats prints the per-group counters."""
+
+        self.view(self.factory.get('/blog/'))
+        self.view(self.factory.get('/blog/'))
+
+        out = StringIO()
+        call_command('cache_management', 'stats', '--reset', stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('blog (50.0% hit ratio):', output)
+        self.assertIn('  stores: 1', output)
+        self.assertIn('  get: n=2', output)
+        self.assertEqual(cache_metrics.snapshot(), {})
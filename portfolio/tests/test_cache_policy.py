@@ -0,0 +1,128 @@
+"""
+Test Suite for Cache TTL Policies
+=================================
+
+Page lifetimes come from the active strategy's compiled table, keyed by
+route group and content type, and the strategy can be switched at runtime.
+"""
+
+import time
+from io import StringIO
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils.cache import get_cache_key, get_max_age
+
+from portfolio.middlewares.intelligent_cache import IntelligentUpdateCacheMiddleware
+from portfolio.utils.cache_policy import (
+    CACHE_STRATEGIES,
+    CachePolicy,
+    active_policy,
+    get_cache_policy,
+    set_active_strategy,
+)
+
+
+class CachePolicyTest(TestCase):
+    """Tests for the compiled TTL table."""
+
+    def setUp(self):
+        self.policy = CachePolicy('BALANCED')
+        self.ttls = CACHE_STRATEGIES['BALANCED']
+
+    def test_route_groups(self):
+        """Static-like pages live for hours, listings for minutes."""
+
+        self.assertEqual(self.policy.ttl('/about', 'text/html'), self.ttls['static_ttl'])
+        self.assertEqual(self.policy.ttl('/app/resume', 'text/html'), self.ttls['static_ttl'])
+        self.assertEqual(self.policy.ttl('/blog', 'text/html'), self.ttls['dynamic_ttl'])
+        self.assertEqual(self.policy.ttl('/', 'text/html'), self.ttls['default_ttl'])
+        self.assertEqual(self.policy.ttl('/unknown/page'), self.ttls['default_ttl'])
+
+    def test_content_type_overrides_route(self):
+        """JSON and static assets keep their own lifetimes on any route."""
+
+        self.assertEqual(
+            self.policy.ttl('/blog', 'application/json; charset=utf-8'),
+            self.ttls['api_ttl']
+        )
+        self.assertEqual(self.policy.ttl('/about', 'text/css'), self.ttls['static_ttl'])
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ImproperlyConfigured):
+            CachePolicy('RECKLESS')
+
+
+@override_settings(CACHE_STRATEGY='BALANCED')
+class PolicyMiddlewareTest(TestCase):
+    """Tests for TTLs applied by the update-cache middleware."""
+
+    def setUp(self):
+        cache.clear()
+        active_policy.reset()
+        self.addCleanup(active_policy.reset)
+        self.factory = RequestFactory()
+        self.middleware = IntelligentUpdateCacheMiddleware(lambda r: None)
+
+    def _process(self, path, response):
+        request = self.factory.get(path)
+        request.user = AnonymousUser()
+        request._cache_update_cache = True
+        return self.middleware.process_response(request, response)
+
+    def _stored_ttl(self, path):
+        """Seconds the stored entry for ``path`` stays fresh."""
+        key = get_cache_key(self.factory.get(path), self.middleware.key_prefix,
+                            'GET', cache=self.middleware.cache)
+        entry = self.middleware.cache.get(key)
+        return round(entry._cache_fresh_until - time.time())
+
+    def test_ttl_applied_per_route(self):
+        """About is stored for hours; the blog list for minutes."""
+
+        about = self._process('/about', HttpResponse('about'))
+        self._process('/app/blog/blog', HttpResponse('blog'))
+
+        self.assertEqual(self._stored_ttl('/about'),
+                         CACHE_STRATEGIES['BALANCED']['static_ttl'])
+        self.assertEqual(self._stored_ttl('/app/blog/blog'),
+                         CACHE_STRATEGIES['BALANCED']['dynamic_ttl'])
+        # The lifetime stays server-side
+        self.assertEqual(get_max_age(about), 0)
+
+    def test_view_max_age_respected(self):
+        """An explicit max-age from the view wins over the policy."""
+
+        response = HttpResponse('about')
+        response['Cache-Control'] = 'max-age=42'
+
+        self.assertEqual(get_max_age(self._process('/about', response)), 42)
+        self.assertEqual(self._stored_ttl('/about'), 42)
+
+    def test_strategy_switched_at_runtime(self):
+        """The management command switches the policy for every worker."""
+
+        call_command('cache_management', 'strategy', '--strategy', 'AGGRESSIVE',
+                     stdout=StringIO())
+
+        self.assertEqual(cache.get('cache_policy:strategy'), 'AGGRESSIVE')
+        self.assertEqual(get_cache_policy().strategy, 'AGGRESSIVE')
+        self._process('/about', HttpResponse('about'))
+        self.assertEqual(self._stored_ttl('/about'),
+                         CACHE_STRATEGIES['AGGRESSIVE']['static_ttl'])
+
+    def test_no_cache_strategy_stores_nothing(self):
+        """NO_CACHE gives every page a zero lifetime, so nothing is stored."""
+
+        set_active_strategy('NO_CACHE')
+        response = self._process('/about', HttpResponse('about'))
+
+        self.assertEqual(get_max_age(response), 0)
+        self.assertIsNone(get_cache_key(
+            self.factory.get('/about'), self.middleware.key_prefix, 'GET',
+            cache=self.middleware.cache
+        ))
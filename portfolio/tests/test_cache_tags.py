@@ -0,0 +1,175 @@
+"""
+Test Suite for Tag-Based Cache Invalidation
+===========================================
+
+Covers the tag registry, request tagging, and the model signals that purge
+cached pages when the content they were built from changes.
+"""
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+
+from app.models import Projects, Skill
+from app.utils.cache import cache_page_with_prefix
+from portfolio.utils.cache_config import cache_manager, invalidate_blog_cache
+from portfolio.utils.cache_tags import (
+    CacheTagRegistry,
+    add_cache_tags,
+    get_cache_tags,
+    invalidate_tags,
+    register_cache_key,
+    tag_registry,
+    tags_for_path,
+)
+
+
+class CacheTagRegistryTest(TestCase):
+    """Tests for the LocMem-compatible tag registry."""
+
+    def setUp(self):
+        cache.clear()
+        self.registry = CacheTagRegistry()
+
+    def test_invalidate_purges_only_tagged_keys(self):
+        """Only keys registered under the tag are deleted."""
+
+        cache.set('page:a', 'A', 300)
+        cache.set('page:b', 'B', 300)
+        self.registry.register('page:a', ['post:1', 'blog'], 300)
+        self.registry.register('page:b', ['project:site'], 300)
+
+        self.assertEqual(self.registry.invalidate('post:1'), 1)
+
+        self.assertIsNone(cache.get('page:a'))
+        self.assertEqual(cache.get('page:b'), 'B')
+        self.assertEqual(self.registry.keys_for('post:1'), set())
+
+    def test_keys_shared_between_tags(self):
+        """A key is reachable through every tag it was registered with."""
+
+        self.registry.register('page:a', ['blog', 'tag:django'], 300)
+        self.registry.register('page:b', ['blog'], 300)
+
+        self.assertEqual(
+            self.registry.keys_for('blog'), {'page:a', 'page:b'}
+        )
+        self.assertEqual(self.registry.keys_for('tag:django'), {'page:a'})
+
+    def test_unknown_tag_is_noop(self):
+        """Invalidating a tag nobody used deletes nothing."""
+
+        self.assertEqual(self.registry.invalidate('about'), 0)
+        self.assertEqual(invalidate_tags(), 0)
+
+
+class RequestTaggingTest(TestCase):
+    """Tests for recording tags on requests."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_path_tags(self):
+        """Section tags are derived from the request path."""
+
+        self.assertEqual(tags_for_path('/app/blog/article/x'), {'blog'})
+        self.assertEqual(tags_for_path('/api/v1/projects/list'), {'projects'})
+        self.assertEqual(tags_for_path('/app/'), {'blog', 'projects'})
+        self.assertEqual(tags_for_path('/app/contact'), set())
+
+    def test_tags_recorded_through_wrapped_request(self):
+        """Tags set on a DRF-style wrapper land on the Django request."""
+
+        request = self.factory.get('/api/v1/blog/posts/')
+
+        class Wrapper:
+            _request = request
+
+        add_cache_tags(Wrapper(), 'tag:django')
+
+        self.assertEqual(get_cache_tags(request), {'tag:django', 'blog'})
+
+
+class SignalInvalidationTest(TestCase):
+    """Model changes purge the cache entries built from them."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_project_save_purges_project_entries(self):
+        """Saving a project purges entries tagged with it."""
+
+        cache.set('page:projects', 'cached', 300)
+        register_cache_key('page:projects', ['projects'], 300)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Projects.objects.create(title='Cache Tags', description='x')
+
+        self.assertIsNone(cache.get('page:projects'))
+
+    def test_purge_waits_for_commit(self):
+        """Nothing is purged while the write is uncommitted or rolled back."""
+
+        cache.set('page:projects', 'cached', 300)
+        register_cache_key('page:projects', ['projects'], 300)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            Projects.objects.create(title='Pending', description='x')
+            self.assertEqual(cache.get('page:projects'), 'cached')
+
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(cache.get('page:projects'))
+
+    def test_about_section_change_purges_about(self):
+        """Editing a skill purges the about page but not blog pages."""
+
+        cache.set('page:about', 'about', 300)
+        cache.set('page:blog', 'blog', 300)
+        register_cache_key('page:about', ['about'], 300)
+        register_cache_key('page:blog', ['blog'], 300)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.create(name='Redis')
+
+        self.assertIsNone(cache.get('page:about'))
+        self.assertEqual(cache.get('page:blog'), 'blog')
+
+    def test_invalidate_blog_cache_helper(self):
+        """The legacy helper now purges blog-tagged entries."""
+
+        cache.set('page:blog', 'blog', 300)
+        register_cache_key('page:blog', ['blog'], 300)
+
+        self.assertEqual(invalidate_blog_cache(), 1)
+        self.assertIsNone(cache.get('page:blog'))
+
+    def test_invalidate_pattern_goes_through_tags(self):
+        """A key pattern is resolved through the tag it names."""
+
+        cache.set('page:blog', 'blog', 300)
+        register_cache_key('page:blog', ['blog'], 300)
+
+        self.assertEqual(cache_manager.invalidate_pattern('*blog*'), 1)
+        self.assertIsNone(cache.get('page:blog'))
+        self.assertEqual(cache_manager.invalidate_pattern('*'), 0)
+
+    def test_cached_page_registered_and_purged(self):
+        """A page cached by cache_page_with_prefix is purged by its tag."""
+
+        @cache_page_with_prefix('services', 300, tags=('about',))
+        def view(request):
+            return HttpResponse('<p>services</p>')
+
+        request = RequestFactory().get('/app/services')
+        request.user = AnonymousUser()
+        view(request)
+
+        keys = tag_registry.keys_for('services')
+        self.assertEqual(len(keys), 1)
+        self.assertEqual(tag_registry.keys_for('about'), keys)
+        self.assertIsInstance(cache.get(next(iter(keys))), HttpResponse)
+
+        self.assertEqual(invalidate_tags('services'), 1)
+        self.assertIsNone(cache.get(next(iter(keys))))
@@ -0,0 +1,115 @@
+"""
+Test Suite for the Cache Warmer
+===============================
+
+Checks target discovery from the sitemap data and that warming renders
+pages into the same cache entries visitors are served from.
+"""
+
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from wagtail.models import Page
+
+from app.models import Projects
+from blog.models import BlogPostPage
+from portfolio.utils.cache_config import cache_manager
+from portfolio.utils.cache_warmer import (
+    CORE_URLS,
+    WARMER_USER_AGENT,
+    CacheWarmer,
+    discover_warm_targets,
+)
+
+
+class DiscoverTargetsTest(TestCase):
+    """Tests for warm-up target discovery."""
+
+    def setUp(self):
+        root = Page.get_first_root_node()
+        for title, views in (('Quiet', 3), ('Popular', 500), ('Warm', 40)):
+            root.add_child(instance=BlogPostPage(
+                title=title, slug=title.lower(), view_count=views
+            ))
+        Projects.objects.create(title='Site', slug='site', description='x')
+
+    def test_posts_ranked_by_view_count(self):
+        """Core pages come first, then posts by popularity, then projects."""
+
+        urls = discover_warm_targets()
+
+        self.assertEqual(urls[:len(CORE_URLS)], list(CORE_URLS))
+        self.assertEqual(urls[len(CORE_URLS):], [
+            '/app/blog/blog/article/popular',
+            '/app/blog/blog/article/warm',
+            '/app/blog/blog/article/quiet',
+            '/app/projects/site',
+        ])
+
+    def test_limit(self):
+        """The target list can be capped."""
+
+        self.assertEqual(len(discover_warm_targets(limit=3)), 3)
+
+
+class CacheWarmerTest(TestCase):
+    """Tests for rendering pages into the cache."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_warm_populates_visitor_cache(self):
+        """A warmed page is a cache hit for the next visitor."""
+
+        warmer = CacheWarmer(base_url='http://testserver', workers=2)
+        results = warmer.warm(['/api/v1/sitemap/'])
+
+        self.assertEqual(len(results), 1)
+        self.assertTrue(results[0].ok)
+        self.assertTrue(results[0].cached)
+        self.assertGreater(results[0].render_ms, 0)
+
+        response = Client().get(
+            '/api/v1/sitemap/', HTTP_USER_AGENT=WARMER_USER_AGENT
+        )
+        self.assertEqual(response['X-Cache-Status'], 'HIT')
+
+    def test_discovered_target_is_a_hit(self):
+        """Discovery yields URLs the page cache actually stores."""
+
+        url = '/api/v1/blog/posts/'
+        self.assertIn(url, discover_warm_targets())
+
+        results = CacheWarmer(base_url='http://testserver', workers=1).warm([url])
+
+        self.assertTrue(results[0].cached)
+        self.assertEqual(Client().get(url)['X-Cache-Status'], 'HIT')
+
+    def test_manager_reports_results(self):
+        """The cache manager keeps the per-URL report of the last run."""
+
+        results = cache_manager.warm_cache(
+            ['/api/v1/sitemap/'], workers=1, base_url='http://testserver'
+        )
+
+        self.assertEqual(results, {'/api/v1/sitemap/': True})
+        self.assertEqual(
+            [r.url for r in cache_manager.last_warm_results],
+            ['/api/v1/sitemap/']
+        )
+
+    def test_warm_command_reports_render_time(self):
+        """cache_management warm renders and reports each URL."""
+
+        out = StringIO()
+        call_command(
+            'cache_management', 'warm', '--urls', '/api/v1/sitemap/',
+            '--base-url', 'http://testserver', stdout=out
+        )
+
+        output = out.getvalue()
+        self.assertIn('✓ Warmed: /api/v1/sitemap/ (200,', output)
+        self.assertIn('cached)', output)
+        self.assertIn('Warmed 1/1 URLs', output)
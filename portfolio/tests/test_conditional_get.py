@@ -0,0 +1,137 @@
+"""
+Test Suite for Conditional GET
+==============================
+
+Read APIs carry ETag / Last-Modified validators derived from content
+versions and answer repeat requests with 304 until the content changes.
+Cached pages keep their lifetime server-side and make clients revalidate.
+"""
+
+import time
+
+from django.contrib import messages
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase
+from django.utils.cache import get_max_age
+from django.utils.http import parse_http_date
+from wagtail.models import Page
+
+from app.models import Projects
+from app.utils.cache import conditional_on_tags
+from blog.models import BlogPostPage
+from portfolio.middlewares.intelligent_cache import IntelligentUpdateCacheMiddleware
+from portfolio.utils.cache_tags import content_versions, invalidate_tags
+
+
+class ConditionalGetTest(TestCase):
+    """Tests for 304 responses on the read APIs."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def _revalidate(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_validators_present(self):
+        """Responses carry a weak ETag and a Last-Modified date."""
+
+        response = self.client.get('/api/v1/sitemap/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        self.assertTrue(response.has_header('Last-Modified'))
+
+    def test_unchanged_content_is_not_modified(self):
+        """A repeat request with the ETag gets an empty 304."""
+
+        response = self.client.get('/api/v1/projects/list')
+        repeat = self._revalidate('/api/v1/projects/list', response)
+
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(repeat.content, b'')
+
+    def test_pending_messages_skip_validation(self):
+        """A page about to show a flash message is never a 304."""
+
+        view = conditional_on_tags('about')(lambda request: HttpResponse('<p>About</p>'))
+        factory = RequestFactory()
+
+        etag = view(factory.get('/app/about'))['ETag']
+        request = factory.get('/app/about', HTTP_IF_NONE_MATCH=etag)
+        request._messages = CookieStorage(request)
+        messages.success(request, 'Message sent')
+
+        response = view(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+        self.assertEqual(len(request._messages), 1)
+
+    def test_content_change_moves_etag(self):
+        """Saving a project bumps the version behind the project list."""
+
+        response = self.client.get('/api/v1/projects/list')
+        with self.captureOnCommitCallbacks(execute=True):
+            Projects.objects.create(title='New', slug='new', description='x')
+
+        repeat = self._revalidate('/api/v1/projects/list', response)
+
+        self.assertEqual(repeat.status_code, 200)
+        self.assertNotEqual(repeat['ETag'], response['ETag'])
+
+    def test_query_string_is_part_of_etag(self):
+        """Different pages of a list have different validators."""
+
+        first = self.client.get('/api/v1/blog/posts/')
+        second = self.client.get('/api/v1/blog/posts/?page_size=3')
+
+        self.assertNotEqual(first['ETag'], second['ETag'])
+
+    def test_post_publish_bumps_blog_version(self):
+        """Blog posts and comments version the blog list."""
+
+        before = content_versions('blog', 'comments')
+        with self.captureOnCommitCallbacks(execute=True):
+            Page.get_first_root_node().add_child(
+                instance=BlogPostPage(title='Fresh', slug='fresh')
+            )
+        invalidate_tags('comments')
+
+        after = content_versions('blog', 'comments')
+        self.assertGreater(after['blog'], before['blog'])
+        self.assertGreater(after['comments'], before['comments'])
+
+    def test_clients_revalidate_cached_pages(self):
+        """The server-side lifetime never reaches clients, hit or miss."""
+
+        miss = self.client.get('/api/v1/sitemap/')
+        hit = self.client.get('/api/v1/sitemap/')
+
+        self.assertEqual(hit['X-Cache-Status'], 'HIT')
+        for response in (miss, hit):
+            self.assertEqual(get_max_age(response), 0)
+            self.assertIn('must-revalidate', response['Cache-Control'])
+            self.assertNotIn('no-store', response['Cache-Control'])
+            self.assertLessEqual(parse_http_date(response['Expires']), time.time())
+            self.assertTrue(response.has_header('ETag'))
+
+    def test_excluded_response_keeps_view_headers(self):
+        """Exclusion only adds no-store when the view set no Cache-Control."""
+
+        def view(request):
+            response = HttpResponse('<form></form>')
+            response['Cache-Control'] = 'public, max-age=3600'
+            return response
+
+        request = RequestFactory().get('/contact/')
+        request.user = AnonymousUser()
+        middleware = IntelligentUpdateCacheMiddleware(view)
+
+        response = middleware.process_response(request, view(request))
+
+        self.assertEqual(response['X-Cache-Status'], 'EXCLUDED')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=3600')
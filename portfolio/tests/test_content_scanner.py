@@ -0,0 +1,137 @@
+"""
+Test Suite for the Response Content Scanner
+===========================================
+
+Checks that the windowed scanner reaches the same verdicts as the
+previous decode-and-search loop, leaves streaming responses untouched, and
+only ever copies one window of a large page body.
+"""
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import TestCase
+
+from portfolio.middlewares.intelligent_cache import IntelligentCacheMiddleware
+from portfolio.utils.content_scanner import ContentScanner
+
+
+ARTICLE_BODY = (
+    '<html><head><title>Article</title></head><body><article>'
+    + '<p>Writing about Django, Wagtail and caching strategies.</p>' * 4000
+    + '</article></body></html>'
+)
+
+
+def legacy_check(indicators, content: bytes) -> bool:
+    """The original decode, lowercase and search-per-indicator loop."""
+    text = content.decode('utf-8', errors='ignore').lower()
+    return any(indicator.lower() in text for indicator in indicators)
+
+
+class ContentScannerTest(TestCase):
+    """Correctness tests for the content scanner."""
+
+    def setUp(self):
+        self.middleware = IntelligentCacheMiddleware(lambda r: HttpResponse())
+        self.scanner = self.middleware._content_scanner
+        self.indicators = (
+            self.middleware._dynamic_indicators | self.middleware._form_elements
+        )
+
+    def test_matches_legacy_verdicts(self):
+        """Scanner agrees with the legacy loop on a range of bodies."""
+
+        bodies = [
+            b'', b'<p>plain</p>', b'<FORM method="post">',
+            b'<div class="g-RECAPTCHA"></div>', b'{% csrf_token %}',
+            b'<script>addEventListener.*submit</script>',
+            b'<script>addEventListener("submit")</script>',
+            'café <Input type="text">'.encode('utf-8'),
+            ARTICLE_BODY.encode('utf-8'),
+            (ARTICLE_BODY + '<button>Go</button>').encode('utf-8'),
+        ]
+
+        for body in bodies:
+            self.assertEqual(
+                self.scanner.scan(body),
+                legacy_check(self.indicators, body),
+                body[:60]
+            )
+
+    def test_reports_first_indicator(self):
+        """find() returns the indicator that matched."""
+
+        scanner = ContentScanner(['<form', 'captcha'])
+        self.assertEqual(scanner.find(b'<p>x</p><FORM>'), '<form')
+        self.assertIsNone(scanner.find(b'<p>nothing here</p>'))
+
+    def test_indicator_across_window_boundary(self):
+        """Indicators split across two windows are still found."""
+
+        scanner = ContentScanner(['csrfmiddlewaretoken'], window_size=32)
+        content = b'x' * 25 + b'CSRFMiddlewareToken' + b'x' * 40
+
+        self.assertTrue(scanner.scan(content))
+
+    def test_subsumed_indicators_are_pruned(self):
+        """Indicators containing a shorter indicator are redundant."""
+
+        scanner = ContentScanner(['captcha', 'recaptcha', 'data-captcha'])
+        self.assertEqual(scanner.indicators, ('captcha',))
+
+    def test_streaming_responses_are_skipped(self):
+        """Streaming bodies are never consumed by the scanner."""
+
+        response = StreamingHttpResponse(iter([b'<form>', b'</form>']))
+
+        self.assertFalse(self.middleware._check_response_content(response))
+        self.assertEqual(b''.join(response.streaming_content), b'<form></form>')
+
+    def test_empty_scanner(self):
+        """A scanner without indicators never reports a hit."""
+
+        self.assertFalse(ContentScanner([]).scan(b'<form>'))
+
+
+class RecordingBytes(bytes):
+    """Bytes that remember the length of every slice taken from them."""
+
+    def __getitem__(self, key):
+        piece = super().__getitem__(key)
+        if isinstance(key, slice):
+            self.slices.append(len(piece))
+        return piece
+
+
+class ContentScannerLargeBodyTest(TestCase):
+    """The scanner on a large page body."""
+
+    def setUp(self):
+        middleware = IntelligentCacheMiddleware(lambda r: HttpResponse())
+        self.scanner = middleware._content_scanner
+        self.indicators = middleware._dynamic_indicators | middleware._form_elements
+
+    def test_verdicts_at_window_boundaries(self):
+        """An indicator anywhere around a window boundary is found."""
+
+        size = self.scanner.window_size
+        for offset in (size - 3, 3 * size - 1, 5 * size, len(ARTICLE_BODY) - 1):
+            content = (
+                ARTICLE_BODY[:offset] + '<FoRm>' + ARTICLE_BODY[offset:]
+            ).encode('utf-8')
+            self.assertTrue(legacy_check(self.indicators, content))
+            self.assertEqual(self.scanner.find(content), '<form', offset)
+
+        self.assertFalse(self.scanner.scan(ARTICLE_BODY.encode('utf-8')))
+
+    def test_memory_bounded_by_window(self):
+        """No copy of the body larger than one window is ever taken."""
+
+        content = RecordingBytes(ARTICLE_BODY.encode('utf-8'))
+        content.slices = []
+
+        self.assertFalse(self.scanner.scan(content))
+
+        windows = -(-len(content) // self.scanner.window_size)
+        self.assertEqual(len(content.slices), windows)
+        self.assertLessEqual(max(content.slices),
+                             self.scanner.window_size + self.scanner._overlap)
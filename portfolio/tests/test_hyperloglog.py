@@ -0,0 +1,71 @@
+"""
+Test Suite for HyperLogLog Unique Counters
+==========================================
+
+The pure-Python HyperLogLog used with LocMem must estimate distinct counts
+within its error bound in fixed memory, like Redis ``PFADD``/``PFCOUNT``.
+"""
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from portfolio.utils.hyperloglog import HyperLogLog, UniqueCounter
+
+
+class HyperLogLogTest(TestCase):
+    """Tests for the estimator itself."""
+
+    def test_estimate_within_error(self):
+        hll = HyperLogLog()
+        for i in range(20000):
+            hll.add(f'visitor-{i}')
+
+        self.assertAlmostEqual(hll.count(), 20000, delta=20000 * 0.03)
+
+    def test_small_counts_exact(self):
+        """Linear counting keeps small audiences practically exact."""
+
+        hll = HyperLogLog()
+        for i in range(100):
+            hll.add(f'visitor-{i}')
+
+        self.assertEqual(hll.count(), 100)
+
+    def test_duplicates_not_counted(self):
+        hll = HyperLogLog()
+        self.assertTrue(hll.add('visitor'))
+        self.assertFalse(hll.add('visitor'))
+
+        self.assertEqual(hll.count(), 1)
+
+    def test_fixed_size(self):
+        hll = HyperLogLog()
+        for i in range(5000):
+            hll.add(str(i))
+
+        self.assertEqual(len(hll.to_bytes()), 16384)
+
+    def test_merge(self):
+        first, second = HyperLogLog(), HyperLogLog()
+        for i in range(300):
+            first.add(str(i))
+            second.add(str(i + 200))
+        first.merge(second)
+
+        self.assertAlmostEqual(first.count(), 500, delta=10)
+
+
+class UniqueCounterTest(TestCase):
+    """Counters stored in the (LocMem) cache backend."""
+
+    def setUp(self):
+        cache.clear()
+        self.counter = UniqueCounter()
+
+    def test_add_and_count(self):
+        self.assertTrue(self.counter.add('post:1', 'a', 'b'))
+        self.assertFalse(self.counter.add('post:1', 'a'))
+        self.counter.add('post:2', 'c')
+
+        self.assertEqual(self.counter.count(['post:1', 'post:2', 'post:3']),
+                         {'post:1': 2, 'post:2': 1, 'post:3': 0})
@@ -0,0 +1,152 @@
+"""
+Test Suite for Keyset Pagination
+================================
+
+Cursor pages walk a listing on a composite key (ties and NULLs included)
+without OFFSET or COUNT(*), behind an opt-in ``?cursor=`` on the blog,
+comment, project, message and search listings.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+from urllib.parse import parse_qs, urlsplit
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from wagtail.models import Page
+
+from app.models import Message, Projects
+from blog.models import BlogPostPage
+from portfolio.utils.keyset_pagination import InvalidCursor, KeysetPaginator
+
+NOON = datetime(2026, 3, 1, 12, tzinfo=dt_timezone.utc)
+
+
+class KeysetPaginatorTest(TestCase):
+    """Tests for the paginator itself."""
+
+    def setUp(self):
+        root = Page.get_first_root_node()
+        # Three posts share a timestamp and two were never published
+        for i, published in enumerate([NOON, NOON, None, NOON.replace(hour=9),
+                                       NOON, None, NOON.replace(hour=15)]):
+            root.add_child(instance=BlogPostPage(title=f'Post {i}', slug=f'post-{i}'))
+            BlogPostPage.objects.filter(slug=f'post-{i}').update(first_published_at=published)
+
+    def _walk(self, keys, page_size):
+        paginator = KeysetPaginator(BlogPostPage.objects.all(), keys, page_size)
+        walked, cursor = [], None
+        while True:
+            page = paginator.page(cursor)
+            walked.extend(post.slug for post in page.items)
+            if not page.has_next:
+                return walked
+            cursor = page.next_cursor
+
+    def test_walks_every_row_once_in_order(self):
+        for keys in [('-first_published_at', '-id'), ('first_published_at', 'id')]:
+            paginator = KeysetPaginator(BlogPostPage.objects.all(), keys, 100)
+            expected = [post.slug for post in paginator.page().items]
+
+            for page_size in (1, 2, 3):
+                self.assertEqual(self._walk(keys, page_size), expected)
+
+        self.assertEqual(expected[-2:], ['post-2', 'post-5'])
+
+    def test_rejects_foreign_cursors(self):
+        by_date = KeysetPaginator(BlogPostPage.objects.all(), ('-first_published_at', '-id'), 2)
+        by_title = KeysetPaginator(BlogPostPage.objects.all(), ('title', 'id'), 2)
+        cursor = by_date.page().next_cursor
+
+        with self.assertRaises(InvalidCursor):
+            by_title.page(cursor)
+        with self.assertRaises(InvalidCursor):
+            by_date.page(cursor[:-2] + 'xx')
+
+
+class KeysetListingsTest(TestCase):
+    """Tests for the opt-in cursor mode of the API listings."""
+
+    def setUp(self):
+        cache.clear()
+        root = Page.get_first_root_node()
+        for i in range(5):
+            root.add_child(instance=BlogPostPage(title=f'Post {i}', slug=f'post-{i}'))
+            Projects.objects.create(title=f'Project {i}', slug=f'project-{i}',
+                                    description='A project')
+            Message.objects.create(name='Sender', email='sender@example.com',
+                                   subject=f'Subject {i}', message='Hello')
+
+    def _walk(self, url, params=None, results=lambda body: body['results'],
+              next_cursor=lambda body: body['next_cursor']):
+        walked, cursor = [], ''
+        while cursor is not None:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(
+                    url, {**(params or {}), 'cursor': cursor, 'page_size': 2}
+                )
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse([query for query in queries.captured_queries
+                              if 'COUNT(*)' in query['sql']])
+            body = response.json()
+            walked.extend(item['slug'] if 'slug' in item else item['subject']
+                          for item in results(body))
+            cursor = next_cursor(body)
+        return walked
+
+    def test_blog_list(self):
+        self.assertEqual(sorted(self._walk('/api/v1/blog/posts/')),
+                         [f'post-{i}' for i in range(5)])
+
+        response = self.client.get('/api/v1/blog/posts/', {'cursor': 'bogus'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_projects_list(self):
+        walked = self._walk('/api/v1/projects/list',
+                            next_cursor=lambda body: body['pagination']['next_cursor'])
+        self.assertEqual(walked, [f'project-{i}' for i in reversed(range(5))])
+
+        response = self.client.get('/api/v1/projects/list',
+                                   {'cursor': '', 'estimate_total': '1'})
+        self.assertEqual(response.json()['pagination']['estimated_count'], 5)
+
+    def test_projects_next_link_keeps_query(self):
+        body = self.client.get('/api/v1/projects/list', {
+            'cursor': '', 'page_size': 2, 'sort_by': 'title', 'search': 'project',
+        }).json()
+        query = parse_qs(urlsplit(body['next']).query)
+
+        self.assertEqual(query['cursor'], [body['pagination']['next_cursor']])
+        self.assertEqual(query['sort_by'], ['title'])
+        self.assertEqual(query['search'], ['project'])
+
+    def test_cursor_pages_are_cached(self):
+        first = self.client.get('/api/v1/blog/posts/', {'cursor': '', 'page_size': 2})
+        cursor = first.json()['next_cursor']
+
+        for params in ({'cursor': '', 'page_size': 2},
+                       {'cursor': cursor, 'page_size': 2, 'estimate_total': '1'}):
+            self.client.get('/api/v1/blog/posts/', params)
+            repeat = self.client.get('/api/v1/blog/posts/', params)
+            self.assertEqual(repeat['X-Cache-Status'], 'HIT')
+            self.assertIn('next_cursor', repeat.json())
+
+    def test_messages_list(self):
+        staff = User.objects.create_user('staff', is_staff=True)
+        self.client.force_login(staff)
+
+        walked = self._walk('/api/v1/messages/',
+                            results=lambda body: body['messages'],
+                            next_cursor=lambda body: body['pagination']['next_cursor'])
+        self.assertEqual(walked, [f'Subject {i}' for i in reversed(range(5))])
+
+    def test_search(self):
+        walked = self._walk('/api/v1/search/',
+                            {'q': 'Project', 'category': 'projects', 'sort': 'title_asc'},
+                            results=lambda body: body['results']['projects'])
+        self.assertEqual(walked, [f'project-{i}' for i in range(5)])
+
+        response = self.client.get('/api/v1/search/', {'q': 'Post', 'cursor': ''})
+        self.assertEqual(response.status_code, 400)
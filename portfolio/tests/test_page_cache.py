@@ -0,0 +1,113 @@
+"""
+Test Suite for Single-Flight and Stale-While-Revalidate Page Caching
+===================================================================
+
+Exercises the page cache mixins through the ``cache_page`` decorator they
+back, counting how many times the underlying view actually renders.
+"""
+
+import threading
+import time
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.utils.cache import get_cache_key
+
+from portfolio.middlewares.page_cache import cache_page, regeneration_lock_key
+
+
+class PageCacheTest(TestCase):
+    """Tests for the stale-while-revalidate page cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.renders = 0
+        self.render_delay = 0
+
+        @cache_page(60)
+        def view(request):
+            time.sleep(self.render_delay)
+            self.renders += 1
+            return HttpResponse(f'render {self.renders}')
+
+        self.view = view
+
+    def _get(self):
+        return self.view(self.factory.get('/popular/'))
+
+    def _cache_key(self):
+        return get_cache_key(self.factory.get('/popular/'), '', 'GET', cache=cache)
+
+    def _expire_entry(self):
+        """Push the cached entry past its freshness deadline."""
+        key = self._cache_key()
+        entry = cache.get(key)
+        entry._cache_fresh_until = time.time() - 1
+        cache.set(key, entry, 300)
+
+    def test_fresh_entry_is_a_hit(self):
+        """A fresh entry is served without rendering."""
+
+        self._get()
+        response = self._get()
+
+        self.assertEqual(self.renders, 1)
+        self.assertEqual(response['X-Cache-Status'], 'HIT')
+
+    def test_entries_outlive_their_ttl(self):
+        """Entries are stamped with a freshness deadline at their TTL."""
+
+        self._get()
+        entry = cache.get(self._cache_key())
+
+        self.assertAlmostEqual(entry._cache_fresh_until, time.time() + 60, delta=5)
+
+    def test_stale_entry_regenerated_once(self):
+        """The first request after expiry rebuilds the entry."""
+
+        self._get()
+        self._expire_entry()
+
+        response = self._get()
+        self.assertEqual(self.renders, 2)
+        self.assertEqual(response.content, b'render 2')
+
+        # The lock is released and the new entry is fresh
+        self.assertIsNone(cache.get(regeneration_lock_key(self._cache_key())))
+        self.assertEqual(self._get()['X-Cache-Status'], 'HIT')
+
+    def test_stale_served_while_regenerating(self):
+        """Concurrent requests get the stale body while a rebuild runs."""
+
+        self._get()
+        self._expire_entry()
+        cache.add(regeneration_lock_key(self._cache_key()), 1, 30)
+
+        response = self._get()
+
+        self.assertEqual(self.renders, 1)
+        self.assertEqual(response['X-Cache-Status'], 'STALE')
+        self.assertEqual(response.content, b'render 1')
+
+    def test_concurrent_misses_render_once(self):
+        """Requests racing on a missing entry wait for a single render."""
+
+        self._get()
+        cache.delete(self._cache_key())
+        self.render_delay = 0.3
+
+        statuses = []
+
+        def worker():
+            statuses.append(self._get().get('X-Cache-Status'))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.renders, 2)
+        self.assertEqual(statuses.count('HIT'), 4)
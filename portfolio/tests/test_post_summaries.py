@@ -0,0 +1,86 @@
+"""
+Test Suite for Stored Post Summaries
+====================================
+
+Excerpt, intro, summary, reading time and cover URL are stored on blog
+posts, refreshed on save, publish and image changes, and backfilled by a
+management command, so listings never load the full content.
+"""
+
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from wagtail.models import Page
+
+from blog.models import BlogPostImage, BlogPostPage
+from blog.templatetags.blog_tags import get_excerpt
+
+CONTENT = '<p>' + 'word ' * 450 + '</p>\nSecond paragraph'
+
+
+class PostSummariesTest(TestCase):
+    """Tests for the derived columns of BlogPostPage."""
+
+    def setUp(self):
+        cache.clear()
+        self.post = Page.get_first_root_node().add_child(
+            instance=BlogPostPage(title='Post', slug='post', content=CONTENT)
+        )
+
+    def _stored(self):
+        return BlogPostPage.objects.values(
+            'excerpt', 'intro', 'summary', 'reading_time', 'cover_image_url'
+        ).get(pk=self.post.pk)
+
+    def test_computed_on_save(self):
+        stored = self._stored()
+
+        self.assertEqual(stored['excerpt'], CONTENT[:200] + '...')
+        self.assertEqual(stored['intro'], '<p>' + 'word ' * 450 + '</p>')
+        self.assertEqual(stored['summary'], ('word ' * 30) + '...')
+        self.assertEqual(stored['reading_time'], 2)
+        self.assertEqual(get_excerpt(self.post), stored['summary'])
+
+    def test_refreshed_on_publish(self):
+        self.post.content = 'Short'
+        self.post.save_revision()
+        self.assertEqual(self._stored()['intro'], '<p>' + 'word ' * 450 + '</p>')
+
+        self.post.get_latest_revision().publish()
+        self.assertEqual(self._stored()['summary'], 'Short')
+        self.assertEqual(self._stored()['reading_time'], 1)
+
+    def test_cover_follows_images(self):
+        first = BlogPostImage.objects.create(post=self.post,
+                                             optimized_image_url='https://img.test/1.jpg')
+        BlogPostImage.objects.create(post=self.post,
+                                     optimized_image_url='https://img.test/2.jpg')
+        self.assertEqual(self._stored()['cover_image_url'], 'https://img.test/1.jpg')
+
+        first.delete()
+        self.assertEqual(self._stored()['cover_image_url'], 'https://img.test/2.jpg')
+
+    def test_backfill_command(self):
+        BlogPostImage.objects.create(post=self.post,
+                                     optimized_image_url='https://img.test/1.jpg')
+        expected = self._stored()
+        BlogPostPage.objects.update(excerpt='', intro='', summary='',
+                                    reading_time=1, cover_image_url=None)
+
+        out = StringIO()
+        call_command('backfill_post_summaries', '--batch-size', '1', stdout=out)
+
+        self.assertIn('Backfilled derived fields of 1 posts', out.getvalue())
+        self.assertEqual(self._stored(), expected)
+
+    def test_list_api_skips_content(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/v1/blog/posts/')
+
+        self.assertEqual(response.json()['results'][0]['reading_time'], '2 min read')
+        self.assertFalse([query for query in queries.captured_queries
+                          if '"blog_blogpostpage"."content"' in query['sql']])
@@ -0,0 +1,265 @@
+"""
+Test Suite for Sliding-Window Rate Limiting
+===========================================
+
+Limits are counted with two integer counters per client, checked and
+incremented atomically, behind the unchanged ``(is_limited, info)`` API.
+Every limit of a request is evaluated in a single round trip, and high
+limits can be pre-filtered by per-worker token buckets.
+"""
+
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django_ratelimit.exceptions import Ratelimited
+
+from app.api.views.search.search_api import PopularSearchesAPIView
+from portfolio.utils.rate_limiting import (
+    LocalPrefilter,
+    RateCheck,
+    RateLimiter,
+    SlidingWindowCounter,
+    get_view_policies,
+    sliding_window_store,
+)
+
+
+RATE_LIMITING = {
+    'GLOBAL': {
+        'REQUESTS': 5,
+        'WINDOW': 60,
+        'CACHE_KEY_PREFIX': 'test_rate_limit',
+    },
+    'BOT_DETECTION': {
+        'LEGITIMATE_BOTS': ['googlebot'],
+        'SUSPICIOUS_PATTERNS': ['crawler'],
+        'MIN_USER_AGENT_LENGTH': 10,
+    },
+}
+
+
+class SlidingWindowCounterTest(TestCase):
+    """Tests for the counter itself, with an explicit clock."""
+
+    def setUp(self):
+        cache.clear()
+        self.counter = SlidingWindowCounter(limit=10, window=60)
+
+    def test_limit_enforced_within_window(self):
+        """The request after the limit is rejected and not counted."""
+
+        states = [self.counter.hit('client', now=600 + i) for i in range(11)]
+
+        self.assertFalse(any(state.limited for state in states[:10]))
+        self.assertTrue(states[10].limited)
+        self.assertEqual(states[10].current, 10)
+
+    def test_previous_window_weighted(self):
+        """Half-way into a window, half of the previous one still counts."""
+
+        for _ in range(10):
+            self.counter.hit('client', now=600)
+
+        self.assertTrue(self.counter.hit('client', now=660).limited)
+        allowed = [self.counter.hit('client', now=690) for _ in range(6)]
+
+        self.assertEqual([state.limited for state in allowed],
+                         [False] * 5 + [True])
+
+    def test_constant_storage(self):
+        """A client only ever has integer counters, one per window."""
+
+        for i in range(50):
+            self.counter.hit('client', now=600 + i)
+
+        self.assertEqual(cache.get('client:10'), 10)
+        self.assertIsNone(cache.get('client:9'))
+
+    def test_reset_time(self):
+        """A full window frees up as soon as the next one starts to decay it."""
+
+        for _ in range(10):
+            self.counter.hit('client', now=600)
+        state = self.counter.hit('client', now=630)
+
+        self.assertTrue(state.limited)
+        self.assertEqual(state.reset_time, 660)
+
+    def test_concurrent_hits_are_atomic(self):
+        """Threads racing on one key never admit more than the limit."""
+
+        counter = SlidingWindowCounter(limit=25, window=3600)
+        results = []
+
+        def worker():
+            for _ in range(10):
+                results.append(counter.hit('busy').limited)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count(False), 25)
+
+
+@override_settings(RATE_LIMITING=RATE_LIMITING)
+class RateLimiterContractTest(TestCase):
+    """The (is_limited, info) contract used by the middlewares."""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def _request(self):
+        return self.factory.get('/', REMOTE_ADDR='10.0.0.1')
+
+    def test_info_fields(self):
+        limiter = RateLimiter('GLOBAL')
+
+        for made in range(1, 6):
+            is_limited, info = limiter.is_rate_limited(self._request())
+            self.assertFalse(is_limited)
+            self.assertEqual(info['requests_made'], made)
+            self.assertEqual(info['remaining'], 5 - made)
+
+        is_limited, info = limiter.is_rate_limited(self._request())
+        self.assertTrue(is_limited)
+        self.assertEqual(info['max_requests'], 5)
+        self.assertEqual(info['window'], 60)
+        self.assertGreaterEqual(info['reset_time'], info['current_time'])
+
+    def test_counted_once_per_request(self):
+        """Repeated checks of one limit during a request reuse the result."""
+
+        limiter = RateLimiter('GLOBAL')
+        request = self._request()
+        limiter.is_rate_limited(request)
+
+        _, info = limiter.is_rate_limited(request)
+        self.assertEqual(info['requests_made'], 1)
+
+
+class ConsolidatedEvaluationTest(TestCase):
+    """Every limit of a request is evaluated in one round trip."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def test_batch_counts_all_or_nothing(self):
+        """A request over one limit is not counted against the others."""
+
+        checks = [RateCheck('wide', 100, 60), RateCheck('narrow', 1, 60)]
+        sliding_window_store.evaluate(checks, now=600)
+        wide, narrow = sliding_window_store.evaluate(checks, now=601)
+
+        self.assertTrue(narrow.limited)
+        self.assertFalse(wide.limited)
+        self.assertEqual(wide.current, 1)
+
+    def test_view_policies_collected(self):
+        """Decorator and throttle limits are known before the view runs."""
+
+        request = RequestFactory().get('/api/v1/search/popular/')
+        prefixes = {policy.prefix for policy in get_view_policies(request)}
+
+        self.assertEqual(
+            prefixes, {'ratelimit_ip_20_60', 'throttle_anon', 'throttle_user'}
+        )
+
+    def test_single_round_trip_per_api_request(self):
+        """Global, decorator and DRF throttle checks share one evaluation."""
+
+        with mock.patch.object(
+            sliding_window_store, 'evaluate', wraps=sliding_window_store.evaluate
+        ) as evaluate:
+            response = self.client.get('/api/v1/search/popular/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(evaluate.call_count, 1)
+        self.assertEqual(len(evaluate.call_args.args[0]), 4)
+
+    def test_decorator_limit_enforced(self):
+        """The ratelimit adapter still blocks past its rate."""
+
+        view = PopularSearchesAPIView.as_view()
+        factory = RequestFactory()
+
+        for _ in range(20):
+            self.assertEqual(view(factory.get('/api/v1/search/popular/')).status_code, 200)
+        with self.assertRaises(Ratelimited):
+            view(factory.get('/api/v1/search/popular/'))
+
+
+class LocalPrefilterTest(TestCase):
+    """Per-worker token buckets synced to the shared counter in batches."""
+
+    def setUp(self):
+        cache.clear()
+        self.check = RateCheck('client', 1000, 3600)
+        self.prefilter = LocalPrefilter(batch=10, sync_interval=5)
+
+    def _allow(self, count, now=3600):
+        return [self.prefilter.allow(self.check, now=now) for _ in range(count)]
+
+    def test_budget_admitted_locally(self):
+        """One sync per batch; requests in between never reach the store."""
+
+        with mock.patch.object(
+            sliding_window_store, 'add_counts', wraps=sliding_window_store.add_counts
+        ) as add_counts:
+            states = self._allow(25)
+
+        self.assertTrue(all(state is not None for state in states))
+        self.assertEqual(add_counts.call_count, 3)
+        self.assertEqual(cache.get('client:1'), 20)
+        self.assertEqual(states[-1].current, 25)
+
+    def test_interval_forces_sync(self):
+        """Unsynced requests reach the shared counter within the interval."""
+
+        self._allow(3)
+        self._allow(1, now=3606)
+
+        self.assertEqual(cache.get('client:1'), 3)
+
+    def test_strict_near_limit(self):
+        """Clients past the strict ratio fall back to remote checks."""
+
+        cache.set('client:1', 850)
+
+        self.assertEqual(self._allow(2), [None, None])
+
+    def test_flush(self):
+        self._allow(4)
+        self.prefilter.flush(now=3600)
+
+        self.assertEqual(cache.get('client:1'), 4)
+
+    @override_settings(RATE_LIMITING={
+        **RATE_LIMITING,
+        'GLOBAL': {**RATE_LIMITING['GLOBAL'], 'REQUESTS': 1000,
+                   'CACHE_KEY_PREFIX': 'prefiltered_rate_limit',
+                   'LOCAL_PREFILTER': {'BATCH': 10}},
+    })
+    def test_rate_limiter_uses_prefilter(self):
+        """With LOCAL_PREFILTER the global check skips the store."""
+
+        limiter = RateLimiter('GLOBAL')
+        factory = RequestFactory()
+        limiter.is_rate_limited(factory.get('/', REMOTE_ADDR='10.0.0.2'))
+
+        with mock.patch.object(sliding_window_store, 'evaluate') as evaluate, \
+                mock.patch.object(sliding_window_store, 'add_counts') as add_counts:
+            is_limited, info = limiter.is_rate_limited(
+                factory.get('/', REMOTE_ADDR='10.0.0.2')
+            )
+
+        self.assertFalse(is_limited)
+        self.assertEqual(info['requests_made'], 2)
+        evaluate.assert_not_called()
+        add_counts.assert_not_called()
@@ -0,0 +1,118 @@
+"""
+Test Suite for the Compiled Route Classifier
+============================================
+
+Verifies that the compiled classifier gives the same verdicts as the
+original pattern-by-pattern loop, and that the middleware answers a
+realistic mix of repeated request paths from the verdict cache.
+"""
+
+import re
+
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+
+from portfolio.middlewares.intelligent_cache import (
+    IntelligentCacheMiddleware,
+    IntelligentFetchFromCacheMiddleware,
+    IntelligentUpdateCacheMiddleware,
+)
+from portfolio.utils.route_classifier import (
+    EXCLUDED_URL_PATTERNS,
+    RouteClassifier,
+    get_route_classifier,
+)
+
+
+SAMPLE_PATHS = [
+    '/', '/blog/', '/blog/article/hello-world', '/projects/',
+    '/projects/portfolio-site', '/about/', '/services/', '/resume/',
+    '/login/', '/contact/', '/admin/', '/wagtail/admin/pages/3/',
+    '/api/v1/blog/posts/', '/api/v1/projects/list', '/api/v1/about/',
+    '/api/v1/auth/login/', '/api/v1/messages/', '/captcha/image/abc/',
+    '/blog/article/hello-world/edit', '/projects/portfolio-site/delete',
+    '/LOGIN/', '/Admin/', '/sitemap/', '/static/css/styles.css',
+]
+
+
+def legacy_is_excluded(path):
+    """The original per-request loop over every pattern."""
+    for pattern in EXCLUDED_URL_PATTERNS:
+        if re.match(pattern, path, re.IGNORECASE):
+            return True
+    return False
+
+
+class RouteClassifierTest(TestCase):
+    """Correctness tests for the route classifier."""
+
+    def test_matches_legacy_verdicts(self):
+        """Compiled matcher agrees with the per-pattern loop."""
+
+        classifier = RouteClassifier()
+
+        for path in SAMPLE_PATHS:
+            self.assertEqual(
+                classifier.is_excluded(path), legacy_is_excluded(path), path
+            )
+
+    def test_verdicts_are_memoised(self):
+        """Repeated paths are answered from the LRU."""
+
+        classifier = RouteClassifier(maxsize=8)
+        classifier.is_excluded('/login/')
+        classifier.is_excluded('/login/')
+
+        info = classifier.cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 1)
+
+    def test_lru_is_bounded(self):
+        """The verdict cache never grows past its configured size."""
+
+        classifier = RouteClassifier(maxsize=8)
+        for i in range(100):
+            classifier.is_excluded(f'/blog/article/post-{i}')
+
+        self.assertLessEqual(classifier.cache_info().currsize, 8)
+
+    def test_classifier_shared_by_middlewares(self):
+        """Fetch and update middlewares use one process-wide classifier."""
+
+        fetch = IntelligentFetchFromCacheMiddleware(lambda r: HttpResponse())
+        update = IntelligentUpdateCacheMiddleware(lambda r: HttpResponse())
+
+        shared = get_route_classifier()
+        self.assertIs(fetch.intelligent_cache._route_classifier, shared)
+        self.assertIs(update.intelligent_cache._route_classifier, shared)
+
+
+class RouteClassifierMiddlewareTest(TestCase):
+    """The middleware's exclusion check on a mix of repeated paths."""
+
+    iterations = 20
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = IntelligentCacheMiddleware(lambda r: HttpResponse())
+        self.classifier = self.middleware._route_classifier
+        self.classifier.clear()
+        self.addCleanup(self.classifier.clear)
+        self.requests = [self.factory.get(path) for path in SAMPLE_PATHS]
+
+    def test_repeated_paths_match_legacy_from_cache(self):
+        """Verdicts equal the old loop; each path is matched only once."""
+
+        for _ in range(self.iterations):
+            for request in self.requests:
+                self.assertEqual(
+                    self.middleware._check_url_patterns(request),
+                    legacy_is_excluded(request.path_info),
+                    request.path_info,
+                )
+
+        info = self.classifier.cache_info()
+        self.assertEqual(info.misses, len(SAMPLE_PATHS))
+        self.assertEqual(
+            info.hits, (self.iterations - 1) * len(SAMPLE_PATHS)
+        )
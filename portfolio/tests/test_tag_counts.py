@@ -0,0 +1,83 @@
+"""
+Test Suite for the Materialized Tag Counts
+==========================================
+
+Tag counts for live posts are kept current by tagging and publish signals,
+and sidebars read them with a single query.
+"""
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from wagtail.models import Page
+
+from app.api.views.search.search_api import SearchSuggestionsAPIView
+from blog.models import BlogPostPage
+from blog.tag_counts import get_tag_counts, matching_tags, refresh_tag_counts
+from blog.views.list import PostListView
+
+
+class TagCountsTest(TestCase):
+    """Tests for the maintained index."""
+
+    def setUp(self):
+        cache.clear()
+        root = Page.get_first_root_node()
+        self.first = root.add_child(instance=BlogPostPage(title='First', slug='first'))
+        self.second = root.add_child(instance=BlogPostPage(title='Second', slug='second'))
+        self.first.tags.add('django', 'python')
+        self.second.tags.add('python')
+
+    def test_counts_follow_tagging(self):
+        self.assertEqual(get_tag_counts(),
+                         [('all', 2), ('django', 1), ('python', 2)])
+
+        self.second.tags.remove('python')
+        self.first.tags.clear()
+        self.second.tags.add('wagtail')
+
+        self.assertEqual(get_tag_counts(), [('all', 2), ('wagtail', 1)])
+
+    def test_sorted_by_name_not_creation(self):
+        """Tags created in reverse order still come back alphabetically."""
+
+        self.second.tags.add('zope', 'aiohttp')
+
+        self.assertEqual(get_tag_counts(), [
+            ('all', 2), ('aiohttp', 1), ('django', 1), ('python', 2), ('zope', 1),
+        ])
+
+    def test_counts_follow_publishing(self):
+        """Unpublished and deleted posts drop out of their tags' counts."""
+
+        self.first.unpublish()
+        self.assertEqual(get_tag_counts(), [('all', 1), ('python', 1)])
+
+        self.second.delete()
+        self.assertEqual(get_tag_counts(), [])
+
+        self.first.save_revision().publish()
+        self.assertEqual(get_tag_counts(),
+                         [('all', 1), ('django', 1), ('python', 1)])
+
+    def test_full_rebuild_matches(self):
+        maintained = get_tag_counts()
+        refresh_tag_counts()
+
+        self.assertEqual(get_tag_counts(), maintained)
+
+    def test_sidebar_reads_one_query(self):
+        view = PostListView()
+        view.request = RequestFactory().get('/blog/')
+
+        with self.assertNumQueries(1):
+            view.get_tag_counts()
+        self.assertEqual(BlogPostPage.get_tag_counts(), get_tag_counts())
+
+    def test_suggestions_use_index(self):
+        self.assertEqual(matching_tags('py', limit=5), ['python'])
+
+        request = RequestFactory().get('/api/v1/search/suggestions/', {'q': 'djan'})
+        response = SearchSuggestionsAPIView.as_view()(request)
+
+        self.assertIn({'text': 'django', 'type': 'tag', 'category': 'posts'},
+                      response.data['suggestions'])
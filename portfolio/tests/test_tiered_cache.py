@@ -0,0 +1,111 @@
+"""
+Test Suite for the Tiered L1/L2 Cache Backend
+=============================================
+
+Two backend instances over the same L2 stand in for two gunicorn workers.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import TestCase
+
+from portfolio.utils.tiered_cache import TieredCache
+
+
+PAGE_KEY = 'views.decorators.cache.cache_page.portfolio.GET.abc'
+
+
+def make_tier(**options):
+    options.setdefault('GENERATION_CHECK_INTERVAL', 0)
+    return TieredCache('default', {'OPTIONS': options})
+
+
+class TieredCacheTest(TestCase):
+    """Tests for the in-process L1 in front of the shared cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.worker_a = make_tier()
+        self.worker_b = make_tier()
+
+    def test_hit_served_from_l1(self):
+        """A page read once is served from L1 without touching L2."""
+
+        self.worker_a.set(PAGE_KEY, 'page', 300)
+        cache.set(PAGE_KEY, 'overwritten behind our back', 300)
+
+        self.assertEqual(self.worker_a.get(PAGE_KEY), 'page')
+        self.assertEqual(self.worker_a.l1_info()['entries'], 1)
+
+    def test_l1_returns_private_copies(self):
+        """Mutating a fetched response does not leak into the next read."""
+
+        self.worker_a.set(PAGE_KEY, HttpResponse('body'), 300)
+
+        first = self.worker_a.get(PAGE_KEY)
+        first['X-Cache-Status'] = 'HIT'
+
+        self.assertNotIn('X-Cache-Status', self.worker_a.get(PAGE_KEY))
+
+    def test_delete_invalidates_other_workers(self):
+        """A purge in one worker drops the page from every worker's L1."""
+
+        self.worker_a.set(PAGE_KEY, 'page', 300)
+        self.assertEqual(self.worker_b.get(PAGE_KEY), 'page')
+
+        self.worker_a.delete(PAGE_KEY)
+
+        self.assertIsNone(self.worker_b.get(PAGE_KEY))
+
+    def test_generation_checked_at_interval(self):
+        """Between generation checks a worker trusts its L1."""
+
+        worker = make_tier(GENERATION_CHECK_INTERVAL=60)
+        self.worker_a.set(PAGE_KEY, 'page', 300)
+        worker.get(PAGE_KEY)
+
+        self.worker_a.delete(PAGE_KEY)
+
+        self.assertEqual(worker.get(PAGE_KEY), 'page')
+
+    def test_lru_is_bounded(self):
+        """The least recently used page is evicted past the size limit."""
+
+        tier = make_tier(L1_MAX_ENTRIES=2)
+        for name in ('a', 'b', 'c'):
+            tier.set(f'{PAGE_KEY}.{name}', name, 300)
+
+        self.assertEqual(tier.l1_info()['entries'], 2)
+        cache.delete(f'{PAGE_KEY}.a')
+        self.assertIsNone(tier.get(f'{PAGE_KEY}.a'))
+        self.assertEqual(tier.get(f'{PAGE_KEY}.c'), 'c')
+
+    def test_l1_entries_expire(self):
+        """L1 never outlives its own TTL."""
+
+        tier = make_tier(L1_TIMEOUT=0.05)
+        tier.set(PAGE_KEY, 'page', 300)
+        cache.set(PAGE_KEY, 'regenerated', 300)
+        time.sleep(0.1)
+
+        self.assertEqual(tier.get(PAGE_KEY), 'regenerated')
+
+    def test_stale_pages_not_held(self):
+        """Pages past their freshness deadline are always read from L2."""
+
+        response = HttpResponse('stale')
+        response._cache_fresh_until = time.time() - 1
+        self.worker_a.set(PAGE_KEY, response, 300)
+
+        self.assertEqual(self.worker_a.l1_info()['entries'], 0)
+
+    def test_other_keys_pass_through(self):
+        """Keys outside the page namespace never enter L1."""
+
+        self.worker_a.set('session:abc', 'data', 300)
+        cache.set('session:abc', 'updated', 300)
+
+        self.assertEqual(self.worker_a.get('session:abc'), 'updated')
+        self.assertEqual(self.worker_a.l1_info()['entries'], 0)
@@ -0,0 +1,143 @@
+"""
+Test Suite for the Cached User-Agent Classifier
+===============================================
+
+Verifies that the compiled classifier keeps the verdicts of the original
+substring loop in ``RateLimiter.is_bot_request``, that verdicts are memoised
+per user agent and per request, and that every caller shares it.
+"""
+
+from unittest import mock
+
+from django.conf import settings
+from django.test import RequestFactory, TestCase, override_settings
+
+from portfolio.utils.rate_limiting import can_increment_view_count, is_bot_request
+from portfolio.utils.user_agent_classifier import (
+    BOT,
+    BROWSER,
+    CRAWLER,
+    SUSPICIOUS,
+    UserAgentClassifier,
+    classify_request,
+    get_user_agent_classifier,
+)
+
+
+BOT_DETECTION = {
+    'LEGITIMATE_BOTS': ['googlebot', 'bravebot'],
+    'SUSPICIOUS_PATTERNS': ['crawler', 'spider', 'scraper'],
+    'MIN_USER_AGENT_LENGTH': 10,
+}
+
+DESKTOP = ('Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+           '(KHTML, like Gecko) Chrome/126.0 Safari/537.36')
+IPHONE = ('Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) '
+          'AppleWebKit/605.1.15 Mobile/15E148')
+IPAD = 'Mozilla/5.0 (iPad; CPU OS 17_0 like Mac OS X) Mobile/15E148'
+
+SAMPLE_AGENTS = [
+    DESKTOP, IPHONE, IPAD, '', 'curl/8', 'python-requests/2.31',
+    'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)',
+    'Mozilla/5.0 (compatible; bingbot/2.0)', 'SomeCrawler/1.0 scraper',
+    'Googlebot spider hybrid', 'Mozilla/5.0 (compatible; AhrefsBot/7.0)',
+]
+
+
+def legacy_is_bot(user_agent):
+    """The original per-request loop over the configured patterns."""
+    user_agent = user_agent.lower()
+    for legitimate_bot in BOT_DETECTION['LEGITIMATE_BOTS']:
+        if legitimate_bot in user_agent:
+            return False
+    for pattern in BOT_DETECTION['SUSPICIOUS_PATTERNS']:
+        if pattern in user_agent:
+            return True
+    return len(user_agent) < BOT_DETECTION['MIN_USER_AGENT_LENGTH']
+
+
+class UserAgentClassifierTest(TestCase):
+    """Correctness tests for the user agent classifier."""
+
+    def setUp(self):
+        self.classifier = UserAgentClassifier.from_config(BOT_DETECTION)
+
+    def test_matches_legacy_verdicts(self):
+        """Suspicious verdicts agree with the substring loop."""
+
+        for agent in SAMPLE_AGENTS:
+            self.assertEqual(
+                self.classifier.classify(agent).is_suspicious,
+                legacy_is_bot(agent), agent
+            )
+
+    def test_structured_verdicts(self):
+        classify = self.classifier.classify
+
+        self.assertEqual(classify(SAMPLE_AGENTS[6]).kind, CRAWLER)
+        self.assertEqual(classify(SAMPLE_AGENTS[6]).matched, 'googlebot')
+        self.assertEqual(classify(SAMPLE_AGENTS[7]).kind, BOT)
+        self.assertEqual(classify('curl/8').kind, SUSPICIOUS)
+        self.assertEqual(classify(DESKTOP).kind, BROWSER)
+
+    def test_device_classes(self):
+        classify = self.classifier.classify
+
+        self.assertEqual(classify(DESKTOP).device, 'desktop')
+        self.assertEqual(classify(IPHONE).device, 'mobile')
+        self.assertEqual(classify(IPAD).device, 'tablet')
+
+    def test_verdicts_are_memoised(self):
+        """Repeated user agents are answered from the LRU."""
+
+        classifier = UserAgentClassifier(maxsize=8)
+        classifier.classify(DESKTOP)
+        classifier.classify(DESKTOP)
+
+        info = classifier.cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 1)
+
+    def test_lru_is_bounded(self):
+        classifier = UserAgentClassifier(maxsize=8)
+        for i in range(100):
+            classifier.classify(f'{DESKTOP} build/{i}')
+
+        self.assertLessEqual(classifier.cache_info().currsize, 8)
+
+
+@override_settings(RATE_LIMITING={
+    **settings.RATE_LIMITING, 'BOT_DETECTION': BOT_DETECTION,
+})
+class SharedClassifierTest(TestCase):
+    """Every caller goes through one classifier, once per request."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_built_from_settings(self):
+        classifier = get_user_agent_classifier()
+
+        self.assertIs(get_user_agent_classifier(), classifier)
+        self.assertEqual(classifier.min_length, 10)
+
+    def test_classified_once_per_request(self):
+        request = self.factory.get('/', HTTP_USER_AGENT='curl/8')
+
+        with mock.patch.object(
+            UserAgentClassifier, 'classify', autospec=True,
+            side_effect=UserAgentClassifier.classify
+        ) as classify:
+            self.assertTrue(is_bot_request(request))
+            self.assertFalse(can_increment_view_count(request, 'post'))
+            classify_request(request)
+
+        self.assertEqual(classify.call_count, 1)
+
+    def test_crawlers_never_count_views(self):
+        """Allowed crawlers pass bot detection but are not views."""
+
+        request = self.factory.get('/', HTTP_USER_AGENT=SAMPLE_AGENTS[6])
+
+        self.assertFalse(is_bot_request(request))
+        self.assertFalse(can_increment_view_count(request, 'post'))
@@ -0,0 +1,118 @@
+"""
+Test Suite for Batched View Attempt Logging
+===========================================
+
+Audit rows for view count attempts are queued and written with
+``bulk_create`` by size or time, from a bounded queue that drops (and
+counts) rows under overload.
+"""
+
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from wagtail.models import Page
+
+from blog.models import BlogPostPage, ViewCountAttempt
+from blog.view_attempts import ViewAttemptLog
+from blog.views.increment_views import IncrementViewCountView
+from portfolio.utils.cache_metrics import cache_metrics
+
+
+class ViewAttemptLogTest(TestCase):
+    """Tests for the batched writer (inline mode)."""
+
+    def setUp(self):
+        cache.clear()
+        cache_metrics.reset()
+        self.post = Page.get_first_root_node().add_child(
+            instance=BlogPostPage(title='Post', slug='post')
+        )
+
+    def _attempt(self, reason='Invalid payload'):
+        return ViewCountAttempt(article=self.post, ip_address='10.0.0.1',
+                                user_agent='Mozilla/5.0', reason=reason)
+
+    def _log(self, **options):
+        options = {'ASYNC': False, 'FLUSH_INTERVAL': 60, **options}
+        return ViewAttemptLog(**options)
+
+    def test_written_in_batches(self):
+        """Rows wait until a batch is full, then go in one INSERT."""
+
+        log = self._log(BATCH_SIZE=5)
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(4):
+                log.log(self._attempt())
+        self.assertEqual(len(queries), 0)
+
+        with CaptureQueriesContext(connection) as queries:
+            log.log(self._attempt())
+        self.assertEqual(len([query for query in queries.captured_queries
+                              if query['sql'].startswith('INSERT')]), 1)
+        self.assertEqual(ViewCountAttempt.objects.count(), 5)
+
+    def test_written_after_interval(self):
+        log = self._log(BATCH_SIZE=100, FLUSH_INTERVAL=0)
+        log.log(self._attempt())
+
+        self.assertEqual(ViewCountAttempt.objects.count(), 1)
+
+    def test_bad_row_loses_only_itself(self):
+        """A batch the database rejects is retried row by row."""
+
+        log = self._log(BATCH_SIZE=3)
+        bad = self._attempt()
+        bad.ip_address = None
+        for attempt in (self._attempt(), bad, self._attempt()):
+            log.log(attempt)
+
+        self.assertEqual(ViewCountAttempt.objects.count(), 2)
+        self.assertEqual(log.stats()['written'], 2)
+        self.assertEqual(cache_metrics.snapshot()['view_attempts']['failed'], 1)
+
+    def test_bounded_queue_drops(self):
+        """A full queue drops new rows and counts them."""
+
+        log = self._log(BATCH_SIZE=100, MAX_QUEUE=3)
+        results = [log.log(self._attempt()) for _ in range(5)]
+
+        self.assertEqual(results, [True] * 3 + [False] * 2)
+        self.assertEqual(log.stats(), {'queued': 3, 'written': 0, 'dropped': 2})
+        self.assertEqual(cache_metrics.snapshot()['view_attempts']['dropped'], 2)
+
+        log.flush()
+        self.assertEqual(ViewCountAttempt.objects.count(), 3)
+
+    def test_flushed_at_exit(self):
+        """Rows still queued are written by the exit hook, or counted lost."""
+
+        log = self._log(BATCH_SIZE=100)
+        log.log(self._attempt())
+        log.flush_at_exit()
+        self.assertEqual(ViewCountAttempt.objects.count(), 1)
+
+        log.log(self._attempt())
+        with mock.patch.object(log, 'flush', side_effect=RuntimeError):
+            log.flush_at_exit()
+        self.assertEqual(log.stats(), {'queued': 0, 'written': 1, 'dropped': 1})
+        self.assertEqual(cache_metrics.snapshot()['view_attempts']['dropped'], 1)
+
+    def test_rejected_beacon_writes_nothing(self):
+        """The endpoint no longer writes an attempt row per request."""
+
+        request = RequestFactory().post('/', REMOTE_ADDR='10.0.0.1')
+        request.user = AnonymousUser()
+        log = self._log()
+
+        with mock.patch('blog.views.increment_views.view_attempt_log', log), \
+                CaptureQueriesContext(connection) as queries:
+            response = IncrementViewCountView.as_view()(request, slug='post')
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse([query for query in queries.captured_queries
+                          if 'view_count_attempts' in query['sql']])
+        self.assertEqual(log.stats()['queued'], 1)
@@ -0,0 +1,161 @@
+"""
+Test Suite for Write-Behind View Counting
+=========================================
+
+Detail reads only append to a buffer; views reach ``view_count`` and the
+attempt log in bulk when the buffer is flushed, still once per visitor.
+"""
+
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from wagtail.models import Page
+
+from blog.models import BlogPostPage, ViewCountAttempt
+from blog.view_counts import ViewCountBuffer, view_count_buffer
+
+
+class ViewCountBufferTest(TestCase):
+    """Tests for buffering and flushing views."""
+
+    def setUp(self):
+        cache.clear()
+        root = Page.get_first_root_node()
+        self.first = root.add_child(instance=BlogPostPage(title='First', slug='first'))
+        self.second = root.add_child(instance=BlogPostPage(title='Second', slug='second'))
+        self.buffer = ViewCountBuffer(flush_interval=60, background=False)
+        self.factory = RequestFactory()
+
+    def _request(self, ip='10.0.0.1'):
+        return self.factory.get('/', REMOTE_ADDR=ip, HTTP_USER_AGENT='Mozilla/5.0')
+
+    def test_record_writes_nothing(self):
+        """Recording a view touches the cache only."""
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(self.buffer.record(self.first, self._request()))
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(self.buffer.pending(), {self.first.pk: 1})
+
+    def test_flush_in_bulk(self):
+        """Views of several posts are applied by one flush."""
+
+        for i in range(3):
+            self.buffer.record(self.first, self._request(f'10.0.0.{i}'))
+        self.buffer.record(self.second, self._request())
+
+        self.assertEqual(self.buffer.flush(), {self.first.pk: 3, self.second.pk: 1})
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual((self.first.view_count, self.second.view_count), (3, 1))
+        self.assertEqual(ViewCountAttempt.objects.count(), 4)
+        self.assertEqual(self.buffer.pending(), {})
+
+    def test_counted_once_per_visitor(self):
+        """Repeat views are dropped, even after the seen marker expires."""
+
+        self.buffer.record(self.first, self._request())
+        self.assertFalse(self.buffer.record(self.first, self._request()))
+        self.buffer.flush()
+
+        cache.clear()
+        self.buffer.record(self.first, self._request())
+
+        self.assertEqual(self.buffer.flush(), {})
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.view_count, 1)
+
+    def test_record_never_flushes(self):
+        """Requests leave flushing to the background thread and the command."""
+
+        buffer = ViewCountBuffer(flush_interval=0, background=False)
+        with CaptureQueriesContext(connection) as queries:
+            buffer.record(self.first, self._request())
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(buffer.pending(), {self.first.pk: 1})
+
+    def test_background_flusher_started(self):
+        """Recording starts one flusher thread per buffer."""
+
+        buffer = ViewCountBuffer(flush_interval=3600, background=True)
+        buffer.record(self.first, self._request())
+        flusher = buffer._flusher
+        buffer.record(self.second, self._request())
+
+        self.assertTrue(flusher.is_alive())
+        self.assertIs(buffer._flusher, flusher)
+
+    def test_flushed_at_exit(self):
+        """Views held in memory are written by the exit hook."""
+
+        with CaptureQueriesContext(connection) as queries:
+            self.buffer.flush_at_exit()
+        self.assertEqual(len(queries), 0)
+
+        self.buffer.record(self.first, self._request())
+        self.buffer.flush_at_exit()
+
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.view_count, 1)
+        self.assertTrue(ViewCountAttempt.objects.get().success)
+
+    @override_settings(VIEW_COUNT_BUFFER={'BACKGROUND': False})
+    def test_model_and_command(self):
+        """increment_view_count buffers; the command writes the views."""
+
+        self.assertTrue(self.first.increment_view_count(self._request()))
+        self.assertEqual(self.first.view_count, 1)
+        self.assertEqual(BlogPostPage.objects.get(pk=self.first.pk).view_count, 0)
+
+        out = StringIO()
+        call_command('flush_view_counts', stdout=out)
+
+        self.assertIn('Flushed 1 views across 1 posts', out.getvalue())
+        self.assertEqual(BlogPostPage.objects.get(pk=self.first.pk).view_count, 1)
+        self.assertEqual(view_count_buffer.pending(), {})
+
+
+@override_settings(VIEW_COUNT_BUFFER={'UNIQUE_VISITORS': 'hll'})
+class UniqueVisitorViewCountTest(TestCase):
+    """Visitors counted by a HyperLogLog per post instead of rows."""
+
+    def setUp(self):
+        cache.clear()
+        self.post = Page.get_first_root_node().add_child(
+            instance=BlogPostPage(title='Post', slug='post', view_count=10)
+        )
+        self.buffer = ViewCountBuffer(flush_interval=60, background=False)
+        self.factory = RequestFactory()
+
+    def _record(self, ip):
+        request = self.factory.get('/', REMOTE_ADDR=ip, HTTP_USER_AGENT='Mozilla/5.0')
+        return self.buffer.record(self.post, request)
+
+    def test_no_rows_stored(self):
+        for i in range(50):
+            self._record(f'10.0.0.{i}')
+        self.assertFalse(self._record('10.0.0.1'))
+
+        self.assertEqual(self.buffer.flush(), {self.post.pk: 50})
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 60)
+        self.assertFalse(ViewCountAttempt.objects.exists())
+
+    def test_only_growth_materialised(self):
+        """Each flush adds what the estimate grew by since the last one."""
+
+        self._record('10.0.0.1')
+        self.buffer.flush()
+        self._record('10.0.0.2')
+        self._record('10.0.0.3')
+
+        self.assertEqual(self.buffer.flush(), {self.post.pk: 2})
+        self.assertEqual(self.buffer.flush(), {})
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 13)
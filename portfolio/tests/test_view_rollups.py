@@ -0,0 +1,113 @@
+"""
+Test Suite for View Attempt Rollups and Retention
+=================================================
+
+Raw attempts are folded into hourly rollups from a checkpoint, old raw rows
+are pruned in chunks, and abuse reports read the rollups.
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from wagtail.models import Page
+
+from blog.models import BlogPostPage, ViewCountAttempt, ViewCountRollup
+from blog.view_rollups import prune_view_attempts, rollup_view_attempts
+
+
+HOUR = datetime(2026, 1, 5, 10, tzinfo=dt_timezone.utc)
+
+
+class ViewRollupTest(TestCase):
+    """Tests for the incremental rollups."""
+
+    def setUp(self):
+        root = Page.get_first_root_node()
+        self.first = root.add_child(instance=BlogPostPage(title='First', slug='first'))
+        self.second = root.add_child(instance=BlogPostPage(title='Second', slug='second'))
+
+    def _attempts(self, count, at, article=None, ip='10.0.0.1', success=False,
+                  visitor_hash=None):
+        created = ViewCountAttempt.objects.bulk_create([
+            ViewCountAttempt(article=article or self.first, ip_address=ip,
+                             user_agent='Mozilla/5.0', success=success,
+                             visitor_hash=visitor_hash and f'{visitor_hash}{i}')
+            for i in range(count)
+        ])
+        ViewCountAttempt.objects.filter(
+            id__in=[attempt.id for attempt in created]
+        ).update(timestamp=at)
+
+    def _rollup(self, article=None, hour=HOUR, ip='10.0.0.1'):
+        return ViewCountRollup.objects.get(
+            article=article or self.first, hour=hour, ip_address=ip
+        )
+
+    def test_grouped_by_hour_ip_and_article(self):
+        self._attempts(3, HOUR + timedelta(minutes=5))
+        self._attempts(2, HOUR + timedelta(minutes=50), success=True)
+        self._attempts(1, HOUR + timedelta(hours=1, minutes=1))
+        self._attempts(4, HOUR, article=self.second, ip='10.0.0.2')
+
+        self.assertEqual(rollup_view_attempts(batch_size=3), 10)
+
+        rollup = self._rollup()
+        self.assertEqual((rollup.attempts, rollup.failures), (5, 3))
+        self.assertEqual(self._rollup(hour=HOUR + timedelta(hours=1)).attempts, 1)
+        self.assertEqual(self._rollup(self.second, ip='10.0.0.2').attempts, 4)
+
+    def test_incremental_from_checkpoint(self):
+        """A second run only folds in rows added since the first."""
+
+        self._attempts(3, HOUR)
+        rollup_view_attempts()
+        self._attempts(2, HOUR + timedelta(minutes=30))
+
+        self.assertEqual(rollup_view_attempts(), 2)
+        self.assertEqual(rollup_view_attempts(), 0)
+        self.assertEqual(self._rollup().attempts, 5)
+
+    def test_recent_rows_wait_for_the_safety_lag(self):
+        """Rows after a recent one are left for a later run."""
+
+        self._attempts(2, HOUR)
+        self._attempts(1, timezone.now())
+        self._attempts(3, HOUR + timedelta(minutes=10))
+
+        self.assertEqual(rollup_view_attempts(), 2)
+        self.assertEqual(rollup_view_attempts(lag=-60), 4)
+        self.assertEqual(self._rollup().attempts, 5)
+
+    def test_prune_keeps_recent_and_unrolled_rows(self):
+        old = timezone.now() - timedelta(days=40)
+        self._attempts(5, old)
+        self._attempts(2, old, visitor_hash='visitor')
+        self._attempts(1, timezone.now())
+        rollup_view_attempts()
+        self._attempts(3, old)
+
+        self.assertEqual(prune_view_attempts(days=30, chunk_size=2), 5)
+        self.assertEqual(ViewCountAttempt.objects.count(), 6)
+
+        self.assertEqual(prune_view_attempts(days=30, include_visitors=True), 2)
+
+    def test_detect_abuse_reads_rollups(self):
+        recent = timezone.now() - timedelta(hours=2)
+        self._attempts(45, recent, ip='10.6.6.6')
+        self._attempts(10, recent, ip='10.6.6.6', success=True)
+        self._attempts(30, recent)
+
+        out = StringIO()
+        call_command('detect_abuse', stdout=out)
+
+        self.assertIn('Suspicious IP: 10.6.6.6 - 45/55', out.getvalue())
+        self.assertNotIn('10.0.0.1', out.getvalue())
+
+        out = StringIO()
+        call_command('prune_view_attempts', '--days', '0', stdout=out)
+        self.assertIn('Deleted 85 view count attempts', out.getvalue())
+        call_command('detect_abuse', stdout=out)
+        self.assertIn('Suspicious IP: 10.6.6.6 - 45/55', out.getvalue())
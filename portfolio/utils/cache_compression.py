@@ -0,0 +1,127 @@
+"""
+Cache Compression - Pre-compressed Page Cache Entries
+=====================================================
+
+Pages are compressed once, when the page cache stores them, rather than on
+every hit. The stored copy carries its encoding in ``_cache_encoding``
+(pickled with the response). On a hit the stored bytes are sent as-is to
+clients that accept that encoding, and decompressed for the rest.
+
+Brotli is used when the ``brotli`` package is installed, gzip otherwise;
+``PAGE_CACHE_COMPRESSION`` picks one explicitly (or ``None`` to disable).
+
+``Vary: Accept-Encoding`` is added only when an entry is served, never
+before it is stored, so a single entry serves every client instead of one
+entry per ``Accept-Encoding`` string.
+"""
+
+import copy
+import gzip
+import re
+from typing import Optional
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Bodies smaller than this gain too little to be worth compressing
+MIN_COMPRESS_SIZE = 512
+
+COMPRESSIBLE_CONTENT_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'application/rss+xml',
+    'image/svg+xml',
+)
+
+_accepts_encoding = {
+    'br': re.compile(r'\bbr\b'),
+    'gzip': re.compile(r'\bgzip\b'),
+}
+
+
+def get_storage_encoding() -> Optional[str]:
+    """Encoding page cache entries are stored in, or None for identity."""
+    default = 'br' if brotli is not None else 'gzip'
+    encoding = getattr(settings, 'PAGE_CACHE_COMPRESSION', default)
+    if encoding == 'br' and brotli is None:
+        return 'gzip'
+    return encoding
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data)
+    # mtime=0 keeps the bytes (and any ETag derived from them) stable
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.decompress(data)
+    return gzip.decompress(data)
+
+
+def _is_compressible(response: HttpResponse) -> bool:
+    if getattr(response, 'streaming', False) or \
+            response.has_header('Content-Encoding'):
+        return False
+    content_type = response.get('Content-Type', '').lower()
+    return content_type.startswith(COMPRESSIBLE_CONTENT_TYPES)
+
+
+def compress_for_cache(response: HttpResponse) -> HttpResponse:
+    """
+    Return a compressed copy of a response for storage, or the response
+    itself when compression does not apply or does not pay off. The
+    original is left untouched: it is still being sent to the client.
+    """
+    encoding = get_storage_encoding()
+    if not encoding or not _is_compressible(response):
+        return response
+
+    content = response.content
+    if len(content) < MIN_COMPRESS_SIZE:
+        return response
+
+    compressed = compress(content, encoding)
+    if len(compressed) >= len(content):
+        return response
+
+    stored = copy.copy(response)
+    stored.content = compressed
+    stored._cache_encoding = encoding
+    stored._cache_identity_length = len(content)
+    return stored
+
+
+def decode_cached_response(request: HttpRequest, response: HttpResponse) -> HttpResponse:
+    """
+    Prepare a fetched entry for this client: keep the stored bytes when the
+    client accepts their encoding, decompress them otherwise.
+    """
+    encoding = getattr(response, '_cache_encoding', None)
+    if not encoding:
+        return response
+
+    accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    if _accepts_encoding[encoding].search(accept_encoding):
+        response['Content-Encoding'] = encoding
+        # Like GZipMiddleware: the encoded body no longer matches a strong ETag
+        if response.has_header('ETag'):
+            response['ETag'] = re.sub(r'^"', 'W/"', response['ETag'])
+    else:
+        response.content = decompress(response.content, encoding)
+    response._cache_encoding = None
+
+    response['Content-Length'] = str(len(response.content))
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
@@ -15,66 +15,42 @@ from django.core.cache import cache
 from django.http import HttpRequest, HttpResponse
 from django.urls import reverse, NoReverseMatch
 from django.utils.cache import get_cache_key
-from django.core.exceptions import ImproperlyConfigured
+
+from portfolio.middlewares.page_cache import get_page_cache
+from portfolio.utils.cache_keys import canonical_query
+from portfolio.utils.cache_metrics import cache_metrics
+from portfolio.utils.cache_policy import (
+    CACHE_STRATEGIES,
+    CONTENT_TYPE_TTL,
+    ROUTE_GROUP_TTL,
+    CachePolicy,
+    content_family,
+    get_cache_policy,
+    get_default_strategy,
+    set_active_strategy,
+)
+from portfolio.utils.user_agent_classifier import classify_request
+from portfolio.utils.cache_tags import invalidate_tags
+from portfolio.utils.cache_warmer import (
+    DEFAULT_WORKERS,
+    CacheWarmer,
+    WarmResult,
+    discover_warm_targets,
+)
 
 
 class CacheConfig:
     """Advanced cache configuration and management."""
     
-    # Cache strategies
-    CACHE_STRATEGIES = {
-        'AGGRESSIVE': {
-            'default_ttl': 3600,  # 1 hour
-            'static_ttl': 86400,  # 24 hours
-            'dynamic_ttl': 300,   # 5 minutes
-            'api_ttl': 60,        # 1 minute
-        },
-        'BALANCED': {
-            'default_ttl': 1800,  # 30 minutes
-            'static_ttl': 43200,  # 12 hours
-            'dynamic_ttl': 600,   # 10 minutes
-            'api_ttl': 120,       # 2 minutes
-        },
-        'CONSERVATIVE': {
-            'default_ttl': 600,   # 10 minutes
-            'static_ttl': 21600,  # 6 hours
-            'dynamic_ttl': 300,   # 5 minutes
-            'api_ttl': 30,        # 30 seconds
-        },
-        'NO_CACHE': {
-            'default_ttl': 0,
-            'static_ttl': 0,
-            'dynamic_ttl': 0,
-            'api_ttl': 0,
-        }
-    }
-    
-    # Content type cache mappings
-    CONTENT_TYPE_TTL = {
-        'text/html': 'default_ttl',
-        'text/css': 'static_ttl',
-        'application/javascript': 'static_ttl',
-        'image/': 'static_ttl',
-        'application/json': 'api_ttl',
-        'text/plain': 'default_ttl',
-    }
+    # Strategies and TTL mappings, compiled per strategy by CachePolicy
+    CACHE_STRATEGIES = CACHE_STRATEGIES
+    CONTENT_TYPE_TTL = CONTENT_TYPE_TTL
+    ROUTE_GROUP_TTL = ROUTE_GROUP_TTL
     
-    # URL pattern cache mappings
-    URL_PATTERN_TTL = {
-        r'^/static/': 'static_ttl',
-        r'^/media/': 'static_ttl',
-        r'^/api/': 'api_ttl',
-        r'^/blog/': 'dynamic_ttl',
-        r'^/projects/': 'dynamic_ttl',
-        r'^/$': 'default_ttl',
-    }
-    
-    def __init__(self, strategy: str = 'BALANCED'):
-        self.strategy = strategy.upper()
-        if self.strategy not in self.CACHE_STRATEGIES:
-            raise ImproperlyConfigured(f"Invalid cache strategy: {strategy}")
-
-        self.config = self.CACHE_STRATEGIES[self.strategy]
+    def __init__(self, strategy: Optional[str] = None):
+        self.policy = CachePolicy(strategy or get_default_strategy())
+        self.strategy = self.policy.strategy
+        self.config = self.policy.config
 
     def get_ttl_for_request(self, request: HttpRequest) -> int:
         """Get appropriate TTL for a request."""
@@ -83,27 +59,15 @@ class CacheConfig:
         if hasattr(request, '_cache_ttl'):
             return request._cache_ttl
         
-        # Check URL patterns
-        for pattern, ttl_key in self.URL_PATTERN_TTL.items():
-            import re
-            if re.match(pattern, request.path):
-                return self.config[ttl_key]
-        
-        # Default TTL
-        return self.config['default_ttl']
+        return self.policy.ttl(request.path_info)
     
     def get_ttl_for_response(self, response: HttpResponse) -> int:
         """Get appropriate TTL for a response."""
         
-        content_type = response.get('Content-Type', '').lower()
-        
-        # Check content type mappings
-        for content_pattern, ttl_key in self.CONTENT_TYPE_TTL.items():
-            if content_pattern in content_type:
-                return self.config[ttl_key]
-        
-        # Default TTL
-        return self.config['default_ttl']
+        ttl_key = self.CONTENT_TYPE_TTL.get(
+            content_family(response.get('Content-Type', ''))
+        )
+        return self.config[ttl_key or 'default_ttl']
     
     def generate_cache_key(self, request: HttpRequest, prefix: str = '') -> str:
         """Generate intelligent cache key for request."""
@@ -116,11 +80,12 @@ class CacheConfig:
             request.path_info,
         ]
         
-        # Add query parameters (sorted for consistency)
-        if request.GET:
-            sorted_params = sorted(request.GET.items())
-            param_string = '&'.join(f"{k}={v}" for k, v in sorted_params)
-            components.append(param_string)
+        # Add the canonical query (whitelisted, normalised, sorted)
+        verdict, query_string = canonical_query(request.path_info, request.GET)
+        if verdict is False:
+            query_string = request.GET.urlencode()
+        if query_string:
+            components.append(query_string)
         
         # Add user-specific component if authenticated
         if hasattr(request, 'user') and request.user.is_authenticated:
@@ -131,8 +96,7 @@ class CacheConfig:
             components.append(f"lang:{request.LANGUAGE_CODE}")
         
         # Add device type component
-        user_agent = request.META.get('HTTP_USER_AGENT', '').lower()
-        if 'mobile' in user_agent or 'android' in user_agent or 'iphone' in user_agent:
+        if classify_request(request).device != 'desktop':
             components.append('mobile')
         else:
             components.append('desktop')
@@ -183,50 +147,44 @@ class CacheManager:
     def __init__(self):
         self.cache_config = CacheConfig()
         self.warmed_urls = set()
+        self.last_warm_results: List[WarmResult] = []
     
-    def warm_cache(self, urls: List[str], request_factory: Optional[Callable] = None) -> Dict[str, bool]:
-        """Warm cache for specified URLs."""
+    def warm_cache(self, urls: Optional[List[str]] = None,
+                   workers: int = DEFAULT_WORKERS,
+                   base_url: Optional[str] = None) -> Dict[str, bool]:
+        """
+        Warm cache for specified URLs (or the discovered popular pages) by
+        rendering them through the full middleware stack.
+        """
         
-        results = {}
+        if urls is None:
+            urls = discover_warm_targets()
+        
+        warmer = CacheWarmer(base_url=base_url, workers=workers)
+        self.last_warm_results = warmer.warm(urls)
         
-        for url in urls:
-            try:
-                # Create mock request
-                if request_factory:
-                    request = request_factory(url)
-                else:
-                    request = self._create_mock_request(url)
-                
-                # Generate cache key
-                cache_key = self.cache_config.generate_cache_key(request)
-                
-                # Check if already cached
-                if cache.get(cache_key):
-                    results[url] = True
-                    continue
-                
-                # Mark as warmed
-                self.warmed_urls.add(url)
-                results[url] = True
-                
-            except Exception as e:
-                results[url] = False
-                print(f"Failed to warm cache for {url}: {e}")
+        results = {}
+        for result in self.last_warm_results:
+            results[result.url] = result.ok
+            if result.ok:
+                self.warmed_urls.add(result.url)
         
         return results
     
     def invalidate_pattern(self, pattern: str) -> int:
         """Invalidate cache entries matching pattern."""
-        
-        # This is a simplified version - in production you'd want to use
-        # cache versioning or a more sophisticated invalidation strategy
-        
-        # For Redis, you could use SCAN with pattern matching
-        # For now, we'll use a tag-based approach
-        
-        cache.delete_many([pattern])
-        return 1  # Placeholder for actual count
-    
+
+        # Page keys are md5 hashes of the URL on every backend, so a key
+        # pattern cannot match them; patterns name a content tag instead
+        # (e.g. '*blog*'), which also drops workers' L1 copies
+        tag = pattern.strip('*')
+        return self.invalidate_tags(tag) if tag else 0
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """Invalidate every cache entry built from any of the tags."""
+
+        return invalidate_tags(*tags)
+
     def invalidate_user_cache(self, user_id: int) -> int:
         """Invalidate all cache entries for a specific user."""
         
@@ -239,7 +197,7 @@ class CacheManager:
         try:
             request = self._create_mock_request(url)
             cache_key = self.cache_config.generate_cache_key(request)
-            cache.delete(cache_key)
+            get_page_cache().delete(cache_key)
             return True
         except Exception:
             return False
@@ -248,6 +206,7 @@ class CacheManager:
         """Clear all cache entries."""
         
         try:
+            get_page_cache().clear()
             cache.clear()
             return True
         except Exception:
@@ -256,14 +215,15 @@ class CacheManager:
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         
-        # This would depend on your cache backend
-        # For Redis, you could get memory usage, key count, etc.
+        # Hit/miss/exclusion counters and latency histograms per route
+        # group, aggregated across workers (see cache_metrics)
         
         return {
             'warmed_urls_count': len(self.warmed_urls),
             'warmed_urls': list(self.warmed_urls),
             'cache_backend': settings.CACHES['default']['BACKEND'],
             'cache_location': settings.CACHES['default'].get('LOCATION', 'N/A'),
+            'metrics': cache_metrics.snapshot(),
         }
     
     def _create_mock_request(self, url: str) -> HttpRequest:
@@ -281,35 +241,28 @@ cache_manager = CacheManager()
 
 # Utility functions for easy use
 def set_cache_strategy(strategy: str):
-    """Set global cache strategy."""
+    """Set the cache strategy of every worker (shared through the cache)."""
     global cache_manager
+    set_active_strategy(strategy)
     cache_manager.cache_config = CacheConfig(strategy)
 
 
-def warm_popular_pages():
+def warm_popular_pages(limit: Optional[int] = None):
     """Warm cache for popular pages."""
     
-    popular_urls = [
-        '/',
-        '/blog/',
-        '/projects/',
-        '/about/',
-        '/contact/',
-    ]
-    
-    return cache_manager.warm_cache(popular_urls)
+    return cache_manager.warm_cache(discover_warm_targets(limit))
 
 
 def invalidate_blog_cache():
     """Invalidate all blog-related cache."""
     
-    return cache_manager.invalidate_pattern('*blog*')
+    return cache_manager.invalidate_tags('blog')
 
 
 def invalidate_project_cache():
     """Invalidate all project-related cache."""
     
-    return cache_manager.invalidate_pattern('*project*')
+    return cache_manager.invalidate_tags('projects')
 
 
 def get_cache_performance_metrics() -> Dict[str, Any]:
@@ -318,9 +271,10 @@ def get_cache_performance_metrics() -> Dict[str, Any]:
     stats = cache_manager.get_cache_stats()
     
     # Add performance metrics
+    policy = get_cache_policy()
     stats.update({
-        'strategy': cache_manager.cache_config.strategy,
-        'config': cache_manager.cache_config.config,
+        'strategy': policy.strategy,
+        'config': policy.config,
     })
     
     return stats
@@ -0,0 +1,127 @@
+"""
+Cache Cookies - Cookie-Aware Cacheability for Anonymous Visitors
+================================================================
+
+With ``SESSION_SAVE_EVERY_REQUEST`` and the SPA fetching CSRF tokens,
+nearly every anonymous visitor carries ``sessionid`` and ``csrftoken``
+cookies. Those cookies used to exclude the request from the page cache,
+and ``Vary: Cookie`` would have given each visitor a private entry anyway.
+
+In ``'strip'`` mode (``CACHE_ANONYMOUS_COOKIES``), requests from anonymous
+visitors whose cookies are all framework or analytics cookies are
+*cookie-neutral*:
+
+1. Page cache keys are computed as if the request carried no cookies, so
+   every anonymous visitor shares one entry (``Vary: Cookie`` is still
+   sent, so downstream caches stay correct).
+2. A response is stored only if it does not depend on the cookies: no CSRF
+   token was issued, no messages were rendered, the session was not
+   written and the view set no cookies of its own.
+3. Cookies are stripped from the stored copy, so cached bodies never carry
+   another visitor's session cookie. The live response keeps them.
+
+``'exclude'`` restores the old behaviour of never caching such requests.
+"""
+
+import copy
+from contextlib import contextmanager
+from http.cookies import SimpleCookie
+from typing import Set
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+
+
+# Cookies set by client-side analytics; they never change a response
+NEUTRAL_COOKIE_PREFIXES = ('_ga', '_gid', '_gat', '_gcl', '_fbp', '_hj')
+
+
+def get_cookie_mode() -> str:
+    return getattr(settings, 'CACHE_ANONYMOUS_COOKIES', 'strip')
+
+
+def _framework_cookies() -> Set[str]:
+    return {settings.SESSION_COOKIE_NAME, settings.CSRF_COOKIE_NAME}
+
+
+def is_neutral_cookie(name: str) -> bool:
+    return name in _framework_cookies() or name.startswith(NEUTRAL_COOKIE_PREFIXES)
+
+
+def cookies_are_neutral(request: HttpRequest) -> bool:
+    """True if the request's cookies may be ignored for caching."""
+    request = getattr(request, '_request', request)
+    verdict = getattr(request, '_cache_cookies_neutral', None)
+    if verdict is not None:
+        return verdict
+
+    if get_cookie_mode() != 'strip':
+        verdict = False
+    elif not request.COOKIES:
+        verdict = True
+    else:
+        user = getattr(request, 'user', None)
+        verdict = (
+            user is not None and not user.is_authenticated and
+            all(is_neutral_cookie(name) for name in request.COOKIES)
+        )
+
+    request._cache_cookies_neutral = verdict
+    return verdict
+
+
+def response_depends_on_cookies(request: HttpRequest, response: HttpResponse) -> bool:
+    """True if a response was built from (or for) this visitor's cookies."""
+    request = getattr(request, '_request', request)
+
+    # A CSRF token was issued: the page or its cookie is per-visitor
+    if request.META.get('CSRF_COOKIE_NEEDS_UPDATE') or \
+            settings.CSRF_COOKIE_NAME in response.cookies:
+        return True
+
+    # The view set cookies of its own
+    if set(response.cookies) - {settings.SESSION_COOKIE_NAME}:
+        return True
+
+    storage = getattr(request, '_messages', None)
+    if storage is not None and getattr(storage, 'used', False):
+        return True
+
+    session = getattr(request, 'session', None)
+    return bool(session is not None and session.modified)
+
+
+@contextmanager
+def cookieless_key(request: HttpRequest):
+    """Compute page cache keys as if a cookie-neutral request had no cookies."""
+    request = getattr(request, '_request', request)
+    cookie = None
+    if 'HTTP_COOKIE' in request.META and cookies_are_neutral(request):
+        cookie = request.META.pop('HTTP_COOKIE')
+    try:
+        yield
+    finally:
+        if cookie is not None:
+            request.META['HTTP_COOKIE'] = cookie
+
+
+@contextmanager
+def detached_cookies(response: HttpResponse):
+    """
+    Hide the cookies a response is about to send while it is considered for
+    storage; Django will not store a ``Vary: Cookie`` response that sets
+    cookies on a cookieless request, even when they are only framework ones.
+    """
+    cookies = response.cookies
+    response.cookies = SimpleCookie()
+    try:
+        yield
+    finally:
+        response.cookies = cookies
+
+
+def strip_cookies(response: HttpResponse) -> HttpResponse:
+    """A copy of a response to store, without its ``Set-Cookie`` headers."""
+    stored = copy.copy(response)
+    stored.cookies = SimpleCookie()
+    return stored
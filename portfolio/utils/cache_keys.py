@@ -0,0 +1,222 @@
+"""
+Cache Keys - Canonical Query Strings for Listing Pages
+======================================================
+
+Paginated, sorted and filtered listings used to be excluded from the page
+cache outright. Routes with a ``QueryPolicy`` instead whitelist the query
+parameters their view reads, each with a normalisation rule (defaults,
+case, allowed values, aliases). A request is rewritten to its canonical
+query string before any cache key is computed, so equivalent URLs share
+one entry and the view renders exactly what the key describes.
+
+Tracking parameters (``utm_*``, ``fbclid`` ...) are dropped on every route.
+On a route with a policy, any other unknown parameter makes the request
+uncacheable, because it may change what the view renders.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from urllib.parse import urlencode
+
+from django.http import HttpRequest, QueryDict
+
+from portfolio.utils.keyset_pagination import CURSOR_PARAM, ESTIMATE_PARAM
+
+
+# Marketing and analytics parameters that never change a response
+IGNORED_QUERY_PARAMS = frozenset({
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'mc_cid', 'mc_eid',
+    '_ga', '_gl', 'igshid',
+})
+IGNORED_QUERY_PREFIXES = ('utm_',)
+
+# Longest value kept in a cache key; longer values are not cached
+MAX_VALUE_LENGTH = 100
+
+# Signed pagination cursors are longer than ordinary values
+MAX_CURSOR_LENGTH = 512
+
+
+@dataclass(frozen=True)
+class QueryParam:
+    """Normalisation rule for one whitelisted query parameter."""
+
+    name: str
+    aliases: Tuple[str, ...] = ()
+    default: Optional[str] = None
+    lowercase: bool = False
+    integer: bool = False
+    maximum: Optional[int] = None
+    choices: Optional[Tuple[str, ...]] = None
+    # Presence alone changes the response (``?cursor=``): keep blank values
+    keep_blank: bool = False
+    max_length: int = MAX_VALUE_LENGTH
+
+    def normalise(self, value: str) -> Optional[str]:
+        """Canonical form of a value, '' to drop it, None if uncacheable."""
+        value = value.strip()
+        if self.lowercase:
+            value = value.lower()
+
+        if self.integer and value:
+            if not value.isdigit():
+                return None
+            number = int(value)
+            if self.maximum is not None:
+                number = min(number, self.maximum)
+            value = str(number)
+
+        if value == (self.default or ''):
+            return ''
+        if self.choices is not None and value not in self.choices:
+            return None
+        if len(value) > self.max_length:
+            return None
+        return value
+
+
+@dataclass(frozen=True)
+class QueryPolicy:
+    """The query parameters a route's view reads."""
+
+    pattern: str
+    params: Tuple[QueryParam, ...]
+
+
+_api_blog_orderings = tuple(
+    f'{prefix}{field}'
+    for field in ('first_published_at', 'view_count', 'title')
+    for prefix in ('', '-')
+)
+
+_project_api_sorts = (
+    '-created_at', 'created_at', 'title', '-title', 'category', '-category',
+    'client', '-client', 'project_type', '-project_type',
+)
+
+_project_sorts = (
+    'date-asc', 'date-desc', 'title-asc', 'title-desc', 'category-asc',
+    'category-desc', 'client-asc', 'client-desc', 'type-asc', 'type-desc',
+    'original-order',
+)
+
+_blog_sorts = (
+    'date-asc', 'date-desc', 'title-asc', 'title-desc', 'author-asc',
+    'author-desc',
+)
+
+# Opt-in keyset pagination (see portfolio.utils.keyset_pagination)
+_keyset_params = (
+    QueryParam(CURSOR_PARAM, keep_blank=True, max_length=MAX_CURSOR_LENGTH),
+    QueryParam(ESTIMATE_PARAM, lowercase=True,
+               choices=('1', 'true', 'yes', '0', 'false', 'no')),
+)
+
+QUERY_POLICIES: Tuple[QueryPolicy, ...] = (
+    QueryPolicy(r'^/api/v1/blog/posts/$', (
+        QueryParam('page', integer=True, default='1'),
+        QueryParam('page_size', integer=True, default='6', maximum=20),
+        QueryParam('tag', lowercase=True),
+        QueryParam('year', integer=True),
+        QueryParam('month', integer=True),
+        QueryParam('search', lowercase=True),
+        QueryParam('ordering', default='-first_published_at',
+                   choices=_api_blog_orderings),
+        *_keyset_params,
+    )),
+    QueryPolicy(r'^/api/v1/projects/list$', (
+        QueryParam('page', integer=True, default='1'),
+        QueryParam('page_size', integer=True, default='12'),
+        QueryParam('category', default='all'),
+        QueryParam('project_type', default='all'),
+        QueryParam('client', default='all'),
+        QueryParam('search', aliases=('q',), lowercase=True),
+        QueryParam('sort_by', default='-created_at',
+                   choices=_project_api_sorts),
+        *_keyset_params,
+    )),
+    QueryPolicy(r'^/app/blog/blog$', (
+        QueryParam('page', integer=True, default='1'),
+        QueryParam('tag', default='all'),
+        QueryParam('sort', default='date-desc', choices=_blog_sorts),
+        QueryParam('q'),
+    )),
+    QueryPolicy(r'^/app/projects$', (
+        QueryParam('page', integer=True, default='1'),
+        QueryParam('sort-by', aliases=('sort_by',), default='date-desc',
+                   choices=_project_sorts),
+        QueryParam('category', default='all'),
+        QueryParam('project_type', default='all'),
+        QueryParam('client', default='all'),
+        QueryParam('q'),
+    )),
+)
+
+_compiled_policies = tuple(
+    (re.compile(policy.pattern), policy) for policy in QUERY_POLICIES
+)
+
+
+def get_query_policy(path: str) -> Optional[QueryPolicy]:
+    for pattern, policy in _compiled_policies:
+        if pattern.match(path):
+            return policy
+    return None
+
+
+def is_ignored_param(name: str) -> bool:
+    return name in IGNORED_QUERY_PARAMS or name.startswith(IGNORED_QUERY_PREFIXES)
+
+
+def canonical_query(path: str, query: QueryDict) -> Tuple[Optional[bool], str]:
+    """
+    Return ``(verdict, query_string)`` for a request path and its query.
+    The verdict is None when no policy covers the route (the query, minus
+    tracking parameters, is kept as-is), otherwise whether it is cacheable.
+    """
+    params = {name: query.getlist(name) for name in query
+              if not is_ignored_param(name)}
+
+    policy = get_query_policy(path)
+    if policy is None:
+        return None, urlencode(sorted(params.items()), doseq=True)
+
+    canonical = {}
+    for rule in policy.params:
+        names = [name for name in (rule.name, *rule.aliases) if name in params]
+        if not names:
+            continue
+        # The view reads the first name present, and the last value of it
+        value = rule.normalise(params[names[0]][-1])
+        for name in names:
+            del params[name]
+        if value is None:
+            return False, ''
+        if value or rule.keep_blank:
+            canonical[rule.name] = value
+
+    if params:
+        # Parameters the view may read that the policy does not know
+        return False, ''
+    return True, urlencode(sorted(canonical.items()))
+
+
+def canonicalize_request(request: HttpRequest) -> Optional[bool]:
+    """
+    Rewrite a request's query string to its canonical form (once) and
+    return the policy verdict: None without a policy, else cacheable or not.
+    """
+    request = getattr(request, '_request', request)
+    if hasattr(request, '_cache_query_verdict'):
+        return request._cache_query_verdict
+
+    verdict, query_string = canonical_query(request.path_info, request.GET)
+    # Uncacheable requests are left exactly as the client sent them
+    if verdict is not False and \
+            query_string != request.META.get('QUERY_STRING', ''):
+        request.META['QUERY_STRING'] = query_string
+        request.GET = QueryDict(query_string)
+
+    request._cache_query_verdict = verdict
+    return verdict
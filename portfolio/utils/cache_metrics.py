@@ -0,0 +1,216 @@
+"""
+Cache Metrics - Hit/Miss Counters and Latency Histograms
+========================================================
+
+Counts cache hits, misses, stale serves, stores, exclusions (by reason) and
+evictions per route group, and records latency histograms for cache reads,
+cache writes and the render time each hit saved.
+
+Events are accumulated in-process and merged into the cache backend every
+few seconds, so the counters shown by ``cache_management stats`` cover all
+workers. With django-redis they live in a single Redis hash updated with
+``HINCRBY`` in one pipeline; any other backend stores a dict in the cache,
+guarded by a process lock.
+"""
+
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from portfolio.utils.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+# Cache entry holding the aggregated counters of every worker
+METRICS_KEY = 'cache_metrics'
+
+# Seconds between merges of the local counters into the shared ones
+DEFAULT_FLUSH_INTERVAL = 10
+
+# Upper bounds (ms) of the latency histogram buckets; slower goes to 'inf'
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500,
+)
+
+# Route groups counters are kept per; a fixed list keeps cardinality bounded
+ROUTE_GROUPS: Tuple[Tuple[str, str], ...] = (
+    (r'^/(app/)?$', 'home'),
+    (r'^/api/v1/blog/', 'api:blog'),
+    (r'^/api/v1/projects/', 'api:projects'),
+    (r'^/api/v1/', 'api'),
+    (r'^/(app/)?blog', 'blog'),
+    (r'^/(app/)?projects', 'projects'),
+    (r'^/(app/)?(about|services|resume|sitemap)', 'pages'),
+    (r'^/(static|media|assets)/', 'assets'),
+    (r'^/(admin|wagtail|cms)/', 'admin'),
+)
+
+_compiled_route_groups = tuple(
+    (re.compile(pattern), group) for pattern, group in ROUTE_GROUPS
+)
+
+
+@lru_cache(maxsize=4096)
+def route_group(path: str) -> str:
+    """Name of the route group a request path is counted under."""
+    for pattern, group in _compiled_route_groups:
+        if pattern.match(path):
+            return group
+    return 'other'
+
+
+def _bucket_label(ms: float) -> str:
+    index = bisect_left(LATENCY_BUCKETS_MS, ms)
+    if index == len(LATENCY_BUCKETS_MS):
+        return 'inf'
+    return f'{LATENCY_BUCKETS_MS[index]:g}'
+
+
+class CacheMetrics:
+    """Per-process counter buffer merged into shared counters."""
+
+    def __init__(self, cache_backend=None, flush_interval: Optional[float] = None):
+        self._cache = cache_backend
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, float] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    @property
+    def cache(self):
+        return self._cache if self._cache is not None else cache
+
+    @property
+    def interval(self) -> float:
+        if self.flush_interval is not None:
+            return self.flush_interval
+        return getattr(settings, 'CACHE_METRICS_FLUSH_INTERVAL',
+                       DEFAULT_FLUSH_INTERVAL)
+
+    def _redis_client(self):
+        return get_redis_client(self.cache, 'Cache metrics')
+
+    # Recording
+
+    def incr(self, group: str, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._pending[f'{group}|{name}'] += amount
+        self._maybe_flush()
+
+    def observe(self, group: str, name: str, ms: float) -> None:
+        """Add a latency sample (milliseconds) to a histogram."""
+        prefix = f'{group}|{name}_ms'
+        with self._lock:
+            self._pending[f'{prefix}:le_{_bucket_label(ms)}'] += 1
+            self._pending[f'{prefix}:count'] += 1
+            self._pending[f'{prefix}:sum'] += round(ms, 3)
+        self._maybe_flush()
+
+    # Aggregation
+
+    def _maybe_flush(self) -> None:
+        if time.monotonic() - self._last_flush >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Merge this process's counters into the shared ones."""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(int)
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+
+        redis = self._redis_client()
+        if redis is not None:
+            pipe = redis.pipeline()
+            hash_key = self.cache.make_key(METRICS_KEY)
+            for field, amount in pending.items():
+                if isinstance(amount, int):
+                    pipe.hincrby(hash_key, field, amount)
+                else:
+                    pipe.hincrbyfloat(hash_key, field, amount)
+            pipe.execute()
+            return
+
+        with self._lock:
+            totals = self.cache.get(METRICS_KEY) or {}
+            for field, amount in pending.items():
+                totals[field] = totals.get(field, 0) + amount
+            self.cache.set(METRICS_KEY, totals, None)
+
+    def _read_totals(self) -> Dict[str, float]:
+        redis = self._redis_client()
+        if redis is None:
+            return dict(self.cache.get(METRICS_KEY) or {})
+
+        totals = {}
+        for field, value in redis.hgetall(self.cache.make_key(METRICS_KEY)).items():
+            field = field.decode() if isinstance(field, bytes) else field
+            value = float(value)
+            totals[field] = int(value) if value.is_integer() else value
+        return totals
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Flush, then return ``{group: {counter: value}}`` for all workers."""
+        self.flush()
+        groups: Dict[str, Dict[str, float]] = defaultdict(dict)
+        for field, value in self._read_totals().items():
+            group, _, name = field.partition('|')
+            groups[group][name] = value
+        return {group: dict(sorted(counters.items()))
+                for group, counters in sorted(groups.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._pending.clear()
+        self.cache.delete(METRICS_KEY)
+
+
+# Global metrics instance
+cache_metrics = CacheMetrics()
+
+
+def record_cache_event(path_or_group: str, name: str, amount: float = 1) -> None:
+    """Count a cache event for a request path (or an explicit group)."""
+    group = route_group(path_or_group) if path_or_group.startswith('/') \
+        else path_or_group
+    try:
+        cache_metrics.incr(group, name, amount)
+    except Exception as e:
+        # Metrics must never break the request being served
+        logger.warning(f"Failed to record cache metric {name}: {e}")
+
+
+def observe_cache_latency(path_or_group: str, name: str, ms: float) -> None:
+    """Record a latency sample for a request path (or an explicit group)."""
+    group = route_group(path_or_group) if path_or_group.startswith('/') \
+        else path_or_group
+    try:
+        cache_metrics.observe(group, name, ms)
+    except Exception as e:
+        logger.warning(f"Failed to record cache latency {name}: {e}")
+
+
+def histogram_summary(counters: Dict[str, float], name: str) -> Optional[str]:
+    """Render a ``<name>_ms`` histogram from a group's counters, if present."""
+    prefix = f'{name}_ms:'
+    count = counters.get(f'{prefix}count')
+    if not count:
+        return None
+
+    mean = counters.get(f'{prefix}sum', 0) / count
+    buckets = [
+        f'≤{label}:{int(counters[f"{prefix}le_{label}"])}'
+        for label in [f'{b:g}' for b in LATENCY_BUCKETS_MS] + ['inf']
+        if counters.get(f'{prefix}le_{label}')
+    ]
+    return f'{name}: n={int(count)} mean={mean:.1f}ms [{" ".join(buckets)}]'
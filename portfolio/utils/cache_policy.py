@@ -0,0 +1,201 @@
+"""
+Cache Policy - Per-Route and Per-Content-Type Page TTLs
+=======================================================
+
+Each cache strategy (``AGGRESSIVE``, ``BALANCED`` ...) defines a lifetime
+per TTL class (``static_ttl``, ``dynamic_ttl`` ...). Route groups (see
+``portfolio.utils.cache_metrics``) and content types are mapped onto those
+classes, and every combination is compiled into one lookup table, so the
+update-cache middleware resolves a response's TTL with a dict lookup.
+
+Content types outside HTML/plain text decide on their own (stylesheets are
+static, JSON is API data); pages take the TTL of their route group, so the
+about, services and resume pages live for hours while listings get minutes.
+
+The active strategy is stored in the shared cache by
+``cache_management strategy`` and picked up by every worker within
+``CACHE_POLICY_CHECK_INTERVAL`` seconds.
+"""
+
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+from portfolio.utils.cache_metrics import ROUTE_GROUPS, route_group
+
+logger = logging.getLogger(__name__)
+
+
+# Lifetimes (seconds) per TTL class for each strategy
+CACHE_STRATEGIES: Dict[str, Dict[str, int]] = {
+    'AGGRESSIVE': {
+        'default_ttl': 3600,  # 1 hour
+        'static_ttl': 86400,  # 24 hours
+        'dynamic_ttl': 300,   # 5 minutes
+        'api_ttl': 60,        # 1 minute
+    },
+    'BALANCED': {
+        'default_ttl': 1800,  # 30 minutes
+        'static_ttl': 43200,  # 12 hours
+        'dynamic_ttl': 600,   # 10 minutes
+        'api_ttl': 120,       # 2 minutes
+    },
+    'CONSERVATIVE': {
+        'default_ttl': 600,   # 10 minutes
+        'static_ttl': 21600,  # 6 hours
+        'dynamic_ttl': 300,   # 5 minutes
+        'api_ttl': 30,        # 30 seconds
+    },
+    'NO_CACHE': {
+        'default_ttl': 0,
+        'static_ttl': 0,
+        'dynamic_ttl': 0,
+        'api_ttl': 0,
+    }
+}
+
+# TTL class per content type (prefix match); None follows the route group
+CONTENT_TYPE_TTL: Dict[str, Optional[str]] = {
+    'text/html': None,
+    'text/plain': None,
+    'text/css': 'static_ttl',
+    'application/javascript': 'static_ttl',
+    'image/': 'static_ttl',
+    'application/json': 'api_ttl',
+}
+
+# TTL class per route group; groups not listed use 'default_ttl'
+ROUTE_GROUP_TTL: Dict[str, str] = {
+    'home': 'default_ttl',
+    'pages': 'static_ttl',
+    'blog': 'dynamic_ttl',
+    'projects': 'dynamic_ttl',
+    'api:blog': 'api_ttl',
+    'api:projects': 'api_ttl',
+    'api': 'api_ttl',
+    'assets': 'static_ttl',
+}
+
+# Shared cache entry naming the strategy every worker should use
+STRATEGY_KEY = 'cache_policy:strategy'
+
+# Seconds between checks of the shared strategy
+DEFAULT_CHECK_INTERVAL = 5.0
+
+
+def get_default_strategy() -> str:
+    return getattr(settings, 'CACHE_STRATEGY', 'BALANCED').upper()
+
+
+@lru_cache(maxsize=256)
+def content_family(content_type: str) -> str:
+    """The ``CONTENT_TYPE_TTL`` entry a Content-Type header falls under."""
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    for family in CONTENT_TYPE_TTL:
+        if media_type.startswith(family):
+            return family
+    return ''
+
+
+class CachePolicy:
+    """A strategy compiled into a (route group, content family) TTL table."""
+
+    def __init__(self, strategy: str):
+        self.strategy = strategy.upper()
+        if self.strategy not in CACHE_STRATEGIES:
+            raise ImproperlyConfigured(f"Invalid cache strategy: {strategy}")
+
+        self.config = CACHE_STRATEGIES[self.strategy]
+        groups = [group for _, group in ROUTE_GROUPS] + ['other']
+        families = list(CONTENT_TYPE_TTL) + ['']
+        self.table: Dict[Tuple[str, str], int] = {
+            (group, family): self._resolve(group, family)
+            for group in groups for family in families
+        }
+
+    def _resolve(self, group: str, family: str) -> int:
+        ttl_class = CONTENT_TYPE_TTL.get(family) or \
+            ROUTE_GROUP_TTL.get(group, 'default_ttl')
+        return self.config[ttl_class]
+
+    def ttl(self, path: str, content_type: str = '') -> int:
+        """Seconds a response for this path and content type may be cached."""
+        return self.table[(route_group(path), content_family(content_type))]
+
+    def route_ttls(self) -> Dict[str, int]:
+        """TTL of an HTML response per route group (for reporting)."""
+        return {
+            group: ttl for (group, family), ttl in self.table.items()
+            if family == 'text/html'
+        }
+
+
+class _ActivePolicy:
+    """Process-local copy of the shared strategy, refreshed periodically."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._policy: Optional[CachePolicy] = None
+        self._checked_at = 0.0
+
+    @property
+    def check_interval(self) -> float:
+        return getattr(settings, 'CACHE_POLICY_CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL)
+
+    def get(self) -> CachePolicy:
+        now = time.monotonic()
+        policy = self._policy
+        if policy is not None and now - self._checked_at < self.check_interval:
+            return policy
+
+        with self._lock:
+            self._checked_at = now
+            strategy = self._shared_strategy()
+            if policy is None or policy.strategy != strategy:
+                try:
+                    self._policy = CachePolicy(strategy)
+                except ImproperlyConfigured:
+                    logger.warning("Ignoring unknown cache strategy %r", strategy)
+                    self._policy = policy or CachePolicy(get_default_strategy())
+            return self._policy
+
+    def set(self, strategy: str) -> CachePolicy:
+        policy = CachePolicy(strategy)
+        cache.set(STRATEGY_KEY, policy.strategy, None)
+        with self._lock:
+            self._policy = policy
+            self._checked_at = time.monotonic()
+        return policy
+
+    def reset(self) -> None:
+        """Forget the shared strategy and return to ``CACHE_STRATEGY``."""
+        cache.delete(STRATEGY_KEY)
+        with self._lock:
+            self._policy = None
+
+    def _shared_strategy(self) -> str:
+        try:
+            strategy = cache.get(STRATEGY_KEY)
+        except Exception as e:
+            logger.warning("Could not read the shared cache strategy: %s", e)
+            strategy = None
+        return (strategy or get_default_strategy()).upper()
+
+
+active_policy = _ActivePolicy()
+
+
+def get_cache_policy() -> CachePolicy:
+    """The policy every worker currently applies."""
+    return active_policy.get()
+
+
+def set_active_strategy(strategy: str) -> CachePolicy:
+    """Switch every worker to a strategy (within the check interval)."""
+    return active_policy.set(strategy)
@@ -0,0 +1,325 @@
+"""
+Cache Tags - Surrogate Key Invalidation
+=======================================
+
+Every cached page or API response records the content tags it was built
+from (``post:<id>``, ``project:<slug>``, ``tag:<name>``, ``about`` ...).
+When a model changes, its signal handlers purge exactly the cache entries
+carrying the affected tags instead of waiting for TTLs to expire. They
+purge through ``invalidate_tags_on_commit`` so that a request racing the
+write cannot re-cache the pre-commit data under a fresh ETag.
+
+With django-redis the registry is kept in Redis sets, one per tag. Any
+other backend (LocMem in development and tests) stores a key -> expiry map
+per tag inside the cache itself, guarded by a process lock.
+"""
+
+import logging
+import re
+import threading
+import time
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_cache_key, get_max_age
+
+from portfolio.middlewares.page_cache import get_page_cache
+from portfolio.utils.cache_cookies import cookieless_key
+from portfolio.utils.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+# Prefix of the registry entries holding the cache keys of each tag
+TAG_KEY_PREFIX = 'cache_tags'
+
+# Prefix of the per-tag stamps recording when the tagged content last changed
+CONTENT_VERSION_PREFIX = 'content_version'
+
+# Section tags derived from the request path, so every page cached by the
+# middleware is purgeable even when its view declares no tags of its own
+PATH_TAGS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    (r'^/(app/)?$', ('blog', 'projects')),
+    (r'^/(app/)?blog', ('blog',)),
+    (r'^/(app/)?projects', ('projects',)),
+    (r'^/(app/)?about', ('about',)),
+    (r'^/(app/)?sitemap', ('blog', 'projects')),
+    (r'^/api/v1/blog/', ('blog',)),
+    (r'^/api/v1/projects/', ('projects',)),
+    (r'^/api/v1/about/', ('about',)),
+    (r'^/api/v1/sitemap/', ('blog', 'projects')),
+)
+
+_compiled_path_tags = tuple(
+    (re.compile(pattern), tags) for pattern, tags in PATH_TAGS
+)
+
+
+def post_tag(post) -> str:
+    """Tag of a single blog post (instance or primary key)."""
+    return f'post:{getattr(post, "pk", post)}'
+
+
+def project_tag(project) -> str:
+    """Tag of a single project."""
+    return f'project:{project.slug}'
+
+
+def topic_tag(name: str) -> str:
+    """Tag of a blog topic (taggit tag)."""
+    return f'tag:{str(name).lower()}'
+
+
+def add_cache_tags(request: HttpRequest, *tags: str) -> None:
+    """
+    Record content tags on the request for whichever cache stores the
+    response. Accepts both Django and DRF requests.
+    """
+    request = getattr(request, '_request', request)
+    existing = getattr(request, '_cache_tags', None)
+    if existing is None:
+        existing = set()
+        request._cache_tags = existing
+    existing.update(tag for tag in tags if tag)
+
+
+def get_cache_tags(request: HttpRequest) -> Set[str]:
+    """Return the tags recorded on the request plus its path tags."""
+    request = getattr(request, '_request', request)
+    tags = set(getattr(request, '_cache_tags', ()) or ())
+    tags.update(tags_for_path(request.path_info))
+    return tags
+
+
+def tags_for_path(path: str) -> Set[str]:
+    """Section tags implied by a request path."""
+    tags = set()
+    for pattern, path_tags in _compiled_path_tags:
+        if pattern.match(path):
+            tags.update(path_tags)
+    return tags
+
+
+class CacheTagRegistry:
+    """Maps content tags to the cache keys built from them."""
+
+    def __init__(self, cache_backend=None, page_cache_backend=None):
+        self._cache = cache_backend
+        self._page_cache = page_cache_backend
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return self._cache if self._cache is not None else cache
+
+    @property
+    def page_cache(self):
+        """Cache the tagged entries live in (purged through its L1 tier)."""
+        if self._page_cache is not None:
+            return self._page_cache
+        return self._cache if self._cache is not None else get_page_cache()
+
+    def _tag_key(self, tag: str) -> str:
+        return f'{TAG_KEY_PREFIX}:{tag}'
+
+    def _redis_client(self):
+        return get_redis_client(self.cache, 'Cache tag registry')
+
+    def register(self, key: str, tags: Iterable[str],
+                 timeout: Optional[int] = None) -> None:
+        """Associate a cache key with each of the given tags."""
+        tags = {tag for tag in tags if tag}
+        if not key or not tags:
+            return
+
+        redis = self._redis_client()
+        if redis is not None:
+            self._register_redis(redis, key, tags, timeout)
+        else:
+            self._register_local(key, tags, timeout)
+
+    def _register_redis(self, redis, key, tags, timeout):
+        pipe = redis.pipeline()
+        set_keys = [self.cache.make_key(self._tag_key(tag)) for tag in tags]
+        for set_key in set_keys:
+            pipe.sadd(set_key, key)
+            pipe.ttl(set_key)
+        results = pipe.execute()
+
+        # A tag set must outlive the longest-lived key registered in it;
+        # a TTL of -1 means the set was just created without an expiry
+        pipe = redis.pipeline()
+        for set_key, ttl in zip(set_keys, results[1::2]):
+            if timeout is None:
+                pipe.persist(set_key)
+            elif ttl == -1 or ttl < timeout:
+                pipe.expire(set_key, int(timeout))
+        pipe.execute()
+
+    def _register_local(self, key, tags, timeout):
+        now = time.time()
+        expires_at = now + timeout if timeout is not None else None
+
+        with self._lock:
+            for tag in tags:
+                tag_key = self._tag_key(tag)
+                entries: Dict[str, Optional[float]] = {
+                    k: exp for k, exp in
+                    (self.cache.get(tag_key) or {}).items()
+                    if exp is None or exp > now
+                }
+                previous = entries.get(key, 0)
+                if previous is None or expires_at is None:
+                    entries[key] = None
+                else:
+                    entries[key] = max(previous, expires_at)
+
+                expiries = list(entries.values())
+                set_timeout = None if None in expiries else \
+                    max(1, int(max(expiries) - now) + 1)
+                self.cache.set(tag_key, entries, set_timeout)
+
+    def keys_for(self, *tags: str) -> Set[str]:
+        """Return the cache keys currently registered under any tag."""
+        redis = self._redis_client()
+        keys: Set[str] = set()
+
+        if redis is not None:
+            for tag in tags:
+                set_key = self.cache.make_key(self._tag_key(tag))
+                keys.update(
+                    member.decode() if isinstance(member, bytes) else member
+                    for member in redis.smembers(set_key)
+                )
+            return keys
+
+        for tag in tags:
+            keys.update((self.cache.get(self._tag_key(tag)) or {}).keys())
+        return keys
+
+    def invalidate(self, *tags: str) -> int:
+        """Delete every cache entry carrying any of the tags."""
+        tags = tuple(tag for tag in tags if tag)
+        if not tags:
+            return 0
+
+        if self._redis_client() is None:
+            with self._lock:
+                keys = self.keys_for(*tags)
+                self.cache.delete_many(
+                    [self._tag_key(tag) for tag in tags]
+                )
+        else:
+            keys = self.keys_for(*tags)
+            self.cache.delete_many([self._tag_key(tag) for tag in tags])
+
+        if keys:
+            self.page_cache.delete_many(list(keys))
+
+        logger.debug(f"Invalidated {len(keys)} cache entries for {tags}")
+        return len(keys)
+
+
+# Global registry instance
+tag_registry = CacheTagRegistry()
+
+
+def register_cache_key(key: str, tags: Iterable[str],
+                       timeout: Optional[int] = None) -> None:
+    """Record that ``key`` was built from content carrying ``tags``."""
+    try:
+        tag_registry.register(key, tags, timeout)
+    except Exception as e:
+        # Tagging must never break the response being cached
+        logger.warning(f"Failed to register cache tags for {key}: {e}")
+
+
+def register_response_tags(request: HttpRequest, response: HttpResponse,
+                           key_prefix: Optional[str] = None,
+                           timeout: Optional[int] = None,
+                           tags: Iterable[str] = (),
+                           grace: int = 0,
+                           cache_backend=None) -> None:
+    """
+    Register the page-cache key of a response that a cache middleware (or
+    ``cache_page``) has just learned, under the request's content tags.
+    ``grace`` covers entries kept past their TTL to be served stale.
+    """
+    if request.method not in ('GET', 'HEAD') or response.status_code != 200:
+        return
+
+    # cache_page learns the key only once a lazy response is rendered
+    if not getattr(response, 'is_rendered', True):
+        response.add_post_render_callback(
+            lambda r: register_response_tags(
+                request, r, key_prefix, timeout, tags, grace, cache_backend
+            )
+        )
+        return
+
+    all_tags = get_cache_tags(request) | set(tags)
+    if not all_tags:
+        return
+
+    with cookieless_key(request):
+        key = get_cache_key(
+            request, key_prefix, request.method,
+            cache=cache_backend or get_page_cache()
+        )
+    if key is None:
+        return
+
+    max_age = get_max_age(response) or timeout
+    register_cache_key(
+        key, all_tags, max_age + grace if max_age is not None else None
+    )
+
+
+def content_versions(*tags: str) -> Dict[str, float]:
+    """
+    Return, per tag, the time its content last changed. Tags never purged
+    are stamped the first time they are asked for.
+    """
+    keys = {f'{CONTENT_VERSION_PREFIX}:{tag}': tag for tag in tags if tag}
+    stored = cache.get_many(list(keys))
+
+    versions = {}
+    for key, tag in keys.items():
+        if key not in stored:
+            now = time.time()
+            cache.add(key, now, None)
+            stored[key] = cache.get(key, now)
+        versions[tag] = stored[key]
+    return versions
+
+
+def bump_content_versions(*tags: str) -> None:
+    """Record that the content behind the tags has just changed."""
+    now = time.time()
+    cache.set_many(
+        {f'{CONTENT_VERSION_PREFIX}:{tag}': now for tag in tags if tag}, None
+    )
+
+
+def invalidate_tags(*tags: str) -> int:
+    """Purge all cache entries built from any of the given tags."""
+    try:
+        bump_content_versions(*tags)
+    except Exception as e:
+        logger.warning(f"Failed to bump content versions for {tags}: {e}")
+
+    try:
+        return tag_registry.invalidate(*tags)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate cache tags {tags}: {e}")
+        return 0
+
+
+def invalidate_tags_on_commit(*tags: str) -> None:
+    """
+    Purge the tags once the current transaction commits (at once outside
+    a transaction); nothing is purged if it rolls back.
+    """
+    transaction.on_commit(lambda: invalidate_tags(*tags))
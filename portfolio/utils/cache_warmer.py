@@ -0,0 +1,163 @@
+"""
+Cache Warmer - Pre-rendering Popular Pages
+==========================================
+
+Renders target URLs through the real Django request handler (via the test
+client, in-process) on a small thread pool. Every response passes through
+the installed cache middleware and ``cache_page`` decorators, so the pages
+land in exactly the keys that anonymous visitors are served from.
+
+Targets are discovered from the same data the sitemap is built from, with
+blog posts ranked by ``view_count`` so the hottest pages are warmed first.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connections
+from django.test import Client, RequestFactory
+from django.utils.cache import get_cache_key
+
+from portfolio.middlewares.page_cache import get_page_cache
+
+logger = logging.getLogger(__name__)
+
+
+# Identifies warm-up traffic; 'crawler' keeps it out of view counting
+WARMER_USER_AGENT = 'PortfolioCacheWarmer/1.0 (cache crawler)'
+
+DEFAULT_WORKERS = 4
+
+# Payloads and pages every visitor session starts from. The React shell
+# routes ('/', '/blog', ...) are served uncached, so only the API and the
+# server-rendered /app pages behind them are worth warming
+CORE_URLS = (
+    '/api/v1/blog/posts/',
+    '/api/v1/projects/list',
+    '/api/v1/about/',
+    '/api/v1/sitemap/',
+    '/app/',
+    '/app/about',
+    '/app/services',
+    '/app/projects',
+    '/app/blog/blog',
+)
+
+
+@dataclass
+class WarmResult:
+    """Outcome of warming a single URL."""
+
+    url: str
+    status_code: Optional[int] = None
+    render_ms: float = 0.0
+    cached: bool = False
+    error: str = ''
+
+    @property
+    def ok(self) -> bool:
+        return not self.error and self.status_code == 200
+
+
+def discover_warm_targets(limit: Optional[int] = None) -> List[str]:
+    """
+    Build the warm-up list from the sitemap data: core pages first, then
+    blog posts by descending ``view_count``, then live projects.
+    """
+    from app.models import Projects
+    from blog.models import BlogPostPage
+
+    urls = list(CORE_URLS)
+
+    posts = BlogPostPage.objects.live().order_by(
+        '-view_count', '-first_published_at'
+    ).values_list('slug', flat=True)
+    urls.extend(f'/app/blog/blog/article/{slug}' for slug in posts)
+
+    projects = Projects.objects.filter(live=True).order_by(
+        '-created_at'
+    ).values_list('slug', flat=True)
+    urls.extend(f'/app/projects/{slug}' for slug in projects)
+
+    # Preserve ranking while dropping duplicates
+    urls = list(dict.fromkeys(urls))
+    return urls[:limit] if limit else urls
+
+
+class CacheWarmer:
+    """Renders URLs in-process so the cache middleware stores them."""
+
+    def __init__(self, base_url: Optional[str] = None,
+                 workers: int = DEFAULT_WORKERS):
+        base_url = base_url or getattr(
+            settings, 'CACHE_WARM_BASE_URL',
+            getattr(settings, 'WAGTAILADMIN_BASE_URL', 'http://localhost')
+        )
+        parts = urlsplit(base_url)
+        self.host = parts.netloc or 'localhost'
+        self.secure = parts.scheme == 'https'
+        self.workers = max(1, workers)
+        self.results: List[WarmResult] = []
+
+    def _client_headers(self) -> dict:
+        headers = {
+            'HTTP_HOST': self.host,
+            'HTTP_USER_AGENT': WARMER_USER_AGENT,
+        }
+        if self.secure:
+            # Mirror what the TLS-terminating proxy sends in production
+            headers['HTTP_X_FORWARDED_PROTO'] = 'https'
+        return headers
+
+    def _is_cached(self, url: str) -> bool:
+        """Check both the middleware and the decorator key spaces."""
+        request = RequestFactory().get(
+            url, secure=self.secure, **self._client_headers()
+        )
+        cache = get_page_cache()
+        for key_prefix in (settings.CACHE_MIDDLEWARE_KEY_PREFIX, ''):
+            key = get_cache_key(request, key_prefix, 'GET', cache=cache)
+            if key and cache.get(key) is not None:
+                return True
+        return False
+
+    def warm_url(self, url: str) -> WarmResult:
+        """Render a single URL through the full middleware stack."""
+        result = WarmResult(url=url)
+
+        # A fresh, cookie-less client per URL: visitors without cookies
+        # are the ones served from the page cache
+        client = Client(raise_request_exception=False)
+        start = time.perf_counter()
+        try:
+            response = client.get(
+                url, secure=self.secure, **self._client_headers()
+            )
+            result.status_code = response.status_code
+        except Exception as e:
+            result.error = str(e)
+            logger.warning(f"Failed to warm cache for {url}: {e}")
+        result.render_ms = (time.perf_counter() - start) * 1000
+
+        if not result.error:
+            result.cached = self._is_cached(url)
+        return result
+
+    def _warm_in_worker(self, url: str) -> WarmResult:
+        try:
+            return self.warm_url(url)
+        finally:
+            # Pool threads must not leak their database connections
+            connections.close_all()
+
+    def warm(self, urls: Iterable[str]) -> List[WarmResult]:
+        """Warm all URLs on the thread pool, preserving input order."""
+        urls = list(urls)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            self.results = list(pool.map(self._warm_in_worker, urls))
+        return self.results
@@ -0,0 +1,83 @@
+"""
+Content Scanner - Single Pass Dynamic Content Detection
+=======================================================
+
+Finds form, captcha and session indicators in a response body in one
+forward pass over the raw bytes. The body is never decoded to text: it is
+walked in small overlapping windows that are lowercased while still hot in
+the CPU cache and probed with C-level substring search, stopping at the
+first indicator found. Memory overhead is bounded by the window size rather
+than by the size of the page.
+"""
+
+from typing import Iterable, Optional, Tuple
+
+from django.http import HttpResponse
+
+
+# Bytes of body examined per window; small enough to stay in L2 cache
+DEFAULT_WINDOW_SIZE = 16 * 1024
+
+
+class ContentScanner:
+    """
+    Multi-pattern, case-insensitive substring scanner over response bodies.
+
+    Indicators are matched literally, exactly like the previous
+    ``indicator in content`` checks. Indicators that contain another
+    indicator can never change the verdict and are pruned when the scanner
+    is built, so each window is probed with the smallest possible set.
+    """
+
+    def __init__(self, indicators: Iterable[str],
+                 window_size: int = DEFAULT_WINDOW_SIZE):
+        lowered = {indicator.lower() for indicator in indicators if indicator}
+        self.indicators: Tuple[str, ...] = tuple(sorted(
+            indicator for indicator in lowered
+            if not any(other != indicator and other in indicator
+                       for other in lowered)
+        ))
+        self._needles = tuple(
+            indicator.encode('utf-8') for indicator in self.indicators
+        )
+        # Consecutive windows overlap so no indicator can straddle a boundary
+        self._overlap = max((len(n) for n in self._needles), default=1) - 1
+        self.window_size = max(window_size, self._overlap + 1)
+
+    def find(self, content: bytes) -> Optional[str]:
+        """Return the first indicator found in the content, if any."""
+        if not self._needles or not content:
+            return None
+
+        length = len(content)
+        start = 0
+        while start < length:
+            window = content[
+                max(0, start - self._overlap):start + self.window_size
+            ].lower()
+            for needle, indicator in zip(self._needles, self.indicators):
+                if needle in window:
+                    return indicator
+            start += self.window_size
+
+        return None
+
+    def scan(self, content: bytes) -> bool:
+        """Return True if any indicator occurs in the content."""
+        return self.find(content) is not None
+
+    def scan_response(self, response: HttpResponse) -> bool:
+        """
+        Scan a response body without materialising a decoded copy.
+
+        Streaming responses are skipped: reading them would consume the
+        iterator, and Django never stores them in the page cache anyway.
+        """
+        if getattr(response, 'streaming', False):
+            return False
+
+        content = getattr(response, 'content', None)
+        if not content:
+            return False
+
+        return self.scan(content)
@@ -0,0 +1,235 @@
+"""
+Keyset (Cursor) Pagination
+==========================
+
+OFFSET/LIMIT pagination reads and discards every row before the requested
+page, and page numbers need a ``COUNT(*)`` on every request. Keyset
+pagination instead remembers the sort key of the last row served, e.g.
+``(first_published_at, id)``, and asks for the rows after it, so every page
+costs the same whatever its depth and no count is run.
+
+Cursors are opaque: the key values of the last row, signed so clients
+cannot forge or mix them across orderings. The trailing key must be unique
+(the primary key) to break ties. Nullable keys sort their NULLs last in
+either direction. Paging is forward-only, which is what infinite scrolling
+needs; ``estimate_count`` supplies an optional approximate total.
+
+Listings opt in per request: ``?cursor=`` (empty) asks for the first page
+in cursor mode, and every response carries the cursor of the next page.
+``KeysetOptInPagination`` adds this mode to DRF list views; views with
+hand-rolled pagination use ``KeysetPaginator`` directly.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import reduce
+from operator import or_
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.core import signing
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import F, Q, QuerySet
+from rest_framework.exceptions import ParseError
+from rest_framework.pagination import PageNumberPagination, replace_query_param
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+# Query parameter carrying the cursor; present (even empty) selects the mode
+CURSOR_PARAM = 'cursor'
+
+# Query parameter asking for an approximate total in cursor mode
+ESTIMATE_PARAM = 'estimate_total'
+
+# Salt of the signed cursors
+CURSOR_SALT = 'portfolio.keyset_pagination'
+
+# Seconds an exact count stands in for an estimate on non-PostgreSQL databases
+COUNT_CACHE_TIMEOUT = 60
+
+
+class InvalidCursor(ValueError):
+    """The cursor was tampered with or belongs to another ordering."""
+
+
+@dataclass
+class KeysetPage:
+    """A page of rows and the cursor of the next one"""
+    items: List[Any]
+    next_cursor: Optional[str]
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+def wants_cursor(params) -> bool:
+    """Whether the request opted into cursor pagination"""
+    return CURSOR_PARAM in params
+
+
+def wants_estimate(params) -> bool:
+    """Whether the request asked for an approximate total"""
+    return params.get(ESTIMATE_PARAM, '').lower() in ('1', 'true', 'yes')
+
+
+class KeysetPaginator:
+    """
+    Page a queryset on a unique composite key
+
+    Args:
+        queryset: Rows to page; its own ordering is replaced by the keys
+        keys: Field names in order, '-' prefixed for descending, ending
+            with a unique field such as ``'-id'``
+        page_size: Rows per page
+    """
+
+    def __init__(self, queryset: QuerySet, keys: Sequence[str], page_size: int):
+        self.queryset = queryset
+        self.keys: Tuple[Tuple[str, bool], ...] = tuple(
+            (key.lstrip('-'), key.startswith('-')) for key in keys
+        )
+        self.page_size = page_size
+        meta = queryset.model._meta
+        self.fields = [meta.get_field(name) for name, _ in self.keys]
+
+    def page(self, cursor: Optional[str] = None) -> KeysetPage:
+        """The page after ``cursor``, or the first page if it is empty"""
+        queryset = self.queryset.order_by(*self._ordering())
+        if cursor:
+            queryset = queryset.filter(self._after(self.decode(cursor)))
+
+        rows = list(queryset[:self.page_size + 1])
+        items = rows[:self.page_size]
+        next_cursor = (
+            self.encode(items[-1]) if len(rows) > self.page_size else None
+        )
+        return KeysetPage(items=items, next_cursor=next_cursor)
+
+    def encode(self, row) -> str:
+        """Opaque cursor pointing just past ``row``"""
+        values = []
+        for (name, _), field in zip(self.keys, self.fields):
+            value = row[name] if isinstance(row, dict) else getattr(row, field.attname)
+            if isinstance(value, (datetime, date)):
+                value = value.isoformat()
+            values.append(value)
+        return signing.dumps(
+            {'k': [name for name, _ in self.keys], 'v': values},
+            salt=CURSOR_SALT, compress=True,
+        )
+
+    def decode(self, cursor: str) -> List[Any]:
+        """Key values stored in ``cursor``"""
+        try:
+            data = signing.loads(cursor, salt=CURSOR_SALT)
+        except signing.BadSignature as e:
+            raise InvalidCursor('Invalid cursor') from e
+        if data.get('k') != [name for name, _ in self.keys]:
+            raise InvalidCursor('Cursor belongs to another ordering')
+
+        try:
+            return [
+                None if value is None else field.to_python(value)
+                for field, value in zip(self.fields, data['v'])
+            ]
+        except Exception as e:
+            raise InvalidCursor('Invalid cursor') from e
+
+    def _ordering(self):
+        ordering = []
+        for (name, descending), field in zip(self.keys, self.fields):
+            expression = F(name).desc(nulls_last=True) if descending \
+                else F(name).asc(nulls_last=True)
+            ordering.append(expression if field.null else f"{'-' if descending else ''}{name}")
+        return ordering
+
+    def _after(self, values: Sequence[Any]) -> Q:
+        """
+        Rows sorting after ``values``: lexicographic on the keys, NULLs last
+        """
+        branches, equal = [], Q()
+        for (name, descending), field, value in zip(self.keys, self.fields, values):
+            if value is None:
+                # Nothing sorts after a NULL on this key; ties continue
+                equal &= Q(**{f'{name}__isnull': True})
+                continue
+
+            after = Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+            if field.null:
+                after |= Q(**{f'{name}__isnull': True})
+            branches.append(equal & after)
+            equal &= Q(**{name: value})
+
+        if not branches:
+            return Q(pk__in=[])
+        return reduce(or_, branches)
+
+
+def estimate_count(queryset: QuerySet) -> int:
+    """
+    Approximate number of rows: the planner's estimate on PostgreSQL, an
+    exact count cached for ``COUNT_CACHE_TIMEOUT`` seconds elsewhere
+    """
+    if connections[queryset.db].vendor == 'postgresql':
+        try:
+            plan = json.loads(queryset.order_by().explain(format='json'))
+            return int(plan[0]['Plan']['Plan Rows'])
+        except Exception as e:
+            logger.warning(f"Failed to estimate count from the query plan: {e}")
+
+    sql = str(queryset.order_by().query)
+    key = f"keyset_count:{hashlib.md5(sql.encode()).hexdigest()}"
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, COUNT_CACHE_TIMEOUT)
+    return count
+
+
+class KeysetOptInPagination(PageNumberPagination):
+    """
+    Page numbers by default; keyset pagination on ``keyset_ordering`` when
+    the request carries ``?cursor=``. In cursor mode the requested
+    ordering is ignored and no count is run unless ``?estimate_total=1``.
+    """
+    keyset_ordering: Sequence[str] = ('-id',)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_page = None
+        if not wants_cursor(request.query_params):
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        paginator = KeysetPaginator(
+            queryset, self.keyset_ordering, self.get_page_size(request)
+        )
+        try:
+            self.keyset_page = paginator.page(request.query_params[CURSOR_PARAM])
+        except InvalidCursor as e:
+            raise ParseError(str(e))
+        self.estimated_count = (
+            estimate_count(queryset) if wants_estimate(request.query_params) else None
+        )
+        return self.keyset_page.items
+
+    def get_paginated_response(self, data):
+        if self.keyset_page is None:
+            return super().get_paginated_response(data)
+
+        next_cursor = self.keyset_page.next_cursor
+        body = {
+            'next': replace_query_param(
+                self.request.build_absolute_uri(), CURSOR_PARAM, next_cursor
+            ) if next_cursor else None,
+            'previous': None,
+            'next_cursor': next_cursor,
+            'results': data,
+        }
+        if self.estimated_count is not None:
+            body['estimated_count'] = self.estimated_count
+        return Response(body)
@@ -1,14 +1,93 @@
 """
 Unified Rate Limiting Utilities
 Provides centralized rate limiting functionality across the application
+
+Limits are enforced with a sliding-window counter: two integer counters per
+client (the current and previous fixed window), the previous one weighted by
+how much of it the sliding window still covers. Memory per client and work
+per check are constant however high the limit. With django-redis each check
+is one atomic Lua script; other backends use an equivalent locked path.
+
+Every limit that applies to a request (the global limit, ``ratelimit``
+decorators, auth limits, DRF throttles) is evaluated by the rate limiting
+middleware in one round trip. The decorators, throttles and ``RateLimiter``
+checks later in the request read that result instead of the cache.
+
+High limits (the global one) can opt into a per-worker ``LocalPrefilter``
+that admits most requests from local token buckets and adds them to the
+shared counter in batches, trading a bounded overshoot for fewer round trips.
 """
 import hashlib
+import logging
+import math
+import threading
 import time
-from typing import Any, Dict, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from django.conf import settings
 from django.core.cache import cache
 from django.http import HttpRequest
+from django.urls import Resolver404, resolve
+from django_ratelimit.exceptions import Ratelimited
+
+from portfolio.utils.redis_client import get_redis_client
+from portfolio.utils.user_agent_classifier import classify_request
+
+logger = logging.getLogger(__name__)
+
+
+# Evaluates several limits in one round trip. KEYS: a current/previous
+# window pair per limit. ARGV: previous window weight, limit and counter
+# TTL per limit. Counts are only incremented if no limit is exceeded.
+SLIDING_WINDOW_SCRIPT = """
+local counts = redis.call('MGET', unpack(KEYS))
+local limited = 0
+for i = 1, #KEYS / 2 do
+    local current = tonumber(counts[2 * i - 1] or '0')
+    local previous = tonumber(counts[2 * i] or '0')
+    counts[2 * i - 1] = current
+    counts[2 * i] = previous
+    if previous * tonumber(ARGV[3 * i - 2]) + current >= tonumber(ARGV[3 * i - 1]) then
+        limited = 1
+    end
+end
+if limited == 0 then
+    for i = 1, #KEYS / 2 do
+        counts[2 * i - 1] = redis.call('INCR', KEYS[2 * i - 1])
+        if counts[2 * i - 1] == 1 then
+            redis.call('EXPIRE', KEYS[2 * i - 1], ARGV[3 * i])
+        end
+    end
+end
+table.insert(counts, 1, limited)
+return counts
+"""
+
+# Adds locally admitted requests to the shared counters. KEYS: a
+# current/previous window pair per counter. ARGV: amount and counter TTL
+# per counter. Returns the counts after the increment.
+ADD_COUNTS_SCRIPT = """
+local counts = {}
+for i = 1, #KEYS / 2 do
+    local amount = tonumber(ARGV[2 * i - 1])
+    local current = redis.call('INCRBY', KEYS[2 * i - 1], amount)
+    if current == amount then
+        redis.call('EXPIRE', KEYS[2 * i - 1], ARGV[2 * i])
+    end
+    counts[2 * i - 1] = current
+    counts[2 * i] = tonumber(redis.call('GET', KEYS[2 * i]) or '0')
+end
+return counts
+"""
+
+# Units accepted in rates such as '30/m' (django-ratelimit / DRF style)
+RATE_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# Attribute the ratelimit decorator records its policies under
+RATE_POLICIES_ATTR = 'rate_limit_policies'
 
 
 class RateLimitExceeded(Exception):
@@ -16,6 +95,632 @@ class RateLimitExceeded(Exception):
     pass
 
 
+@dataclass
+class WindowState:
+    """Counters seen by one sliding-window check"""
+    limited: bool
+    current: int
+    previous: int
+    window_start: float
+    now: float
+    window: int
+    limit: int
+
+    @property
+    def weight(self) -> float:
+        """Share of the previous window still inside the sliding window"""
+        return 1 - (self.now - self.window_start) / self.window
+
+    @property
+    def estimate(self) -> float:
+        """Requests counted in the sliding window ending now"""
+        return self.previous * self.weight + self.current
+
+    @property
+    def reset_time(self) -> float:
+        """When the estimate next drops below the limit"""
+        if self.current >= self.limit:
+            # Only the next window's decay of this one can free a slot
+            return (self.window_start + self.window +
+                    self.window * (1 - self.limit / self.current))
+        if self.previous:
+            return (self.window_start + self.window *
+                    (1 - (self.limit - self.current) / self.previous))
+        return self.now
+
+
+@dataclass(frozen=True)
+class RateCheck:
+    """One counter to check: key, requests allowed and window length"""
+    key: str
+    limit: int
+    window: int
+
+
+class SlidingWindowStore:
+    """
+    Atomic sliding-window counters shared by every worker. Any number of
+    limits are checked (and, if none is exceeded, counted) in one round
+    trip: one Lua script with Redis, else one get_many/set_many.
+    """
+
+    _script = None
+    _add_script = None
+    _local_lock = threading.Lock()
+
+    def __init__(self, cache_backend=None):
+        self._cache = cache_backend
+
+    @property
+    def cache(self):
+        return self._cache if self._cache is not None else cache
+
+    def _redis_client(self):
+        return get_redis_client(self.cache, 'Rate limiter')
+
+    def evaluate(self, checks: List[RateCheck],
+                 now: Optional[float] = None) -> List[WindowState]:
+        """
+        Check every limit and count the request against all of them
+        unless one is exceeded
+
+        Args:
+            checks: Counters to check
+            now: Current time (defaults to time.time())
+
+        Returns:
+            A WindowState per check, in order
+        """
+        now = time.time() if now is None else now
+        states, keys = self._window_keys(checks, now)
+        if not checks:
+            return states
+
+        redis = self._redis_client()
+        if redis is not None:
+            try:
+                self._evaluate_redis(redis, keys, states)
+                return states
+            except Exception as e:
+                logger.warning(f"Rate limiter falling back from Redis: {e}")
+
+        self._evaluate_local(keys, states)
+        return states
+
+    def _window_keys(self, checks: List[RateCheck], now: float):
+        states = []
+        keys = []
+        for check in checks:
+            index = int(now // check.window)
+            states.append(WindowState(False, 0, 0, index * check.window, now,
+                                      check.window, check.limit))
+            keys += [f'{check.key}:{index}', f'{check.key}:{index - 1}']
+        return states, keys
+
+    def add_counts(self, entries: List[Tuple[RateCheck, int]],
+                   now: Optional[float] = None) -> List[WindowState]:
+        """
+        Add requests admitted elsewhere to the counters, without checking
+        the limits, in one round trip
+
+        Args:
+            entries: (counter, requests to add) pairs; 0 only reads
+            now: Current time (defaults to time.time())
+
+        Returns:
+            A WindowState per entry, after the addition
+        """
+        now = time.time() if now is None else now
+        states, keys = self._window_keys([check for check, _ in entries], now)
+        if not entries:
+            return states
+
+        redis = self._redis_client()
+        if redis is not None:
+            try:
+                if SlidingWindowStore._add_script is None:
+                    SlidingWindowStore._add_script = redis.register_script(
+                        ADD_COUNTS_SCRIPT
+                    )
+                args = []
+                for (check, amount) in entries:
+                    args += [amount, check.window * 2]
+                counts = SlidingWindowStore._add_script(
+                    keys=[self.cache.make_key(key) for key in keys],
+                    args=args,
+                    client=redis,
+                )
+                for i, state in enumerate(states):
+                    state.current = int(counts[2 * i])
+                    state.previous = int(counts[2 * i + 1])
+                return states
+            except Exception as e:
+                logger.warning(f"Rate limiter falling back from Redis: {e}")
+
+        with self._local_lock:
+            counts = self.cache.get_many(keys)
+            for i, (state, (_, amount)) in enumerate(zip(states, entries)):
+                state.current = counts.get(keys[2 * i], 0) + amount
+                state.previous = counts.get(keys[2 * i + 1], 0)
+            self.cache.set_many(
+                {keys[2 * i]: state.current for i, state in enumerate(states)},
+                max(state.window for state in states) * 2
+            )
+        return states
+
+    def _evaluate_redis(self, redis, keys, states: List[WindowState]) -> None:
+        if SlidingWindowStore._script is None:
+            SlidingWindowStore._script = redis.register_script(
+                SLIDING_WINDOW_SCRIPT
+            )
+        args = []
+        for state in states:
+            args += [state.weight, state.limit, state.window * 2]
+        counts = SlidingWindowStore._script(
+            keys=[self.cache.make_key(key) for key in keys],
+            args=args,
+            client=redis,
+        )
+        blocked = bool(counts[0])
+        for i, state in enumerate(states):
+            state.current = int(counts[2 * i + 1])
+            state.previous = int(counts[2 * i + 2])
+            # Blocked counts were not incremented: each limit's own verdict
+            state.limited = blocked and state.estimate >= state.limit
+
+    def _evaluate_local(self, keys, states: List[WindowState]) -> None:
+        # Check-then-increment must not interleave with other threads
+        with self._local_lock:
+            counts = self.cache.get_many(keys)
+            for i, state in enumerate(states):
+                state.current = counts.get(keys[2 * i], 0)
+                state.previous = counts.get(keys[2 * i + 1], 0)
+                state.limited = state.estimate >= state.limit
+            if any(state.limited for state in states):
+                return
+
+            for state in states:
+                state.current += 1
+            # The current window is read as the previous one next window
+            self.cache.set_many(
+                {keys[2 * i]: state.current for i, state in enumerate(states)},
+                max(state.window for state in states) * 2
+            )
+
+
+sliding_window_store = SlidingWindowStore()
+
+
+class _LocalBucket:
+    """A worker's view of one client: local tokens and unsynced requests"""
+
+    __slots__ = ('tokens', 'pending', 'synced', 'strict')
+
+    def __init__(self):
+        self.tokens = 0
+        self.pending = 0
+        self.synced: Optional[WindowState] = None
+        self.strict = False
+
+
+class LocalPrefilter:
+    """
+    Per-worker token buckets in front of a high shared limit.
+
+    Each client gets a local budget of ``batch`` requests, admitted without
+    contacting the shared store. When the budget is spent, the window rolls
+    over or ``sync_interval`` seconds pass, the requests admitted so far are
+    added to the shared counter (along with any other stale buckets, in one
+    round trip) and the budget is renewed. Clients whose shared count has
+    reached ``strict_ratio`` of the limit go back to strict remote checks.
+
+    Limits stay approximately correct: across N workers a client may exceed
+    the limit by at most N * batch requests, which the strict ratio keeps
+    well inside the headroom for limits of a thousand or more.
+    """
+
+    def __init__(self, batch: int = 50, sync_interval: float = 5.0,
+                 strict_ratio: float = 0.8, max_clients: int = 10000,
+                 store: Optional[SlidingWindowStore] = None):
+        self.batch = batch
+        self.sync_interval = sync_interval
+        self.strict_ratio = strict_ratio
+        self.max_clients = max_clients
+        self.store = store or sliding_window_store
+        self._lock = threading.Lock()
+        self._buckets: 'OrderedDict[RateCheck, _LocalBucket]' = OrderedDict()
+        # Unsynced requests of evicted buckets, added on the next sync
+        self._orphans: Dict[RateCheck, int] = {}
+
+    def _is_fresh(self, bucket: _LocalBucket, now: float) -> bool:
+        synced = bucket.synced
+        return (synced is not None and
+                now - synced.now < self.sync_interval and
+                int(now // synced.window) * synced.window == synced.window_start)
+
+    def allow(self, check: RateCheck,
+              now: Optional[float] = None) -> Optional[WindowState]:
+        """
+        Admit a request from the local budget
+
+        Returns:
+            Estimated WindowState if admitted locally, or None if the
+            caller must make a strict remote check (which counts it)
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            bucket = self._bucket(check)
+            if self._is_fresh(bucket, now):
+                if bucket.strict:
+                    return None
+                if bucket.tokens > 0:
+                    return self._consume(bucket, now)
+            entries = self._take_unsynced(now)
+            entries[check] = entries.get(check, 0) + bucket.pending
+            bucket.pending = 0
+
+        states = dict(zip(entries, self.store.add_counts(list(entries.items()), now)))
+
+        with self._lock:
+            for synced_check, state in states.items():
+                synced_bucket = self._buckets.get(synced_check)
+                if synced_bucket is not None:
+                    self._refresh(synced_bucket, state)
+            bucket = self._buckets.get(check)
+            if bucket is None or bucket.synced is None or \
+                    bucket.strict or bucket.tokens <= 0:
+                return None
+            return self._consume(bucket, now)
+
+    def _bucket(self, check: RateCheck) -> _LocalBucket:
+        bucket = self._buckets.get(check)
+        if bucket is None:
+            bucket = self._buckets[check] = _LocalBucket()
+            while len(self._buckets) > self.max_clients:
+                evicted, old = self._buckets.popitem(last=False)
+                if old.pending:
+                    self._orphans[evicted] = self._orphans.get(evicted, 0) + old.pending
+        else:
+            self._buckets.move_to_end(check)
+        return bucket
+
+    def _take_unsynced(self, now: float) -> Dict[RateCheck, int]:
+        """Unsynced requests of every stale bucket, moved out of them"""
+        entries, self._orphans = self._orphans, {}
+        for check, bucket in self._buckets.items():
+            if bucket.pending and not self._is_fresh(bucket, now):
+                entries[check] = entries.get(check, 0) + bucket.pending
+                bucket.pending = 0
+        return entries
+
+    def _refresh(self, bucket: _LocalBucket, state: WindowState) -> None:
+        bucket.synced = state
+        bucket.strict = state.estimate >= state.limit * self.strict_ratio
+        bucket.tokens = 0 if bucket.strict else self.batch
+
+    def _consume(self, bucket: _LocalBucket, now: float) -> WindowState:
+        bucket.tokens -= 1
+        bucket.pending += 1
+        synced = bucket.synced
+        return WindowState(False, synced.current + bucket.pending,
+                           synced.previous, synced.window_start, now,
+                           synced.window, synced.limit)
+
+    def flush(self, now: Optional[float] = None) -> None:
+        """Add every unsynced request to the shared counters"""
+        with self._lock:
+            entries, self._orphans = self._orphans, {}
+            for check, bucket in self._buckets.items():
+                if bucket.pending:
+                    entries[check] = entries.get(check, 0) + bucket.pending
+                    bucket.pending = 0
+        if entries:
+            self.store.add_counts(list(entries.items()), now)
+
+
+# Local pre-filters by policy (see RateLimiter and LOCAL_PREFILTER)
+_prefilters: Dict['RatePolicy', LocalPrefilter] = {}
+
+
+class SlidingWindowCounter:
+    """
+    Atomic sliding-window counter for a single limit
+    """
+
+    def __init__(self, limit: int, window: int, cache_backend=None):
+        """
+        Args:
+            limit: Requests allowed per window
+            window: Window length in seconds
+            cache_backend: Cache holding the counters (default cache)
+        """
+        self.limit = limit
+        self.window = window
+        self.store = (SlidingWindowStore(cache_backend) if cache_backend
+                      else sliding_window_store)
+
+    def hit(self, key: str, now: Optional[float] = None) -> WindowState:
+        """
+        Count a request against a key unless it is over the limit
+
+        Args:
+            key: Counter key for the client
+            now: Current time (defaults to time.time())
+
+        Returns:
+            WindowState of the check
+        """
+        return self.store.evaluate(
+            [RateCheck(key, self.limit, self.window)], now
+        )[0]
+
+
+def parse_rate(rate: str) -> Tuple[int, int]:
+    """
+    Parse a rate such as '30/m' or '100/hour'
+
+    Returns:
+        Tuple of (requests, window_seconds)
+    """
+    count, period = rate.split('/')
+    multiplier = ''.join(ch for ch in period if ch.isdigit()) or '1'
+    unit = period.lstrip('0123456789')[0].lower()
+    return int(count), int(multiplier) * RATE_UNITS[unit]
+
+
+def get_client_ip(request: HttpRequest) -> str:
+    """Client IP address (first X-Forwarded-For hop if present)"""
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        return x_forwarded_for.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _user_or_ip(request: HttpRequest) -> str:
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    return get_client_ip(request)
+
+
+def _anonymous_ip(request: HttpRequest) -> Optional[str]:
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return None
+    return get_client_ip(request)
+
+
+def _ip_and_agent(request: HttpRequest) -> str:
+    combined = f"{get_client_ip(request)}_{request.META.get('HTTP_USER_AGENT', '')}"
+    return hashlib.sha256(combined.encode()).hexdigest()
+
+
+# How each policy identifies a client; None means the policy does not apply
+CLIENT_KEYS: Dict[str, Callable[[HttpRequest], Optional[str]]] = {
+    'ip': get_client_ip,
+    'user': _user_or_ip,
+    'user_or_ip': _user_or_ip,
+    'anon': _anonymous_ip,
+    'ip_agent': _ip_and_agent,
+}
+
+
+@dataclass(frozen=True)
+class RatePolicy:
+    """
+    A limit that may apply to a request: the global limit, a view's
+    decorator, an auth limit or a DRF throttle scope
+    """
+    prefix: str
+    limit: int
+    window: int
+    key: str = 'ip'
+    methods: Optional[Tuple[str, ...]] = None
+    # Separates counters of views sharing a decorator rate
+    group: str = ''
+    # The client is only known once DRF has authenticated the request
+    api_identity: bool = False
+
+    @classmethod
+    def from_settings(cls, limit_type: str) -> 'RatePolicy':
+        """Policy for an entry of settings.RATE_LIMITING"""
+        config = settings.RATE_LIMITING.get(
+            limit_type, settings.RATE_LIMITING['GLOBAL']
+        )
+        return cls(
+            prefix=config['CACHE_KEY_PREFIX'],
+            limit=config['REQUESTS'],
+            window=config['WINDOW'],
+            key='ip_agent' if limit_type == 'BLOG_VIEW_COUNT' else 'ip',
+        )
+
+    def cache_key(self, request: HttpRequest, suffix: str = '') -> Optional[str]:
+        """Counter key for a request, or None if the policy does not apply"""
+        if self.methods is not None and request.method not in self.methods:
+            return None
+        identifier = CLIENT_KEYS[self.key](request)
+        if identifier is None:
+            return None
+        parts = [self.prefix, identifier, self.group, suffix]
+        return '_'.join(part for part in parts if part)
+
+    def check(self, key: str) -> RateCheck:
+        return RateCheck(key, self.limit, self.window)
+
+
+def get_prefilter(policy: RatePolicy) -> Optional[LocalPrefilter]:
+    return _prefilters.get(policy)
+
+
+def register_prefilter(policy: RatePolicy, options: Dict[str, Any]) -> LocalPrefilter:
+    """Put a per-worker pre-filter in front of a policy (once per process)"""
+    prefilter = _prefilters.get(policy)
+    if prefilter is None:
+        prefilter = _prefilters.setdefault(policy, LocalPrefilter(
+            batch=options.get('BATCH', 50),
+            sync_interval=options.get('SYNC_INTERVAL', 5.0),
+            strict_ratio=options.get('STRICT_RATIO', 0.8),
+            max_clients=options.get('MAX_CLIENTS', 10000),
+        ))
+    return prefilter
+
+
+def _admit_locally(request: HttpRequest, policy: RatePolicy, key: str) -> bool:
+    """Admit a request from a policy's local pre-filter, if it has one"""
+    prefilter = _prefilters.get(policy)
+    if prefilter is None:
+        return False
+    states = _request_states(request)
+    if key in states:
+        return True
+    state = prefilter.allow(policy.check(key))
+    if state is None:
+        return False
+    states[key] = state
+    return True
+
+
+def _request_states(request: HttpRequest) -> Dict[str, WindowState]:
+    """Limits already evaluated for a request, by counter key"""
+    request = getattr(request, '_request', request)
+    states = getattr(request, '_rate_limit_states', None)
+    if states is None:
+        states = request._rate_limit_states = {}
+    return states
+
+
+def evaluate_checks(request: HttpRequest,
+                    checks: List[RateCheck]) -> Dict[str, WindowState]:
+    """
+    Evaluate the limits not yet evaluated for this request in one round
+    trip; each counter is checked (and counted) at most once per request
+    """
+    states = _request_states(request)
+    pending = {check.key: check for check in checks if check.key not in states}
+    if pending:
+        results = sliding_window_store.evaluate(list(pending.values()))
+        states.update(zip(pending, results))
+    return states
+
+
+def check_policy(request: HttpRequest, policy: RatePolicy,
+                 suffix: str = '') -> Optional[WindowState]:
+    """
+    State of one policy for a request, evaluated up front by the rate
+    limiting middleware when possible
+
+    Returns:
+        WindowState, or None if the policy does not apply to the request
+    """
+    key = policy.cache_key(request, suffix)
+    if key is None:
+        return None
+    if _admit_locally(request, policy, key):
+        return _request_states(request)[key]
+    return evaluate_checks(request, [policy.check(key)])[key]
+
+
+def _view_class(view_func: Callable):
+    return (getattr(view_func, 'view_class', None) or
+            getattr(view_func, 'cls', None))
+
+
+def view_name(view_func: Callable) -> str:
+    """Stable name of a resolved view, grouping its decorator counters"""
+    view = _view_class(view_func) or view_func
+    return f'{view.__module__}.{view.__qualname__}'
+
+
+@lru_cache(maxsize=1024)
+def _view_policies(view_func: Callable) -> Tuple[RatePolicy, ...]:
+    decorated = list(getattr(view_func, RATE_POLICIES_ATTR, ()))
+    policies = []
+
+    view_class = _view_class(view_func)
+    if view_class is not None:
+        for name in ('dispatch', 'get', 'post', 'put', 'patch', 'delete'):
+            method = getattr(view_class, name, None)
+            decorated += getattr(method, RATE_POLICIES_ATTR, ())
+        for limit_type in getattr(view_class, 'rate_limit_types', ()):
+            policies.append(RatePolicy.from_settings(limit_type))
+        for throttle in getattr(view_class, 'throttle_classes', ()):
+            get_policy = getattr(throttle, 'get_rate_policy', None)
+            policy = get_policy() if get_policy else None
+            if policy is not None:
+                policies.append(policy)
+
+    group = view_name(view_func)
+    return tuple(replace(policy, group=group) for policy in decorated) + \
+        tuple(policies)
+
+
+def get_view_policies(request: HttpRequest) -> Tuple[RatePolicy, ...]:
+    """Policies declared by the view a request resolves to"""
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return ()
+    return _view_policies(match.func)
+
+
+def evaluate_request_limits(request: HttpRequest,
+                            *policies: RatePolicy) -> Dict[str, WindowState]:
+    """
+    Evaluate the given policies and every policy of the request's view in
+    a single round trip, so later checks (decorators, throttles, auth
+    limits) read their result instead of going back to the cache
+    """
+    has_credentials = bool(request.META.get('HTTP_AUTHORIZATION'))
+    checks = []
+    for policy in policies + get_view_policies(request):
+        # DRF may authenticate a different user than the session did
+        if policy.api_identity and has_credentials:
+            continue
+        key = policy.cache_key(request)
+        if key is not None and not _admit_locally(request, policy, key):
+            checks.append(policy.check(key))
+    return evaluate_checks(request, checks)
+
+
+def ratelimit(key: str = 'ip', rate: str = None, method=None,
+              block: bool = True):
+    """
+    Drop-in for django_ratelimit's ``ratelimit`` decorator backed by the
+    unified sliding-window limiter. The policy is also recorded on the
+    view, so the rate limiting middleware evaluates it up front with the
+    other limits of the request.
+    """
+    limit, window = parse_rate(rate)
+    if isinstance(method, str):
+        method = (method,)
+    policy = RatePolicy(
+        prefix=f'ratelimit_{key}_{limit}_{window}',
+        limit=limit,
+        window=window,
+        key=key,
+        methods=tuple(method) if method else None,
+    )
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            # Counters are grouped by the view the URL resolved to
+            match = getattr(request, 'resolver_match', None)
+            group = view_name(match.func) if match else view_name(view_func)
+            state = check_policy(request, replace(policy, group=group))
+            request.limited = getattr(request, 'limited', False) or \
+                bool(state and state.limited)
+            if request.limited and block:
+                raise Ratelimited()
+            return view_func(request, *args, **kwargs)
+
+        setattr(wrapper, RATE_POLICIES_ATTR,
+                getattr(view_func, RATE_POLICIES_ATTR, ()) + (policy,))
+        return wrapper
+
+    return decorator
+
+
 class RateLimiter:
     """
     Unified rate limiting class that provides various rate limiting strategies
@@ -32,6 +737,12 @@ class RateLimiter:
             limit_type, settings.RATE_LIMITING['GLOBAL']
         )
         self.limit_type = limit_type
+        self.policy = RatePolicy.from_settings(limit_type)
+
+        # Optional per-worker token buckets in front of the shared counter
+        prefilter_options = self.config.get('LOCAL_PREFILTER')
+        if prefilter_options:
+            register_prefilter(self.policy, prefilter_options)
 
     def get_client_identifier(self, request: HttpRequest) -> str:
         """
@@ -43,21 +754,8 @@ class RateLimiter:
         Returns:
             Unique client identifier string
         """
-        # Get client IP address
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0].strip()
-        else:
-            ip = request.META.get('REMOTE_ADDR', '')
-
-        # For some rate limiting, include user agent for better uniqueness
-        if self.limit_type == 'BLOG_VIEW_COUNT':
-            user_agent = request.META.get('HTTP_USER_AGENT', '')
-            combined = f"{ip}_{user_agent}"
-            identifier = hashlib.sha256(combined.encode()).hexdigest()
-            return identifier
-
-        return ip
+        # The IP, hashed with the user agent for view count limiting
+        return CLIENT_KEYS[self.policy.key](request)
 
     def get_cache_key(self, identifier: str, suffix: str = '') -> str:
         """
@@ -87,39 +785,28 @@ class RateLimiter:
         Returns:
             Tuple of (is_limited, info_dict)
         """
-        identifier = self.get_client_identifier(request)
-        cache_key = self.get_cache_key(identifier, suffix)
-
-        current_time = time.time()
         window = self.config['WINDOW']
         max_requests = self.config['REQUESTS']
 
-        # Get existing requests from cache
-        requests = cache.get(cache_key, [])
-
-        # Remove requests outside the current window
-        requests = [req_time for req_time in requests
-                    if (current_time - req_time) < window]
+        # Usually already evaluated by the rate limiting middleware
+        state = check_policy(request, self.policy, suffix)
+        requests_made = math.ceil(state.estimate)
 
         # Check if limit exceeded
-        if len(requests) >= max_requests:
+        if state.limited:
             return True, {
-                'requests_made': len(requests),
+                'requests_made': requests_made,
                 'max_requests': max_requests,
                 'window': window,
-                'reset_time': requests[0] + window if requests
-                else current_time
+                'reset_time': state.reset_time,
+                'current_time': state.now,
             }
 
-        # Add current request and update cache
-        requests.append(current_time)
-        cache.set(cache_key, requests, window)
-
         return False, {
-            'requests_made': len(requests),
+            'requests_made': requests_made,
             'max_requests': max_requests,
             'window': window,
-            'remaining': max_requests - len(requests)
+            'remaining': max(max_requests - requests_made, 0)
         }
 
     def is_bot_request(self, request: HttpRequest) -> bool:
@@ -132,26 +819,7 @@ class RateLimiter:
         Returns:
             True if request appears to be from a bot
         """
-        user_agent = request.META.get('HTTP_USER_AGENT', '').lower()
-        bot_config = settings.RATE_LIMITING['BOT_DETECTION']
-
-        # Check for legitimate search engines (allow these)
-        for legitimate_bot in bot_config['LEGITIMATE_BOTS']:
-            if legitimate_bot in user_agent:
-                return False
-
-        # Check for suspicious bot patterns
-        for pattern in bot_config['SUSPICIOUS_PATTERNS']:
-            if pattern in user_agent:
-                return True
-
-        # Check for missing or very short user agent
-        _agent_len = len(user_agent)
-        bot_conf_len = bot_config['MIN_USER_AGENT_LENGTH']
-        if (not user_agent or _agent_len < bot_conf_len):
-            return True
-
-        return False
+        return classify_request(request).is_suspicious
 
 
 class SessionBasedRateLimiter:
@@ -238,8 +906,8 @@ def can_increment_view_count(request: HttpRequest,
     Check if view count can be incremented for a post
     Combines both rate limiting and session tracking
     """
-    # Check bot detection first
-    if is_bot_request(request):
+    # Crawlers (allowed or not) never count as views
+    if classify_request(request).is_automated:
         return False
 
     # Check rate limiting
@@ -0,0 +1,30 @@
+"""
+Redis Client - Raw Access to a django-redis Cache
+=================================================
+
+Shared state (cache tags, metrics, rate-limit windows, view buffers,
+HyperLogLogs) uses Redis commands directly when the cache is django-redis,
+and falls back to plain cache operations on every other backend.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def get_redis_client(cache_backend, component: str):
+    """
+    Return the raw django-redis client behind a cache backend
+
+    Returns:
+        The write client, or None for other backends (or when Redis cannot
+        be reached, logged as ``component`` falling back)
+    """
+    client = getattr(cache_backend, 'client', None)
+    if client is None or not hasattr(client, 'get_client'):
+        return None
+    try:
+        return client.get_client(write=True)
+    except Exception as e:
+        logger.warning(f"{component} falling back from Redis: {e}")
+        return None
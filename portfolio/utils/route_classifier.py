@@ -0,0 +1,148 @@
+"""
+Route Classifier - Compiled Cache Exclusion Matching
+====================================================
+
+Builds the intelligent cache URL exclusion rules into a single compiled
+matcher once per process. Verdicts are memoised per path in a bounded LRU,
+so repeated requests for the same route cost a dictionary lookup instead of
+dozens of regular expression calls.
+"""
+
+import re
+import threading
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple
+
+
+# URL patterns that should NEVER be cached
+EXCLUDED_URL_PATTERNS: Tuple[str, ...] = (
+    # Authentication endpoints
+    r'^/login/?$',
+    r'^/signup/?$',
+    r'^/register/?$',
+    r'^/logout/?$',
+    r'^/password-reset/?$',
+    r'^/password-reset/confirm/?$',
+    r'^/auth/',
+
+    # Form endpoints
+    r'^/contact/?$',
+    r'^/contact/submit/?$',
+    r'^/message/?$',
+    r'^/inbox/?$',
+    r'^/inbox/.+/?$',
+
+    # Captcha endpoints
+    r'^/captcha/',
+    r'^/refresh-captcha/?$',
+    r'^/api/captcha/',
+
+    # Admin and management
+    r'^/admin/',
+    r'^/wagtail/',
+    r'^/api/admin/',
+
+    # Dynamic content creation/editing
+    r'^/blog/article/new/?$',
+    r'^/blog/article/.+/edit/?$',
+    r'^/blog/article/.+/update/?$',
+    r'^/blog/article/.+/delete/?$',
+    r'^/projects/new/?$',
+    r'^/projects/.+/edit/?$',
+    r'^/projects/.+/update/?$',
+    r'^/projects/.+/delete/?$',
+    r'^/about/edit/?$',
+    r'^/profile/edit/?$',
+
+    # API endpoints with forms or dynamic content
+    r'^/api/v1/auth/',
+    r'^/api/v1/login/',
+    r'^/api/v1/register/',
+    r'^/api/v1/contact/',
+    r'^/api/v1/messages/',
+    r'^/api/v1/captcha/',
+    r'^/api/v1/blog/article/(create|new)/?$',
+    r'^/api/v1/blog/article/.+/(update|delete)/?$',
+    r'^/api/v1/projects/(create|new)/?$',
+    r'^/api/v1/projects/.+/(update|delete)/?$',
+
+    # Session management
+    r'^/session/?$',
+    r'^/api/session/',
+
+    # Search with dynamic results
+    r'^/search/?$',
+    r'^/api/search/',
+
+    # Comments and interactions
+    r'^/comments/',
+    r'^/api/comments/',
+    r'^/blog/.+/comment/?$',
+
+    # User-specific content
+    r'^/dashboard/?$',
+    r'^/profile/?$',
+    r'^/account/?$',
+
+    # File uploads
+    r'^/upload/',
+    r'^/api/upload/',
+    r'^/media/upload/',
+
+    # CSRF and security
+    r'^/csrf/',
+    r'^/api/csrf/',
+)
+
+# Number of distinct paths whose verdicts are remembered per process
+DEFAULT_LRU_SIZE = 4096
+
+
+class RouteClassifier:
+    """
+    Classifies request paths against the cache exclusion rules.
+
+    All patterns are merged into one case-insensitive alternation, compiled
+    once, and every verdict is memoised in a bounded LRU keyed by path.
+    """
+
+    def __init__(self, patterns: Iterable[str] = EXCLUDED_URL_PATTERNS,
+                 maxsize: int = DEFAULT_LRU_SIZE):
+        self.patterns = tuple(patterns)
+        self._matcher = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in self.patterns),
+            re.IGNORECASE
+        ) if self.patterns else None
+        self._is_excluded = lru_cache(maxsize=maxsize)(self._match)
+
+    def _match(self, path: str) -> bool:
+        """Run the compiled matcher against a path (uncached)."""
+        if self._matcher is None:
+            return False
+        return self._matcher.match(path) is not None
+
+    def is_excluded(self, path: str) -> bool:
+        """Return True if the path must never be served from the cache."""
+        return self._is_excluded(path)
+
+    def cache_info(self):
+        """Expose LRU hit/miss counters for diagnostics."""
+        return self._is_excluded.cache_info()
+
+    def clear(self):
+        """Forget all memoised verdicts."""
+        self._is_excluded.cache_clear()
+
+
+_classifier: Optional[RouteClassifier] = None
+_classifier_lock = threading.Lock()
+
+
+def get_route_classifier() -> RouteClassifier:
+    """Return the process-wide classifier, building it on first use."""
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                _classifier = RouteClassifier()
+    return _classifier
@@ -0,0 +1,61 @@
+"""
+DRF Throttles Backed by the Unified Rate Limiter
+Drop-in replacements for DRF's anon/user throttles whose counters live in
+the sliding-window store, so the rate limiting middleware can evaluate them
+together with the other limits of a request in one round trip.
+"""
+from typing import Optional
+
+from rest_framework import throttling
+
+from portfolio.utils.rate_limiting import RatePolicy, check_policy, parse_rate
+
+
+class ConsolidatedThrottleMixin:
+    """
+    Throttle adapter over ``check_policy``; ``policy_key`` names how the
+    client is identified (see rate_limiting.CLIENT_KEYS)
+    """
+
+    policy_key = 'user'
+
+    @classmethod
+    def get_rate_policy(cls) -> Optional[RatePolicy]:
+        """Policy for the throttle's scope, or None if it has no rate"""
+        rate = cls.THROTTLE_RATES.get(cls.scope)
+        if rate is None:
+            return None
+        limit, window = parse_rate(rate)
+        return RatePolicy(
+            prefix=f'throttle_{cls.scope}',
+            limit=limit,
+            window=window,
+            key=cls.policy_key,
+            api_identity=True,
+        )
+
+    def allow_request(self, request, view):
+        policy = self.get_rate_policy()
+        if policy is None:
+            return True
+
+        self.state = check_policy(request, policy)
+        return self.state is None or not self.state.limited
+
+    def wait(self):
+        state = getattr(self, 'state', None)
+        if state is None or not state.limited:
+            return None
+        return max(state.reset_time - state.now, 0)
+
+
+class AnonRateThrottle(ConsolidatedThrottleMixin, throttling.AnonRateThrottle):
+    """Limits anonymous clients by IP"""
+
+    policy_key = 'anon'
+
+
+class UserRateThrottle(ConsolidatedThrottleMixin, throttling.UserRateThrottle):
+    """Limits authenticated users by id and anonymous clients by IP"""
+
+    policy_key = 'user'
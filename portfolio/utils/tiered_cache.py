@@ -0,0 +1,240 @@
+"""
+Tiered Cache - In-Process L1 over a Shared L2
+=============================================
+
+A Django cache backend that keeps a small, bounded, TTL-aware LRU inside
+each worker process (L1) in front of another configured cache (L2, Redis
+in production). Hot page-cache entries are then served without a network
+round trip.
+
+Only keys matching ``L1_KEY_PREFIXES`` (the page cache by default) are held
+in L1; everything else passes straight through to L2. Workers stay
+coherent through a generation token stored in L2: every delete or clear
+replaces the token, and each worker re-reads it at most once per
+``GENERATION_CHECK_INTERVAL`` seconds, dropping its L1 when it changes.
+Overwrites are bounded by ``L1_TIMEOUT``, and entries stamped with a
+freshness deadline by the page cache are never held in L1 past it.
+
+Example::
+
+    CACHES = {
+        'default': {...},  # Redis
+        'pages': {
+            'BACKEND': 'portfolio.utils.tiered_cache.TieredCache',
+            'LOCATION': 'default',  # alias of the L2 cache
+            'OPTIONS': {'L1_MAX_ENTRIES': 512, 'L1_TIMEOUT': 10},
+        },
+    }
+"""
+
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+from portfolio.utils.cache_metrics import record_cache_event
+
+
+GENERATION_KEY = 'tiered_cache:generation'
+
+_MISSING = object()
+
+
+class TieredCache(BaseCache):
+    """Bounded in-process LRU in front of another Django cache."""
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._l2_alias = location or 'default'
+        self.l1_max_entries = int(options.get('L1_MAX_ENTRIES', 512))
+        self.l1_timeout = float(options.get('L1_TIMEOUT', 10))
+        self.generation_check_interval = float(
+            options.get('GENERATION_CHECK_INTERVAL', 1.0)
+        )
+        self.l1_key_prefixes: Tuple[str, ...] = tuple(
+            options.get('L1_KEY_PREFIXES', ('views.decorators.cache.',))
+        )
+
+        self._l1: 'OrderedDict[str, Tuple[float, bytes]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation: Optional[str] = None
+        self._generation_checked = 0.0
+
+    @property
+    def l2(self) -> BaseCache:
+        return caches[self._l2_alias]
+
+    # L1 bookkeeping
+
+    def _l1_eligible(self, key: str) -> bool:
+        return key.startswith(self.l1_key_prefixes)
+
+    def _sync_generation(self) -> None:
+        """Drop L1 if another worker deleted something since we last looked."""
+        now = time.monotonic()
+        if now - self._generation_checked < self.generation_check_interval:
+            return
+
+        generation = self.l2.get(GENERATION_KEY)
+        if generation is None:
+            generation = uuid.uuid4().hex
+            if not self.l2.add(GENERATION_KEY, generation, None):
+                generation = self.l2.get(GENERATION_KEY, generation)
+
+        with self._lock:
+            if generation != self._generation:
+                self._l1.clear()
+                self._generation = generation
+            self._generation_checked = now
+
+    def _bump_generation(self) -> None:
+        """Invalidate every worker's L1 (ours immediately)."""
+        generation = uuid.uuid4().hex
+        self.l2.set(GENERATION_KEY, generation, None)
+        with self._lock:
+            self._l1.clear()
+            self._generation = generation
+            self._generation_checked = time.monotonic()
+
+    def _l1_get(self, l1_key: str) -> Any:
+        with self._lock:
+            entry = self._l1.get(l1_key)
+            if entry is None:
+                return _MISSING
+            expires_at, payload = entry
+            if expires_at <= time.time():
+                del self._l1[l1_key]
+                return _MISSING
+            self._l1.move_to_end(l1_key)
+        # Unpickle a private copy: callers mutate cached responses
+        return pickle.loads(payload)
+
+    def _l1_set(self, l1_key: str, value: Any, timeout=DEFAULT_TIMEOUT) -> None:
+        expires_at = time.time() + self.l1_timeout
+        backend_expiry = self.get_backend_timeout(timeout)
+        if backend_expiry is not None:
+            expires_at = min(expires_at, backend_expiry)
+
+        # Never keep a page in L1 past the moment it turns stale
+        fresh_until = getattr(value, '_cache_fresh_until', None)
+        if fresh_until is not None:
+            expires_at = min(expires_at, fresh_until)
+
+        if expires_at <= time.time():
+            self._l1_discard(l1_key)
+            return
+
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        evicted = 0
+        with self._lock:
+            self._l1[l1_key] = (expires_at, payload)
+            self._l1.move_to_end(l1_key)
+            while len(self._l1) > self.l1_max_entries:
+                self._l1.popitem(last=False)
+                evicted += 1
+        if evicted:
+            record_cache_event('l1', 'evictions', evicted)
+
+    def _l1_discard(self, l1_key: str) -> None:
+        with self._lock:
+            self._l1.pop(l1_key, None)
+
+    # Cache API
+
+    def get(self, key, default=None, version=None):
+        if not self._l1_eligible(key):
+            return self.l2.get(key, default, version=version)
+
+        self._sync_generation()
+        l1_key = self.make_and_validate_key(key, version=version)
+        value = self._l1_get(l1_key)
+        if value is not _MISSING:
+            record_cache_event('l1', 'hits')
+            return value
+
+        record_cache_event('l1', 'misses')
+        value = self.l2.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            return default
+        self._l1_set(l1_key, value)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l2.set(key, value, timeout, version=version)
+        if self._l1_eligible(key):
+            self._sync_generation()
+            self._l1_set(self.make_and_validate_key(key, version=version),
+                         value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.l2.add(key, value, timeout, version=version)
+        if added and self._l1_eligible(key):
+            self._sync_generation()
+            self._l1_set(self.make_and_validate_key(key, version=version),
+                         value, timeout)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        if self._l1_eligible(key):
+            self._l1_discard(self.make_and_validate_key(key, version=version))
+        return self.l2.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        deleted = self.l2.delete(key, version=version)
+        if self._l1_eligible(key):
+            self._bump_generation()
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        self.l2.delete_many(keys, version=version)
+        if any(self._l1_eligible(key) for key in keys):
+            self._bump_generation()
+
+    def has_key(self, key, version=None):
+        if self._l1_eligible(key):
+            self._sync_generation()
+            l1_key = self.make_and_validate_key(key, version=version)
+            if self._l1_get(l1_key) is not _MISSING:
+                return True
+        return self.l2.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        value = self.l2.incr(key, delta, version=version)
+        if self._l1_eligible(key):
+            self._l1_discard(self.make_and_validate_key(key, version=version))
+        return value
+
+    def clear(self):
+        self.l2.clear()
+        self._bump_generation()
+
+    def __getattr__(self, name):
+        # Backend extras (django-redis ``client``, ``delete_pattern``) are L2's
+        if name.startswith('_'):
+            raise AttributeError(name)
+        attr = getattr(self.l2, name)
+        if name != 'delete_pattern':
+            return attr
+
+        def delete_pattern(*args, **kwargs):
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                self._bump_generation()
+        return delete_pattern
+
+    def l1_info(self) -> dict:
+        """Current L1 occupancy, for diagnostics."""
+        with self._lock:
+            return {
+                'entries': len(self._l1),
+                'max_entries': self.l1_max_entries,
+                'generation': self._generation,
+            }
@@ -0,0 +1,160 @@
+"""
+User-Agent Classifier - Compiled Bot and Device Detection
+=========================================================
+
+Builds the bot detection rules in ``settings.RATE_LIMITING['BOT_DETECTION']``
+into compiled matchers once per process. Each user agent string is
+classified into a structured verdict (legitimate crawler, self-declared bot,
+suspicious client or browser, plus a device class) and verdicts are memoised
+in a bounded LRU, so bot checks on hot paths cost a dictionary lookup
+instead of a scan over every configured pattern.
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Pattern
+
+from django.conf import settings
+from django.http import HttpRequest
+
+
+# Markers of self-declared automated clients that are not otherwise listed
+DEFAULT_BOT_MARKERS = ('bot', 'crawler', 'spider')
+
+# Device markers, checked in order (tablets first: iPad UAs say "Mobile")
+DEVICE_MARKERS = (
+    ('tablet', ('ipad', 'tablet')),
+    ('mobile', ('mobile', 'android', 'iphone')),
+)
+
+# Number of distinct user agents whose verdicts are remembered per process
+DEFAULT_LRU_SIZE = 4096
+
+CRAWLER = 'crawler'
+BOT = 'bot'
+SUSPICIOUS = 'suspicious'
+BROWSER = 'browser'
+
+
+@dataclass(frozen=True)
+class AgentVerdict:
+    """Classification of one user agent string."""
+
+    kind: str
+    device: str
+    matched: str = ''
+
+    @property
+    def is_suspicious(self) -> bool:
+        """Blocked from protected actions (the historical bot check)."""
+        return self.kind == SUSPICIOUS
+
+    @property
+    def is_automated(self) -> bool:
+        """Any non-human client, including allowed crawlers."""
+        return self.kind != BROWSER
+
+
+def _alternation(patterns: Iterable[str]) -> Optional[Pattern]:
+    patterns = [pattern.strip().lower() for pattern in patterns]
+    patterns = [pattern for pattern in patterns if pattern]
+    if not patterns:
+        return None
+    return re.compile('|'.join(re.escape(pattern) for pattern in patterns))
+
+
+class UserAgentClassifier:
+    """
+    Classifies user agents against the bot detection rules.
+
+    Legitimate bots win over suspicious patterns, which win over generic
+    bot markers; missing or very short user agents are suspicious.
+    """
+
+    def __init__(self, legitimate_bots: Iterable[str] = (),
+                 suspicious_patterns: Iterable[str] = (),
+                 min_length: int = 0,
+                 bot_markers: Iterable[str] = DEFAULT_BOT_MARKERS,
+                 maxsize: int = DEFAULT_LRU_SIZE):
+        self.min_length = min_length
+        self._legitimate = _alternation(legitimate_bots)
+        self._suspicious = _alternation(suspicious_patterns)
+        self._markers = _alternation(bot_markers)
+        self._devices = [(device, _alternation(markers))
+                         for device, markers in DEVICE_MARKERS]
+        self._classify = lru_cache(maxsize=maxsize)(self._match)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'UserAgentClassifier':
+        return cls(
+            legitimate_bots=config.get('LEGITIMATE_BOTS', ()),
+            suspicious_patterns=config.get('SUSPICIOUS_PATTERNS', ()),
+            min_length=config.get('MIN_USER_AGENT_LENGTH', 0),
+            bot_markers=config.get('BOT_MARKERS', DEFAULT_BOT_MARKERS),
+            maxsize=config.get('LRU_SIZE', DEFAULT_LRU_SIZE),
+        )
+
+    def _match(self, user_agent: str) -> AgentVerdict:
+        """Run the compiled matchers against a user agent (uncached)."""
+        agent = user_agent.lower()
+        device = next((device for device, matcher in self._devices
+                       if matcher.search(agent)), 'desktop')
+
+        for kind, matcher in ((CRAWLER, self._legitimate),
+                              (SUSPICIOUS, self._suspicious)):
+            match = matcher.search(agent) if matcher else None
+            if match:
+                return AgentVerdict(kind, device, match.group())
+
+        if not agent or len(agent) < self.min_length:
+            return AgentVerdict(SUSPICIOUS, device)
+
+        match = self._markers.search(agent) if self._markers else None
+        if match:
+            return AgentVerdict(BOT, device, match.group())
+        return AgentVerdict(BROWSER, device)
+
+    def classify(self, user_agent: str) -> AgentVerdict:
+        """Return the verdict for a user agent string."""
+        return self._classify(user_agent or '')
+
+    def cache_info(self):
+        """Expose LRU hit/miss counters for diagnostics."""
+        return self._classify.cache_info()
+
+    def clear(self):
+        """Forget all memoised verdicts."""
+        self._classify.cache_clear()
+
+
+_classifier: Optional[UserAgentClassifier] = None
+_classifier_config: Optional[Dict[str, Any]] = None
+_classifier_lock = threading.Lock()
+
+
+def get_user_agent_classifier() -> UserAgentClassifier:
+    """
+    Return the process-wide classifier, built from the BOT_DETECTION
+    settings on first use and rebuilt if those settings are replaced.
+    """
+    global _classifier, _classifier_config
+    config = settings.RATE_LIMITING['BOT_DETECTION']
+    if _classifier is None or _classifier_config is not config:
+        with _classifier_lock:
+            if _classifier is None or _classifier_config is not config:
+                _classifier = UserAgentClassifier.from_config(config)
+                _classifier_config = config
+    return _classifier
+
+
+def classify_request(request: HttpRequest) -> AgentVerdict:
+    """Verdict for the request's user agent, computed once per request."""
+    verdict = getattr(request, '_user_agent_verdict', None)
+    if verdict is None:
+        verdict = get_user_agent_classifier().classify(
+            request.META.get('HTTP_USER_AGENT', '')
+        )
+        request._user_agent_verdict = verdict
+    return verdict